@@ -3,8 +3,26 @@ Module __init__ cho algorithms package
 """
 
 from .maze_generator import MazeGenerator
+from .eller_generator import EllerGenerator
 from .bfs import BFS
 from .dijkstra import Dijkstra
 from .astar import AStar
+from .bidirectional_bfs import BidirectionalBFS
+from .bidirectional_astar import BidirectionalAStar
+from .jps import JPSAStar
+from .hpa_star import HPAStar
+from .lpa_star import LPAStar
+from .ida_star import IDAStar
+from .fringe_search import FringeSearch
+from .flow_field import FlowField
+from .path_cache import PathCache
+from .bucket_queue import BucketQueue
+from .step_trace import StepTrace, StepStream
+from .carve_log import CarveLog
+from .task_executor import TaskExecutor, CancelToken, TaskCancelled
+from .registry import Solver, SolverSpec, SolveResult, Capabilities, register, get_solver, solver_names
 
-__all__ = ['MazeGenerator', 'BFS', 'Dijkstra', 'AStar']
+__all__ = ['MazeGenerator', 'EllerGenerator', 'BFS', 'Dijkstra', 'AStar', 'BidirectionalBFS', 'BidirectionalAStar',
+           'JPSAStar', 'HPAStar', 'LPAStar', 'IDAStar', 'FringeSearch', 'FlowField', 'PathCache',
+           'BucketQueue', 'StepTrace', 'StepStream', 'CarveLog', 'TaskExecutor', 'CancelToken', 'TaskCancelled',
+           'Solver', 'SolverSpec', 'SolveResult', 'Capabilities', 'register', 'get_solver', 'solver_names']
@@ -0,0 +1,10 @@
+"""
+Chạy lô không giao diện: python -m algorithms --count N --size S [--jobs J]
+"""
+
+import sys
+
+from .batch import main
+
+if __name__ == '__main__':
+    sys.exit(main())
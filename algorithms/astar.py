@@ -29,6 +29,30 @@ Heuristic - Khoảng cách Manhattan:
     - CONSISTENT: h(n) ≤ cost(n, n') + h(n') với mọi n'
     => Đảm bảo A* tìm được đường NGẮN NHẤT
 
+Địa hình (chi phí ô):
+    g cộng chi phí bước vào ô (CompactGrid.edge_costs()). Mỗi bước tốn
+    ít nhất c_min = chi phí nhỏ nhất của ô đường đi, nên
+        h(n) = c_min * Manhattan(n, goal)
+    vẫn admissible và consistent; mê cung không có địa hình thì c_min = 1.
+
+Heuristic ALT (tham số landmarks = k > 0):
+    Tường làm Manhattan đánh giá quá thấp. Với bảng khoảng cách từ k mốc
+    (LandmarkTable, Maze cache theo version), theo bất đẳng thức tam giác
+        h(n) = max |d(L, goal) - d(L, n)|
+    (có địa hình thì cộng phần lệch chi phí ô, xem models/landmarks.py).
+    Ta lấy max với Manhattan nên không bao giờ kém hơn Manhattan.
+
+Open list (chọn bằng tham số open_list):
+    - 'heap':   heapq với tuple (f, g, node) - O(log V) mỗi thao tác
+    - 'bucket': BucketOpenList - mảng bucket xoay vòng theo f (f nguyên,
+                không giảm vì h consistent), push / pop O(1). Trên lưới
+                đều rất nhiều ô cùng f; trong một bucket ưu tiên:
+                + 'max_g': g lớn nhất (h nhỏ nhất) - đi thẳng về đích dọc
+                  "cao nguyên" cùng f thay vì mở rộng ngang; bitmask các
+                  mức h còn phần tử cho pop O(1)
+                + 'lifo':  ô vào sau ra trước (gần giống max_g, rẻ hơn;
+                  registry dùng cách này)
+
 Độ phức tạp:
     - Thời gian: O((V + E) log V) - THỰC TẾ nhanh hơn Dijkstra nhiều
     - Không gian: O(V)
@@ -43,7 +67,142 @@ Tham khảo: Chương 6 - Chiến lược tham lam (mở rộng với heuristic)
 """
 
 import heapq
-from typing import List, Tuple, Optional, Dict
+from array import array
+from typing import Generator, List, Tuple, Optional, Dict
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from models.landmarks import LandmarkTable
+from .junction_search import JunctionSearch
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+# Loại open list
+OPEN_HEAP = 'heap'
+OPEN_BUCKET = 'bucket'
+
+# Cách chọn giữa các ô cùng f trong một bucket
+TIE_MAX_G = 'max_g'
+TIE_LIFO = 'lifo'
+
+
+class BucketOpenList:
+    """
+    Open list của A*: bucket xoay vòng theo f, phá hòa trong bucket.
+
+    Với h consistent, f của ô con >= f của ô đang mở rộng và lớn hơn
+    tối đa c_max + c_min, nên chỉ cần span = c_max + c_min + 1 bucket.
+
+    - 'lifo':  mỗi bucket là một list (g, node), pop phần tử cuối
+    - 'max_g': mỗi bucket là list các list đánh chỉ số theo h = f - g,
+               kèm bitmask (int) các mức h còn phần tử; pop ở bit thấp
+               nhất (= g lớn nhất), tìm bằng mask & -mask - O(1), không
+               quét các mức rỗng
+
+    Attributes:
+        pushes, pops: Số lần push / pop
+        bucket_scans: Số bucket f rỗng con trỏ phải bước qua
+        max_size: Kích thước lớn nhất của open list
+    """
+
+    __slots__ = ('_span', '_tie_break', '_slots', '_masks', '_counts', '_cursor', '_size',
+                 'pushes', 'pops', 'bucket_scans', 'max_size')
+
+    def __init__(self, span: int, tie_break: str = TIE_MAX_G, start_f: int = 0):
+        """
+        Args:
+            span: Số bucket (chênh lệch f lớn nhất cùng tồn tại + 1)
+            tie_break: 'max_g' hoặc 'lifo'
+            start_f: f nhỏ nhất ban đầu (= h(start))
+        """
+        self._span = span
+        self._tie_break = tie_break
+        self._slots = [[] for _ in range(span)]
+        # Số phần tử của từng bucket; 'max_g': bit h bật = mức h còn phần tử
+        self._counts = [0] * span
+        self._masks = [0] * span
+        self._cursor = start_f
+        self._size = 0
+        self.pushes = 0
+        self.pops = 0
+        self.bucket_scans = 0
+        self.max_size = 0
+
+    def push(self, f: int, g: int, node: int):
+        """Thêm node với khóa f (f >= f nhỏ nhất hiện tại)."""
+        slot = f % self._span
+        if self._tie_break == TIE_LIFO:
+            self._slots[slot].append((g, node))
+        else:
+            h = f - g
+            levels = self._slots[slot]
+            if h >= len(levels):
+                levels.extend([] for _ in range(h + 1 - len(levels)))
+            levels[h].append(node)
+            self._masks[slot] |= 1 << h
+        self._counts[slot] += 1
+        self._size += 1
+        self.pushes += 1
+        if self._size > self.max_size:
+            self.max_size = self._size
+
+    def pop(self) -> Tuple[int, int, int]:
+        """
+        Lấy node có f nhỏ nhất (phá hòa theo tie_break).
+
+        Returns:
+            (f, g, node)
+
+        Raises:
+            IndexError: Nếu open list rỗng
+        """
+        if not self._size:
+            raise IndexError('pop từ BucketOpenList rỗng')
+        counts, span, cursor = self._counts, self._span, self._cursor
+        slot = cursor % span
+        while not counts[slot]:
+            cursor += 1
+            slot = cursor % span
+            self.bucket_scans += 1
+        self._cursor = cursor
+        counts[slot] -= 1
+        self._size -= 1
+        self.pops += 1
+        if self._tie_break == TIE_LIFO:
+            g, node = self._slots[slot].pop()
+            return cursor, g, node
+
+        # Mức h nhỏ nhất còn phần tử = bit thấp nhất của mask
+        mask = self._masks[slot]
+        lowest = mask & -mask
+        h = lowest.bit_length() - 1
+        level = self._slots[slot][h]
+        node = level.pop()
+        if not level:
+            self._masks[slot] = mask ^ lowest
+        return cursor, cursor - h, node
+
+    def bucket_size(self) -> int:
+        """Số phần tử trong bucket của f nhỏ nhất hiện tại."""
+        return self._counts[self._cursor % self._span]
+
+    @property
+    def current_f(self) -> int:
+        """f của bucket đang được lấy ra."""
+        return self._cursor
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Bộ đếm để hiển thị trong trace / bảng so sánh."""
+        return {
+            'bucket_pushes': self.pushes,
+            'bucket_pops': self.pops,
+            'bucket_scans': self.bucket_scans,
+            'bucket_max_size': self.max_size
+        }
 
 
 class AStar:
@@ -57,30 +216,61 @@ class AStar:
         - Vẫn đảm bảo tìm đường ngắn nhất (nếu h admissible)
     
     Attributes:
-        maze: Ma trận mê cung 2D
+        maze: CompactGrid - mê cung dạng mảng phẳng có viền canh
         height: Chiều cao mê cung
         width: Chiều rộng mê cung
-        steps: Danh sách các bước để trực quan hóa
+        steps: StepTrace - các bước để trực quan hóa
     """
     
-    def __init__(self, maze: List[List[int]]):
+    def __init__(self, maze, use_junctions: bool = False, open_list: str = OPEN_HEAP,
+                 tie_break: str = TIE_MAX_G, landmarks: int = 0):
         """
         Khởi tạo thuật toán A*.
 
         Args:
-            maze: Ma trận mê cung (0 = đường đi, 1 = tường)
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+            use_junctions: True = chế độ nhanh chạy trên đồ thị nút giao
+                           (hành lang đã thu gọn, xem JunctionSearch);
+                           mê cung có địa hình thì vẫn tìm trên lưới
+            open_list: 'heap' (heapq) hoặc 'bucket' (BucketOpenList)
+            tie_break: Phá hòa trong bucket: 'max_g' hoặc 'lifo'
+            landmarks: Số mốc cho heuristic ALT (0 = chỉ dùng Manhattan);
+                       khi bật thì không tìm trên đồ thị nút giao
         """
-        self.maze = maze
-        self.height = len(maze)
-        self.width = len(maze[0])
+        if open_list not in (OPEN_HEAP, OPEN_BUCKET):
+            raise ValueError(f'Loại open list không hợp lệ: {open_list}')
+        if tie_break not in (TIE_MAX_G, TIE_LIFO):
+            raise ValueError(f'Cách phá hòa không hợp lệ: {tie_break}')
+        self.open_list = open_list
+        self.tie_break = tie_break
+        self.landmark_count = landmarks
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        # Chế độ nhanh trên đồ thị nút giao (index cache theo mê cung)
+        self.use_junctions = use_junctions
+        self._junction_search = JunctionSearch(maze) if use_junctions else None
         # Lưu các bước để debug và trực quan hóa
-        self.steps = []
+        self.steps = StepTrace(scores=('g_score', 'f_score'))
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+        # Hệ số nhân heuristic = chi phí ô nhỏ nhất (cập nhật mỗi lần tìm)
+        self._heuristic_scale = 1
+        # Bảng mốc ALT và hàm h(node) cho đích của lần tìm hiện tại
+        self._landmarks = None
+        self._estimate = None
         
     def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> float:
         """
-        Hàm heuristic: Khoảng cách Manhattan.
+        Hàm heuristic: Khoảng cách Manhattan (nhân chi phí ô nhỏ nhất).
 
-        Công thức: h(n) = |x1 - x2| + |y1 - y2|
+        Công thức: h(n) = c_min * (|x1 - x2| + |y1 - y2|)
 
         Tính chất quan trọng:
             - ADMISSIBLE: Không bao giờ đánh giá cao hơn chi phí thực
@@ -92,12 +282,19 @@ class AStar:
             pos: Vị trí hiện tại (x, y)
             goal: Vị trí đích (x, y)
 
+        Với heuristic ALT, lấy thêm max với cận từ các mốc (tính cho đích
+        của lần find_path hiện tại).
+
         Returns:
-            Khoảng cách Manhattan (số nguyên)
+            Khoảng cách Manhattan nhân c_min (số nguyên)
         """
-        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+        estimate = self._heuristic_scale * (abs(pos[0] - goal[0]) + abs(pos[1] - goal[1]))
+        if self._estimate is not None:
+            estimate = max(estimate, self._estimate(self.maze.node_id(*pos)))
+        return estimate
     
-    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], List, Dict]:
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
         """
         Tìm đường đi ngắn nhất từ start đến goal bằng A*.
 
@@ -114,106 +311,364 @@ class AStar:
         Args:
             start: Tọa độ bắt đầu (x, y)
             goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+                          (chỉ trả về đường đi, bộ đếm nằm trong self.stats;
+                          với use_junctions thì tìm trên đồ thị nút giao)
 
         Returns:
             path: Danh sách các ô trên đường đi ngắn nhất
-            steps: Các bước để trực quan hóa
-            tables: Dict chứa {g_score, f_score, previous, visited}
+            steps: StepTrace - các bước để trực quan hóa ([] ở chế độ nhanh)
+            tables: Dict chứa {g_score, f_score, previous, visited} ({} ở chế độ nhanh)
         """
-        self.steps = []
+        if record_steps:
+            return drain(self.iter_steps(start, goal), self.cancel_token)
+
+        self._heuristic_scale = self.maze.cost_range()[0]
+        self._prepare_landmarks(goal)
+        # Đồ thị nút giao giả định mỗi bước chi phí 1
+        if self.use_junctions and not self.maze.weighted and self._estimate is None:
+            path = self._junction_search.find_path(start, goal, use_heuristic=True)
+            self.stats = dict(self._junction_search.stats)
+            return path, [], {}
+        if self.open_list == OPEN_BUCKET:
+            return self._find_path_fast_bucket(start, goal), [], {}
+        return self._find_path_fast(start, goal), [], {}
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        A* có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps, tables) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        self._heuristic_scale = self.maze.cost_range()[0]
+        self._prepare_landmarks(goal)
+
+        # Trace dạng delta: chỉ ghi ô mới xử lý và các lần cập nhật g, f
+        self.steps = StepTrace(scores=('g_score', 'f_score'))
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return [], self.steps, {}
 
         # ===== KHỞI TẠO =====
-        # g_score[n]: Chi phí THỰC TẾ từ start đến n
-        g_score = {start: 0}
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+
+        # g_score[n]: Chi phí THỰC TẾ từ start đến n (-1 = chưa biết)
+        g_score = array('i', [-1]) * grid.size
+        g_score[source] = 0
 
         # f_score[n]: g(n) + h(n) = tổng chi phí ước tính qua n
-        f_score = {start: self.heuristic(start, goal)}
+        f_score = array('i', [-1]) * grid.size
+        f_score[source] = self.heuristic(start, goal)
 
-        # previous[n]: Đỉnh trước n trên đường đi tối ưu
-        previous = {}
+        self.steps.set_score('g_score', start, 0)
+        self.steps.set_score('f_score', start, f_score[source])
 
-        # Min-Heap: (f_score, g_score, x, y) - ưu tiên f nhỏ nhất
-        # Thêm g_score để tie-breaking khi f bằng nhau
-        heap = [(f_score[start], 0, start[0], start[1])]
-        visited = set()
+        # previous[n]: Đỉnh trước n trên đường đi tối ưu
+        previous = array('i', [-1]) * grid.size
 
-        # 4 hướng di chuyển: lên, phải, xuống, trái
-        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        # Open list: (f_score, g_score, node) - ưu tiên f nhỏ nhất
+        if self.open_list == OPEN_BUCKET:
+            # Bucket theo f, phá hòa trong bucket theo tie_break
+            open_list = self._new_bucket_open_list(f_score[source])
+            push, pop = open_list.push, open_list.pop
+        else:
+            # Min-Heap: thêm g_score để tie-breaking khi f bằng nhau
+            open_list = []
+            push = lambda f, g, node: heapq.heappush(open_list, (f, g, node))
+            pop = lambda: heapq.heappop(open_list)
+        push(f_score[source], 0, source)
+        pushes = 1
+        max_open = 1
+        visited = bytearray(grid.size)
+        visited_count = 0
 
         # ===== VÒNG LẶP CHÍNH =====
-        while heap:
+        while open_list:
             # Lấy đỉnh có f nhỏ nhất (THÔNG MINH: ưu tiên hướng về đích)
-            current_f, current_g, x, y = heapq.heappop(heap)
-            current = (x, y)
+            current_f, current_g, current = pop()
 
             # Bỏ qua nếu đã xử lý rồi
-            if current in visited:
+            if visited[current]:
                 continue
 
-            visited.add(current)
+            visited[current] = 1
+            visited_count += 1
+            current_cell = coords(current)
+            self.steps.visit(current_cell)
 
-            # Lưu bước hiện tại để trực quan hóa
-            self.steps.append({
-                'current': current,
-                'visited': visited.copy(),
-                'g_score': g_score.copy(),
-                'f_score': f_score.copy(),
-                'heap_size': len(heap),
-                'current_g': current_g,
-                'current_f': current_f,
-                'heuristic': self.heuristic(current, goal)
-            })
+            # Lưu bước hiện tại để trực quan hóa (kèm thống kê của open list)
+            if self.open_list == OPEN_BUCKET:
+                queue_fields = {
+                    'open_size': len(open_list),
+                    'bucket_f': current_f,
+                    'bucket_size': open_list.bucket_size(),
+                    'bucket_scans': open_list.bucket_scans
+                }
+            else:
+                queue_fields = {'heap_size': len(open_list), 'heap_pushes': pushes}
+            self.steps.add_step(
+                current=current_cell,
+                current_g=current_g,
+                current_f=current_f,
+                heuristic=self.heuristic(current_cell, goal),
+                **queue_fields
+            )
+            yield self.steps[-1]
 
             # ===== KIỂM TRA ĐÃ ĐẾN ĐÍCH =====
-            if current == goal:
-                path = self._reconstruct_path(previous, start, goal)
-                tables = {
-                    'g_score': g_score,
-                    'f_score': f_score,
-                    'previous': previous,
-                    'visited': visited
-                }
-                return path, self.steps, tables
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_queue_stats(len(self.steps), visited_count, path, pushes, max_open,
+                                      open_list, current_g)
+                return path, self.steps, self._build_tables(g_score, f_score, previous, visited)
             
             # ===== DUYỆT CÁC Ô KỀ (RELAX) =====
-            for dx, dy in directions:
-                new_x, new_y = x + dx, y + dy
-                neighbor = (new_x, new_y)
+            # Danh sách kề CSR dựng sẵn: chỉ chứa ô đường đi (Lên, Phải, Xuống, Trái)
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
                 
-                # Kiểm tra ô có hợp lệ không
-                # - Nằm trong biên mê cung
-                # - Không phải tường (maze[y][x] == 0)
-                # - Chưa được thăm
-                if (0 <= new_x < self.width and 
-                    0 <= new_y < self.height and 
-                    self.maze[new_y][new_x] == 0 and 
-                    neighbor not in visited):
+                # Kiểm tra ô có hợp lệ không: chưa được thăm
+                if not visited[neighbor]:
                     
                     # Tính g_score tạm thời (qua current)
                     # g(neighbor) = g(current) + weight(current, neighbor)
-                    tentative_g = current_g + 1  # weight = 1 cho mỗi bước
+                    tentative_g = current_g + costs[neighbor]  # weight = chi phí ô kề
                     
                     # ===== RELAX OPERATION =====
                     # Cập nhật nếu tìm được đường ngắn hơn đến neighbor
-                    if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    if g_score[neighbor] < 0 or tentative_g < g_score[neighbor]:
+                        neighbor_cell = coords(neighbor)
+
                         # Cập nhật chi phí thực tế
                         g_score[neighbor] = tentative_g
                         
                         # Tính f(n) = g(n) + h(n) - CÔNG THỨC CỐT LÕI CỦA A*
-                        f_score[neighbor] = tentative_g + self.heuristic(neighbor, goal)
+                        f_score[neighbor] = tentative_g + self.heuristic(neighbor_cell, goal)
                         
+                        # Ghi delta cho trace (không chép toàn bảng)
+                        self.steps.set_score('g_score', neighbor_cell, tentative_g)
+                        self.steps.set_score('f_score', neighbor_cell, f_score[neighbor])
+
                         # Lưu đường đi
                         previous[neighbor] = current
                         
-                        # Push vào Heap với f_score làm ưu tiên
-                        heapq.heappush(heap, (f_score[neighbor], tentative_g, new_x, new_y))
+                        # Push vào open list với f_score làm ưu tiên
+                        push(f_score[neighbor], tentative_g, neighbor)
+                        pushes += 1
+                        max_open = max(max_open, len(open_list))
         
         # Không tìm thấy đường đi (mê cung không có lối)
-        return [], self.steps, {'g_score': g_score, 'f_score': f_score, 'previous': previous, 'visited': visited}
+        self._set_queue_stats(len(self.steps), visited_count, [], pushes, max_open, open_list)
+        return [], self.steps, self._build_tables(g_score, f_score, previous, visited)
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        A* không ghi trace - dùng khi chỉ cần đường đi và bộ đếm.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        Không giữ bảng f_score vì f chỉ cần khi push vào Heap.
+        """
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        scale = self._heuristic_scale
+        estimate = self._estimate
+        stride = grid.stride
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        # Làm việc trên tọa độ có viền (x + 1, y + 1) - hiệu Manhattan không đổi
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        g_score = array('i', [-1]) * grid.size
+        g_score[source] = 0
+        previous = array('i', [-1]) * grid.size
+        heap = [(self.heuristic(start, goal), 0, source)]
+        pushes = 1
+        max_open = 1
+        heappop, heappush = heapq.heappop, heapq.heappush
+        visited = bytearray(grid.size)
+        expanded = 0
+
+        token = self.cancel_token
+        while heap:
+            _, current_g, current = heappop(heap)
+            if visited[current]:
+                continue
+            visited[current] = 1
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK:
+                token.check()
+
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_queue_stats(expanded, expanded, path, pushes, max_open, heap, current_g)
+                return path
+
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if not visited[neighbor]:
+                    tentative_g = current_g + costs[neighbor]
+                    old = g_score[neighbor]
+                    if old < 0 or tentative_g < old:
+                        g_score[neighbor] = tentative_g
+                        previous[neighbor] = current
+                        y, x = divmod(neighbor, stride)
+                        h = scale * (abs(x - goal_x) + abs(y - goal_y))
+                        if estimate is not None:
+                            alt = estimate(neighbor)
+                            if alt > h:
+                                h = alt
+                        heappush(heap, (tentative_g + h, tentative_g, neighbor))
+                        pushes += 1
+                        if len(heap) > max_open:
+                            max_open = len(heap)
+
+        self._set_queue_stats(expanded, expanded, [], pushes, max_open, heap)
+        return []
+
+    def _find_path_fast_bucket(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        A* với BucketOpenList, không ghi trace.
+
+        Cùng open list và thứ tự duyệt với find_path ở chế độ 'bucket'.
+        """
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        scale = self._heuristic_scale
+        estimate = self._estimate
+        stride = grid.stride
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        g_score = array('i', [-1]) * grid.size
+        g_score[source] = 0
+        previous = array('i', [-1]) * grid.size
+        start_f = self.heuristic(start, goal)
+        open_list = self._new_bucket_open_list(start_f)
+        push, pop = open_list.push, open_list.pop
+        push(start_f, 0, source)
+        visited = bytearray(grid.size)
+        expanded = 0
+
+        token = self.cancel_token
+        while open_list:
+            _, current_g, current = pop()
+            if visited[current]:
+                continue
+            visited[current] = 1
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK:
+                token.check()
+
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_queue_stats(expanded, expanded, path, open_list.pushes, open_list.max_size,
+                                      open_list, current_g)
+                return path
+
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if not visited[neighbor]:
+                    tentative_g = current_g + costs[neighbor]
+                    old = g_score[neighbor]
+                    if old < 0 or tentative_g < old:
+                        g_score[neighbor] = tentative_g
+                        previous[neighbor] = current
+                        y, x = divmod(neighbor, stride)
+                        h = scale * (abs(x - goal_x) + abs(y - goal_y))
+                        if estimate is not None:
+                            alt = estimate(neighbor)
+                            if alt > h:
+                                h = alt
+                        push(tentative_g + h, tentative_g, neighbor)
+
+        self._set_queue_stats(expanded, expanded, [], open_list.pushes, open_list.max_size, open_list)
+        return []
+
+    def _new_bucket_open_list(self, start_f: int) -> BucketOpenList:
+        """Open list bucket đủ rộng cho chi phí ô và hệ số heuristic hiện tại."""
+        max_cost = self.maze.cost_range()[1]
+        # Qua một bước, h giảm tối đa c_min (Manhattan) hoặc c_max (ALT)
+        h_drop = max_cost if self._estimate is not None else self._heuristic_scale
+        return BucketOpenList(max_cost + h_drop + 1, self.tie_break, start_f)
+
+    def _prepare_landmarks(self, goal: Tuple[int, int]):
+        """Lấy bảng mốc (dựng nếu lưới đã đổi) và hàm h ALT cho đích goal."""
+        self._estimate = None
+        if self.landmark_count <= 0 or not self.maze.is_open(*goal):
+            return
+        self._landmarks = LandmarkTable.of(self._graph, self.landmark_count, self._landmarks)
+        self._estimate = self._landmarks.estimator(self.maze.node_id(*goal))
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]], pushes: int = 0,
+                   cost: int = 0):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path),
+            'path_cost': cost if path else 0,
+            'heap_pushes': pushes
+        }
+
+    def _set_queue_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]],
+                         pushes: int, max_open: int, open_list, cost: int = 0):
+        """Bộ đếm tóm tắt kèm thống kê của open list (heap hoặc bucket)."""
+        self._set_stats(expanded, visited_count, path, pushes, cost)
+        self.stats['open_list'] = self.open_list
+        if self._estimate is not None:
+            self.stats['heuristic'] = 'alt'
+            self.stats.update(self._landmarks.stats)
+        if isinstance(open_list, BucketOpenList):
+            del self.stats['heap_pushes']
+            self.stats['tie_break'] = self.tie_break
+            self.stats.update(open_list.stats)
+        else:
+            self.stats['heap_max_size'] = max_open
+
+    def _build_tables(self, g_score: array, f_score: array, previous: array, visited: bytearray) -> Dict:
+        """
+        Chuyển các mảng theo node id về bảng khóa (x, y) để hiển thị.
+
+        Chỉ chạy một lần ở cuối (chế độ ghi trace), không nằm trong vòng lặp.
+        """
+        coords = self.maze.coords
+        return {
+            'g_score': {coords(v): g for v, g in enumerate(g_score) if g >= 0},
+            'f_score': {coords(v): f for v, f in enumerate(f_score) if f >= 0},
+            'previous': {coords(v): coords(u) for v, u in enumerate(previous) if u >= 0},
+            'visited': {coords(v) for v, done in enumerate(visited) if done}
+        }
     
-    def _reconstruct_path(self, previous: Dict, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    def _reconstruct_path(self, previous: array, source: int, target: int) -> List[Tuple[int, int]]:
         """
-        Tái tạo đường đi từ bảng previous.
+        Tái tạo đường đi từ mảng previous.
         
         Thuật toán:
             1. Bắt đầu từ goal
@@ -221,31 +676,32 @@ class AStar:
             3. Đảo ngược danh sách để có đường đi đúng chiều
         
         Args:
-            previous: Bảng đỉnh trước (previous[v] = u nghĩa là đến v qua u)
-            start: Điểm bắt đầu
-            goal: Điểm kết thúc
+            previous: Mảng đỉnh trước (previous[v] = u nghĩa là đến v qua u, -1 = không có)
+            source: Node id điểm bắt đầu
+            target: Node id điểm kết thúc
             
         Returns:
-            Danh sách các ô trên đường đi từ start đến goal
+            Danh sách các ô (x, y) trên đường đi từ start đến goal
         """
-        path = []
-        current = goal
+        nodes = []
+        current = target
         
         # Lần ngược từ goal về start
-        while current != start:
-            path.append(current)
-            if current not in previous:
+        while current != source:
+            nodes.append(current)
+            if previous[current] < 0:
                 # Không có đường đi
                 return []
             current = previous[current]
         
         # Thêm điểm bắt đầu
-        path.append(start)
+        nodes.append(source)
         
         # Đảo ngược để có đường đi từ start -> goal
-        path.reverse()
+        nodes.reverse()
         
-        return path
+        coords = self.maze.coords
+        return [coords(node) for node in nodes]
     
     def get_complexity_info(self) -> dict:
         """
@@ -267,13 +723,14 @@ class AStar:
         Returns:
             Dict chứa thông tin phân tích thuật toán
         """
+        bucket = self.open_list == OPEN_BUCKET
         return {
-            'name': 'A* (A-Star)',
-            'time_complexity': 'O((V + E) log V)',
+            'name': f'A* (A-Star, bucket {self.tie_break})' if bucket else 'A* (A-Star)',
+            'time_complexity': 'O(V + E + F) với bucket theo f' if bucket else 'O((V + E) log V)',
             'space_complexity': 'O(V)',
             'description': 'Kết hợp Dijkstra và heuristic để tìm đường tối ưu nhanh hơn',
             'formula': 'f(n) = g(n) + h(n)',
-            'heuristic': 'Manhattan distance: h(n) = |x_n - x_goal| + |y_n - y_goal|',
+            'heuristic': 'Manhattan distance: h(n) = c_min * (|x_n - x_goal| + |y_n - y_goal|)',
             'advantages': [
                 'Nhanh hơn Dijkstra đáng kể nhờ heuristic',
                 'Vẫn đảm bảo tìm đường ngắn nhất (h admissible)',
@@ -285,5 +742,7 @@ class AStar:
                 'Phức tạp hơn BFS và Dijkstra khi implement',
                 'Cần thêm bộ nhớ cho f_score'
             ],
-            'comparison_dijkstra': 'A* duyệt ít ô hơn Dijkstra vì ưu tiên hướng về đích'
+            'comparison_dijkstra': 'A* duyệt ít ô hơn Dijkstra vì ưu tiên hướng về đích',
+            'open_list': 'Bucket theo f (push / pop O(1)), ưu tiên g lớn trong cùng f' if bucket
+                         else 'Binary Heap (heapq), phá hòa theo g nhỏ'
         }
@@ -0,0 +1,156 @@
+"""
+==============================================================================
+CHẠY LÔ KHÔNG GIAO DIỆN - SINH VÀ GIẢI HÀNG LOẠT MÊ CUNG
+==============================================================================
+
+Mô tả:
+    Điểm vào duy nhất trước đây là ui.main_window.run() - cần màn hình,
+    khởi động tkinter / pygame. Module này chỉ import algorithms và models
+    để chạy trên máy build không có X:
+
+        python -m algorithms --count 1000 --size 101 --algorithms "BFS,A*" --jobs 8
+
+    Sinh N mê cung có seed (mê cung thứ i dùng seed + i, nên kết quả lặp
+    lại được và không phụ thuộc số tiến trình), giải mỗi mê cung bằng các
+    thuật toán đã chọn ở chế độ nhanh (record_steps=False), và in MỘT dòng
+    JSON cho mỗi kết quả ra stdout ngay khi có.
+
+Chạy song song:
+    --jobs N dùng multiprocessing.Pool: mỗi tác vụ là một mê cung (sinh +
+    giải trong tiến trình con, index cache theo Maze là riêng của tác vụ).
+    Dòng ra giữ đúng thứ tự mê cung (Pool.imap).
+
+Dòng JSON:
+    {"maze", "seed", "size", "algorithm", "found", "path_length", "cost",
+     "optimal", "nodes_expanded", "time_ms"} (+ "path" nếu có --path);
+    "optimal" = false: solver chỉ gần tối ưu (vd HPA*), cost có thể lớn hơn
+    chi phí nhỏ nhất
+==============================================================================
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+from models import Maze
+from .maze_generator import MazeGenerator
+from .registry import REGISTRY, get_solver
+
+DEFAULT_SIZE = 51
+DEFAULT_SEED = 0
+DEFAULT_ALGORITHMS = ('BFS', 'Dijkstra', 'A*')
+
+
+def solve_maze(index: int, size: int, seed: int, algorithms: Sequence[str],
+               include_path: bool = False) -> List[Dict]:
+    """
+    Sinh mê cung thứ index rồi giải bằng từng thuật toán.
+
+    Args:
+        index: Số thứ tự mê cung trong lô (seed của mê cung = seed + index)
+        size: Kích thước mê cung (size x size, nên là số lẻ)
+        seed: Seed gốc của lô
+        algorithms: Tên thuật toán trong registry
+        include_path: True = kèm danh sách tọa độ đường đi
+
+    Returns:
+        Danh sách bản ghi kết quả, mỗi thuật toán một bản ghi
+    """
+    maze_seed = seed + index
+    grid, _ = MazeGenerator(size, size, seed=maze_seed).generate(record_steps=False)
+    maze = Maze(size, size)
+    maze.set_grid(grid)
+    maze.set_start(1, 1)
+    maze.set_exit(size - 2, size - 2)
+    start, goal = maze.start_pos, maze.exit_pos
+
+    clock = time.perf_counter_ns
+    records = []
+    for name in algorithms:
+        spec = get_solver(name)
+        started = clock()
+        result = spec.solve(maze, start, goal)
+        elapsed = clock() - started
+        path = result.path
+        record = {
+            'maze': index,
+            'seed': maze_seed,
+            'size': size,
+            'algorithm': name,
+            'found': bool(path),
+            'path_length': len(path),
+            'cost': maze.path_cost(path) if path else None,
+            'optimal': spec.capabilities.optimal,
+            'nodes_expanded': result.stats.get('nodes_expanded'),
+            'time_ms': elapsed / 1e6
+        }
+        if include_path:
+            record['path'] = [list(position) for position in path]
+        records.append(record)
+    return records
+
+
+def _solve_maze_args(args):
+    """Tác vụ cho Pool: giải nén tham số rồi gọi solve_maze."""
+    return solve_maze(*args)
+
+
+def run_batch(count: int, size: int = DEFAULT_SIZE, seed: int = DEFAULT_SEED,
+              algorithms: Sequence[str] = DEFAULT_ALGORITHMS, jobs: int = 1,
+              include_path: bool = False):
+    """
+    Sinh và giải count mê cung; trả về từng bản ghi theo thứ tự (generator).
+
+    Args:
+        jobs: Số tiến trình; 1 = chạy trong tiến trình hiện tại
+        Các tham số khác: như solve_maze
+    """
+    tasks = [(index, size, seed, tuple(algorithms), include_path) for index in range(count)]
+    if jobs <= 1:
+        for task in tasks:
+            yield from solve_maze(*task)
+        return
+    # Gom vài mê cung mỗi lần gửi để bớt chi phí pickle / IPC với mê cung nhỏ
+    chunksize = max(1, min(64, count // (jobs * 4)))
+    with multiprocessing.Pool(processes=jobs) as pool:
+        for records in pool.imap(_solve_maze_args, tasks, chunksize):
+            yield from records
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Điểm vào dòng lệnh: mỗi kết quả một dòng JSON ra stdout."""
+    parser = argparse.ArgumentParser(prog='python -m algorithms',
+                                     description='Sinh và giải hàng loạt mê cung (không cần giao diện)')
+    parser.add_argument('--count', '-n', type=int, default=1, help='Số mê cung (mặc định: %(default)s)')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                        help='Kích thước mê cung, số lẻ >= 5 (mặc định: %(default)s)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help='Seed gốc; mê cung thứ i dùng seed + i (mặc định: %(default)s)')
+    parser.add_argument('--algorithms', default=','.join(DEFAULT_ALGORITHMS),
+                        help='Các thuật toán, cách nhau dấu phẩy: ' + ', '.join(REGISTRY))
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Số tiến trình (0 = số lõi; mặc định: %(default)s)')
+    parser.add_argument('--path', action='store_true', help='Kèm tọa độ đường đi trong mỗi dòng')
+    args = parser.parse_args(argv)
+
+    algorithms = [name.strip() for name in args.algorithms.split(',') if name.strip()]
+    unknown = [name for name in algorithms if name not in REGISTRY]
+    if unknown:
+        parser.error(f'thuật toán không hỗ trợ: {", ".join(unknown)}')
+    if args.size < 5 or args.size % 2 == 0:
+        parser.error('--size phải là số lẻ >= 5')
+    if args.count < 0:
+        parser.error('--count phải >= 0')
+    jobs = args.jobs if args.jobs > 0 else (multiprocessing.cpu_count() or 1)
+
+    try:
+        for record in run_batch(args.count, args.size, args.seed, algorithms, jobs, args.path):
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+    except BrokenPipeError:
+        # Bị cắt ống (vd | head): dừng êm, không in traceback
+        sys.stderr.close()
+        return 1
+    return 0
@@ -26,15 +26,24 @@ Chiến lược: TÌM KIẾM THEO CHIỀU RỘNG
     - Không gian: O(V) - lưu Queue và visited
 
 Cấu trúc dữ liệu:
-    - Queue (deque): FIFO, enqueue/dequeue O(1)
-    - Set: Đánh dấu đỉnh đã thăm - O(1) lookup
+    - CompactGrid: mê cung dạng bytearray có viền canh, ô = node id số nguyên
+    - Queue (deque): FIFO, enqueue/dequeue O(1) - chỉ chứa node id
+    - array('i') previous: con trỏ cha, đồng thời đánh dấu đã thăm - O(1)
+    - Đường đi được tái tạo MỘT LẦN ở cuối (không lưu list đường đi
+      trong từng phần tử Queue => tránh cấp phát O(V²) ở hành lang dài)
 
 Tham khảo: Chương 2 - Sắp xếp và tìm kiếm
 ==============================================================================
 """
 
+from array import array
 from collections import deque
-from typing import List, Tuple, Optional, Dict
+from typing import Generator, List, Tuple, Optional
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
 
 
 class BFS:
@@ -47,84 +56,218 @@ class BFS:
         - Phù hợp cho AI truy đuổi real-time
     """
     
-    def __init__(self, maze: List[List[int]]):
+    def __init__(self, maze):
         """
         Khởi tạo thuật toán BFS.
 
         Args:
-            maze: Ma trận mê cung (0 = đường đi, 1 = tường)
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
         """
-        self.maze = maze
-        self.height = len(maze)
-        self.width = len(maze[0])
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
         # Lưu các bước để debug và trực quan hóa
+        self.steps = []
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
         
-    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], List]:
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List]:
         """
         Tìm đường đi ngắn nhất từ start đến goal bằng BFS.
 
         Thuật toán:
-            1. Khởi tạo Queue với điểm bắt đầu
+            1. Khởi tạo Queue với điểm bắt đầu, previous[start] = start
             2. Lặp khi Queue không rỗng:
                - Dequeue đỉnh đầu tiên
-               - Nếu là đích -> trả về đường đi
-               - Duyệt 4 hướng kề, enqueue các ô hợp lệ
+               - Nếu là đích -> tái tạo đường đi từ previous
+               - Duyệt 4 ô kề, gán cha và enqueue các ô hợp lệ
             3. Trả về [] nếu không tìm thấy
 
         Args:
             start: Tọa độ bắt đầu (x, y)
             goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+                          (chỉ trả về đường đi, bộ đếm nằm trong self.stats)
 
         Returns:
             path: Danh sách các ô trên đường đi ngắn nhất
-            steps: Các bước để trực quan hóa quá trình tìm kiếm
+            steps: StepTrace - các bước để trực quan hóa quá trình tìm kiếm
+                   ([] khi record_steps=False)
         """
-        self.steps = []
+        if not record_steps:
+            return self._find_path_fast(start, goal), []
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        BFS có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        # Trace dạng delta: chỉ ghi ô mới thăm, không chép visited mỗi bước
+        self.steps = StepTrace()
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return [], self.steps
 
         # ===== KHỞI TẠO =====
-        # Queue chứa: (x, y, đường_đi_đến_ô_này)
-        # Dùng deque để enqueue/dequeue O(1)
-        queue = deque([(start[0], start[1], [start])])
-        # Tập các ô đã thăm để tránh duyệt lại - O(1) lookup
-        visited = {start}
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
 
-        # 4 hướng di chuyển: Lên, Phải, Xuống, Trái
-        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        # Queue chỉ chứa node id - KHÔNG lưu đường đi trong từng phần tử
+        # Dùng deque để enqueue/dequeue O(1)
+        queue = deque([source])
+        # previous[v] = node đứng trước v (con trỏ cha), -1 = chưa thăm
+        # => mảng phẳng array('i') đồng thời là tập đã thăm - O(1) lookup
+        previous = array('i', [-1]) * grid.size
+        previous[source] = source
+        visited_count = 1
+        self.steps.visit(start)
+        # "Đường đi hiện tại" của mỗi bước được dựng lười bằng cách lần ngược
+        # previous (con trỏ cha trong BFS không bao giờ đổi sau khi gán)
+        self.steps.set_path_builder(
+            lambda cell: self._reconstruct_path(previous, source, grid.node_id(*cell)))
 
         # ===== VÒNG LẶP CHÍNH =====
         while queue:
             # Lấy đỉnh đầu Queue (FIFO)
-            x, y, path = queue.popleft()
+            current = queue.popleft()
 
             # Lưu bước hiện tại để trực quan hóa
-            self.steps.append({
-                'current': (x, y),
-                'visited': visited.copy(),
-                'queue_size': len(queue),
-                'path': path.copy()
-            })
+            self.steps.add_step(
+                current=coords(current),
+                queue_size=len(queue)
+            )
+            yield self.steps[-1]
 
             # ===== KIỂM TRA ĐÃ ĐẾN ĐÍCH =====
-            if (x, y) == goal:
+            if current == target:
+                # Tái tạo đường đi MỘT LẦN duy nhất ở cuối
+                path = self._reconstruct_path(previous, source, target)
+                self._set_stats(len(self.steps), visited_count, path)
                 return path, self.steps
 
             # ===== DUYỆT CÁC Ô KẾ TIẾP =====
-            for dx, dy in directions:
-                new_x, new_y = x + dx, y + dy
-
-                # Kiểm tra hợp lệ: trong biên, là đường đi, chưa thăm
-                if (0 <= new_x < self.width and 
-                    0 <= new_y < self.height and 
-                    self.maze[new_y][new_x] == 0 and 
-                    (new_x, new_y) not in visited):
-                    
-                    # Đánh dấu đã thăm NGAY để tránh thêm trùng vào Queue
-                    visited.add((new_x, new_y))
+            # Danh sách kề CSR dựng sẵn: chỉ chứa ô đường đi, theo thứ tự
+            # Lên, Phải, Xuống, Trái - không kiểm tra biên, không tra tường
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+
+                # Kiểm tra hợp lệ: chưa thăm
+                if previous[neighbor] < 0:
+                    # Đánh dấu đã thăm NGAY (gán cha) để tránh thêm trùng vào Queue
+                    previous[neighbor] = current
+                    visited_count += 1
+                    self.steps.visit(coords(neighbor))
                     # Thêm vào cuối Queue (FIFO)
-                    new_path = path + [(new_x, new_y)]
-                    queue.append((new_x, new_y, new_path))
+                    queue.append(neighbor)
+
+        # Không tìm thấy đường đi: trả về đường rỗng
+        self._set_stats(len(self.steps), visited_count, [])
+        return [], self.steps
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        BFS không ghi trace - dùng cho AI và đo thời gian so sánh.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        """
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        queue = deque([source])
+        popleft, append = queue.popleft, queue.append
+        previous = array('i', [-1]) * grid.size
+        previous[source] = source
+        visited_count = 1
+        expanded = 0
+
+        token = self.cancel_token
+        while queue:
+            current = popleft()
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK:
+                token.check()
+
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_stats(expanded, visited_count, path)
+                return path
+
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if previous[neighbor] < 0:
+                    previous[neighbor] = current
+                    visited_count += 1
+                    append(neighbor)
+
+        self._set_stats(expanded, visited_count, [])
+        return []
+
+    def _reconstruct_path(self, previous: array, source: int, target: int) -> List[Tuple[int, int]]:
+        """
+        Tái tạo đường đi từ mảng previous (giống Dijkstra).
+
+        Thuật toán: Truy ngược từ target về source theo con trỏ cha.
+
+        Args:
+            previous: Mảng con trỏ cha (previous[v] = node đến trước v, -1 = chưa thăm)
+            source: Node id điểm bắt đầu
+            target: Node id điểm kết thúc
+
+        Returns:
+            Danh sách các ô (x, y) trên đường đi (từ start đến goal)
+        """
+        if previous[target] < 0:
+            return []  # Không có đường đi
+
+        nodes = [target]
+        current = target
+        # Truy ngược từ target về source
+        while current != source:
+            current = previous[current]
+            nodes.append(current)
+
+        nodes.reverse()  # Đảo ngược để có thứ tự từ start -> goal
+        coords = self.maze.coords
+        return [coords(node) for node in nodes]
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]]):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path)
+        }
 
-        # Không tìm thấy đường đi
     def get_next_move(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
         """
         Lấy bước đi tiếp theo cho AI (tối ưu, không cần đường đi đầy đủ).
@@ -139,7 +282,8 @@ class BFS:
         Returns:
             Tọa độ bước đi tiếp theo hoặc None nếu không có đường
         """
-        path, _ = self.find_path(start, goal)
+        # Chế độ nhanh: AI chỉ cần đường đi, không cần trace
+        path, _ = self.find_path(start, goal, record_steps=False)
 
         if len(path) > 1:
             return path[1]  # Trả về bước đi tiếp theo (bỏ qua vị trí hiện tại)
@@ -0,0 +1,362 @@
+"""
+==============================================================================
+THUẬT TOÁN A* HAI CHIỀU (BIDIRECTIONAL A*)
+==============================================================================
+
+Mô tả bài toán:
+    Tìm đường đi ngắn nhất từ Start đến Exit bằng hai lượt A* chạy
+    xen kẽ: một từ Start hướng về Exit, một từ Exit hướng về Start.
+
+Heuristic cân bằng (average potential):
+    Nếu mỗi phía dùng heuristic riêng (h tới Exit / h tới Start) thì hai
+    lượt tìm "không cùng thước đo" và điều kiện dừng rất yếu. Thay vào đó
+    dùng CHUNG một thế năng:
+        p(n) = (h(n, Exit) - h(n, Start)) / 2
+    - Phía xuôi:  f(n) = g_xuôi(n) + p(n)
+    - Phía ngược: f(n) = g_ngược(n) - p(n)
+    - h: khoảng cách Manhattan, nên p vẫn CONSISTENT ở cả hai phía
+    Khóa trong Heap được nhân 2 để luôn là số nguyên.
+
+Điểm gặp và điều kiện dừng:
+    - mu = min(g_xuôi(n) + g_ngược(n)) trên các ô đã có nhãn ở CẢ hai phía
+    - Dừng khi f_min_xuôi + f_min_ngược >= mu: mọi đường chưa xét đều
+      không ngắn hơn mu (giống Dijkstra hai chiều trên đồ thị có trọng
+      số đã hiệu chỉnh theo p, vì p(Start) + (-p(Exit)) triệt tiêu
+      đúng phần chênh của độ dài đã hiệu chỉnh).
+
+Chiến lược xen kẽ:
+    Luôn mở rộng phía có Heap nhỏ hơn (frontier hẹp hơn).
+
+Độ phức tạp:
+    - Thời gian: O((V + E) log V) trường hợp xấu nhất
+    - Không gian: O(V) - bảng g và con trỏ cha cho từng phía
+==============================================================================
+"""
+
+import heapq
+from array import array
+from typing import Generator, List, Tuple, Dict
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from .bidirectional_bfs import FORWARD, BACKWARD
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+
+class BidirectionalAStar:
+    """
+    A* tìm kiếm đồng thời từ Start và Exit.
+
+    Đặc điểm:
+        - Cùng giao diện find_path với AStar: trả về (path, steps, tables)
+        - Mỗi bước trong trace có trường 'frontier' = 'forward'/'backward'
+        - Đảm bảo tìm đường ngắn nhất (thế năng cân bằng consistent)
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo thuật toán A* hai chiều.
+
+        Args:
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        # Lưu các bước để debug và trực quan hóa
+        self.steps = StepTrace(scores=('g_score', 'g_score_backward'))
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Khoảng cách Manhattan giữa hai ô."""
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+
+    def potential2(self, pos: Tuple[int, int], start: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """
+        Hai lần thế năng cân bằng: 2p(n) = h(n, Exit) - h(n, Start).
+
+        Phía xuôi cộng 2p, phía ngược trừ 2p vào khóa 2g.
+        """
+        return self.heuristic(pos, goal) - self.heuristic(pos, start)
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
+        """
+        Tìm đường đi ngắn nhất từ start đến goal bằng A* hai chiều.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách các ô trên đường đi ngắn nhất
+            steps: StepTrace - mỗi bước có 'frontier' cho biết phía mở rộng
+                   ([] ở chế độ nhanh)
+            tables: Dict {g_score, g_score_backward, previous, previous_backward,
+                    visited} ({} ở chế độ nhanh)
+        """
+        if not record_steps:
+            return self._find_path_fast(start, goal), [], {}
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        A* hai chiều có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps, tables) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        self.steps = StepTrace(scores=('g_score', 'g_score_backward'))
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return [], self.steps, {}
+
+        # ===== KHỞI TẠO HAI PHÍA =====
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+
+        g_forward = array('i', [-1]) * grid.size
+        g_backward = array('i', [-1]) * grid.size
+        prev_forward = array('i', [-1]) * grid.size
+        prev_backward = array('i', [-1]) * grid.size
+        closed_forward = bytearray(grid.size)
+        closed_backward = bytearray(grid.size)
+        g_forward[source] = g_backward[target] = 0
+        self.steps.set_score('g_score', start, 0)
+        self.steps.set_score('g_score_backward', goal, 0)
+        # Khóa Heap = 2f = 2g ± 2p (số nguyên)
+        heap_forward = [(self.potential2(start, start, goal), 0, source)]
+        heap_backward = [(-self.potential2(goal, start, goal), 0, target)]
+
+        # mu: độ dài (số cạnh) đường tốt nhất đã biết, meet: ô gặp nhau
+        mu, meet = (0, source) if source == target else (-1, -1)
+        expanded = 0
+
+        # ===== VÒNG LẶP CHÍNH =====
+        while heap_forward and heap_backward:
+            # Điều kiện dừng: f_min_xuôi + f_min_ngược >= mu (khóa đã nhân 2)
+            if mu >= 0 and heap_forward[0][0] + heap_backward[0][0] >= 2 * mu:
+                break
+
+            # Mở rộng phía có Heap nhỏ hơn
+            if len(heap_forward) <= len(heap_backward):
+                frontier, heap, sign = FORWARD, heap_forward, 1
+                g_score, previous, closed, other_g = g_forward, prev_forward, closed_forward, g_backward
+                score_name = 'g_score'
+            else:
+                frontier, heap, sign = BACKWARD, heap_backward, -1
+                g_score, previous, closed, other_g = g_backward, prev_backward, closed_backward, g_forward
+                score_name = 'g_score_backward'
+
+            current_key, current_g, current = heapq.heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            current_cell = coords(current)
+            self.steps.visit(current_cell)
+            self.steps.add_step(
+                current=current_cell,
+                frontier=frontier,
+                heap_size=len(heap),
+                current_g=current_g,
+                current_f=current_key / 2,
+                heuristic=sign * self.potential2(current_cell, start, goal) / 2,
+                best_length=mu + 1 if mu >= 0 else None
+            )
+            yield self.steps[-1]
+
+            tentative_g = current_g + 1
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if closed[neighbor]:
+                    continue
+                if g_score[neighbor] < 0 or tentative_g < g_score[neighbor]:
+                    neighbor_cell = coords(neighbor)
+                    g_score[neighbor] = tentative_g
+                    previous[neighbor] = current
+                    self.steps.set_score(score_name, neighbor_cell, tentative_g)
+                    key = 2 * tentative_g + sign * self.potential2(neighbor_cell, start, goal)
+                    heapq.heappush(heap, (key, tentative_g, neighbor))
+                    # Ô đã có nhãn của phía kia => ứng viên điểm gặp
+                    other = other_g[neighbor]
+                    if other >= 0 and (mu < 0 or tentative_g + other < mu):
+                        mu, meet = tentative_g + other, neighbor
+
+        path = self._join_path(prev_forward, prev_backward, source, target, meet) if mu >= 0 else []
+        self._set_stats(expanded, self._count_closed(closed_forward, closed_backward), path)
+        tables = {
+            'g_score': self._to_table(g_forward),
+            'g_score_backward': self._to_table(g_backward),
+            'previous': self._to_table(prev_forward, coords),
+            'previous_backward': self._to_table(prev_backward, coords),
+            'visited': {coords(v) for v in range(grid.size) if closed_forward[v] or closed_backward[v]}
+        }
+        return path, self.steps, tables
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        A* hai chiều không ghi trace.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        """
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        stride = grid.stride
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        # Tọa độ có viền (x + 1, y + 1) của hai đầu - hiệu Manhattan không đổi
+        start_y, start_x = divmod(source, stride)
+        goal_y, goal_x = divmod(target, stride)
+
+        g_forward = array('i', [-1]) * grid.size
+        g_backward = array('i', [-1]) * grid.size
+        prev_forward = array('i', [-1]) * grid.size
+        prev_backward = array('i', [-1]) * grid.size
+        closed_forward = bytearray(grid.size)
+        closed_backward = bytearray(grid.size)
+        g_forward[source] = g_backward[target] = 0
+        distance = abs(start_x - goal_x) + abs(start_y - goal_y)
+        heap_forward = [(distance, 0, source)]
+        heap_backward = [(distance, 0, target)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        mu, meet = (0, source) if source == target else (-1, -1)
+        expanded = 0
+
+        token = self.cancel_token
+        while heap_forward and heap_backward:
+            if mu >= 0 and heap_forward[0][0] + heap_backward[0][0] >= 2 * mu:
+                break
+            if len(heap_forward) <= len(heap_backward):
+                heap, sign = heap_forward, 1
+                g_score, previous, closed, other_g = g_forward, prev_forward, closed_forward, g_backward
+            else:
+                heap, sign = heap_backward, -1
+                g_score, previous, closed, other_g = g_backward, prev_backward, closed_backward, g_forward
+
+            _, current_g, current = heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK:
+                token.check()
+
+            tentative_g = current_g + 1
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if closed[neighbor]:
+                    continue
+                old = g_score[neighbor]
+                if old < 0 or tentative_g < old:
+                    g_score[neighbor] = tentative_g
+                    previous[neighbor] = current
+                    y, x = divmod(neighbor, stride)
+                    potential2 = abs(x - goal_x) + abs(y - goal_y) - abs(x - start_x) - abs(y - start_y)
+                    heappush(heap, (2 * tentative_g + sign * potential2, tentative_g, neighbor))
+                    other = other_g[neighbor]
+                    if other >= 0 and (mu < 0 or tentative_g + other < mu):
+                        mu, meet = tentative_g + other, neighbor
+
+        path = self._join_path(prev_forward, prev_backward, source, target, meet) if mu >= 0 else []
+        self._set_stats(expanded, self._count_closed(closed_forward, closed_backward), path)
+        return path
+
+    def _join_path(self, prev_forward: array, prev_backward: array, source: int, target: int,
+                   meet: int) -> List[Tuple[int, int]]:
+        """
+        Ghép nửa xuôi (Start -> meet) và nửa ngược (meet -> Exit).
+
+        Args:
+            prev_forward, prev_backward: Con trỏ cha của hai phía (-1 = không có)
+            source, target: Node id Start và Exit
+            meet: Ô gặp nhau (có nhãn ở cả hai phía)
+
+        Returns:
+            Danh sách các ô (x, y) từ start đến goal
+        """
+        nodes = [meet]
+        node = meet
+        while node != source:
+            node = prev_forward[node]
+            nodes.append(node)
+        nodes.reverse()
+        node = meet
+        while node != target:
+            node = prev_backward[node]
+            nodes.append(node)
+        coords = self.maze.coords
+        return [coords(node) for node in nodes]
+
+    def _count_closed(self, closed_forward: bytearray, closed_backward: bytearray) -> int:
+        """Số ô đã được mở rộng bởi ít nhất một phía (giống 'ô đã thăm' của A*)."""
+        return sum(1 for a, b in zip(closed_forward, closed_backward) if a or b)
+
+    def _to_table(self, values: array, convert=None) -> Dict:
+        """Mảng theo node id -> bảng khóa (x, y), bỏ các ô -1."""
+        coords = self.maze.coords
+        if convert is None:
+            return {coords(v): value for v, value in enumerate(values) if value >= 0}
+        return {coords(v): convert(value) for v, value in enumerate(values) if value >= 0}
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]]):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path)
+        }
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp thuật toán A* hai chiều.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'A* hai chiều (Bidirectional A*)',
+            'time_complexity': 'O((V + E) log V)',
+            'space_complexity': 'O(V)',
+            'description': 'Hai lượt A* xen kẽ từ Start và Exit với thế năng cân bằng chung',
+            'formula': 'f(n) = g(n) ± p(n), p(n) = (h(n, Exit) - h(n, Start)) / 2',
+            'heuristic': 'Manhattan distance (cân bằng giữa hai đầu)',
+            'advantages': [
+                'Duyệt ít ô hơn A* một chiều khi hai đầu ở xa nhau',
+                'Vẫn đảm bảo đường đi ngắn nhất',
+                'Hai phía dùng chung thước đo nên điều kiện dừng chặt'
+            ],
+            'disadvantages': [
+                'Điều kiện dừng phức tạp hơn A* một chiều',
+                'Gấp đôi bộ nhớ g / con trỏ cha',
+                'Thế năng cân bằng chỉ bằng một nửa heuristic nên dẫn hướng yếu hơn'
+            ]
+        }
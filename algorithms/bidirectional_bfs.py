@@ -0,0 +1,367 @@
+"""
+==============================================================================
+THUẬT TOÁN BFS HAI CHIỀU (BIDIRECTIONAL BFS)
+==============================================================================
+
+Mô tả bài toán:
+    Tìm đường đi ngắn nhất từ Start đến Exit, nhưng tìm kiếm ĐỒNG THỜI
+    từ cả hai đầu và dừng khi hai vùng tìm kiếm gặp nhau.
+
+Ý tưởng:
+    - BFS một chiều duyệt "hình tròn" bán kính d quanh Start
+    - BFS hai chiều duyệt 2 hình tròn bán kính ~d/2 quanh Start và Exit
+    => Số ô phải duyệt giảm mạnh trên mê cung lớn, thoáng hoặc có vòng
+
+Chiến lược: DUYỆT THEO TẦNG, LUÔN MỞ RỘNG PHÍA NHỎ HƠN
+    1. Hai Queue: frontier xuôi (từ Start) và frontier ngược (từ Exit)
+    2. Mỗi vòng mở rộng TRỌN MỘT TẦNG của Queue có ít phần tử hơn
+    3. Khi gặp ô đã được phía kia thăm => ghi nhận điểm gặp
+       (độ dài = d_xuôi(u) + 1 + d_ngược(v)), giữ điểm gặp ngắn nhất
+    4. Hết tầng mà đã có điểm gặp => dừng, ghép hai nửa đường đi
+    Hoàn tất trọn tầng trước khi dừng đảm bảo đường đi là NGẮN NHẤT.
+
+Độ phức tạp:
+    - Thời gian: O(V + E) trường hợp xấu nhất, thực tế ~O(b^(d/2))
+    - Không gian: O(V) - hai mảng khoảng cách và hai mảng con trỏ cha
+
+Cấu trúc dữ liệu:
+    - CSRAdjacency: danh sách kề dựng sẵn theo node id
+    - 2 Queue (deque) chỉ chứa node id
+    - array('i') distance/previous cho từng phía (-1 = chưa thăm)
+==============================================================================
+"""
+
+from array import array
+from collections import deque
+from typing import Generator, List, Tuple, Optional
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+# Nhãn phía của từng bước trong trace
+FORWARD = 'forward'
+BACKWARD = 'backward'
+
+
+class BidirectionalBFS:
+    """
+    BFS tìm kiếm đồng thời từ Start và Exit.
+
+    Đặc điểm:
+        - Cùng giao diện find_path với BFS: trả về (path, steps)
+        - Mỗi bước trong trace có trường 'frontier' = 'forward'/'backward'
+        - Đảm bảo tìm đường ngắn nhất khi trọng số = 1
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo thuật toán BFS hai chiều.
+
+        Args:
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        # Lưu các bước để debug và trực quan hóa
+        self.steps = []
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List]:
+        """
+        Tìm đường đi ngắn nhất từ start đến goal bằng BFS hai chiều.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách các ô trên đường đi ngắn nhất
+            steps: StepTrace - mỗi bước có 'frontier' cho biết phía mở rộng
+                   ([] khi record_steps=False)
+        """
+        if not record_steps:
+            return self._find_path_fast(start, goal), []
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        BFS hai chiều có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        self.steps = StepTrace()
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return [], self.steps
+
+        # ===== KHỞI TẠO HAI PHÍA =====
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+
+        # distance[v] = số bước từ gốc của phía đó đến v (-1 = chưa thăm)
+        dist_forward = array('i', [-1]) * grid.size
+        dist_backward = array('i', [-1]) * grid.size
+        prev_forward = array('i', [-1]) * grid.size
+        prev_backward = array('i', [-1]) * grid.size
+        dist_forward[source] = dist_backward[target] = 0
+        prev_forward[source] = source
+        prev_backward[target] = target
+        queue_forward = deque([source])
+        queue_backward = deque([target])
+        visited_count = 1 if source == target else 2
+        self.steps.visit(start)
+        self.steps.visit(goal)
+        # "Đường đi hiện tại" của ô: nửa xuôi nếu phía Start đã chạm tới,
+        # ngược lại là nửa ngược (ô -> Exit)
+        self.steps.set_path_builder(
+            lambda cell: self._half_path(dist_forward, prev_forward, prev_backward,
+                                         source, target, grid.node_id(*cell)))
+
+        if source == target:
+            self.steps.add_step(current=start, frontier=FORWARD, queue_size=0)
+            yield self.steps[-1]
+            self._set_stats(1, visited_count, [start])
+            return [start], self.steps
+
+        # Điểm gặp tốt nhất: cạnh (meet_forward -> meet_backward)
+        best = -1
+        meet_forward = meet_backward = -1
+
+        # ===== VÒNG LẶP CHÍNH: MỞ RỘNG TỪNG TẦNG =====
+        while queue_forward and queue_backward:
+            # Luôn mở rộng phía có frontier nhỏ hơn
+            if len(queue_forward) <= len(queue_backward):
+                frontier, queue = FORWARD, queue_forward
+                dist, prev, other_dist = dist_forward, prev_forward, dist_backward
+            else:
+                frontier, queue = BACKWARD, queue_backward
+                dist, prev, other_dist = dist_backward, prev_backward, dist_forward
+
+            for _ in range(len(queue)):
+                current = queue.popleft()
+                self.steps.add_step(
+                    current=coords(current),
+                    frontier=frontier,
+                    queue_size=len(queue),
+                    best_length=best + 1 if best >= 0 else None
+                )
+                yield self.steps[-1]
+
+                next_dist = dist[current] + 1
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    # Chạm vùng của phía kia => ứng viên điểm gặp
+                    if other_dist[neighbor] >= 0:
+                        total = next_dist + other_dist[neighbor]
+                        if best < 0 or total < best:
+                            best = total
+                            if frontier == FORWARD:
+                                meet_forward, meet_backward = current, neighbor
+                            else:
+                                meet_forward, meet_backward = neighbor, current
+                    if dist[neighbor] < 0:
+                        dist[neighbor] = next_dist
+                        prev[neighbor] = current
+                        if other_dist[neighbor] < 0:
+                            visited_count += 1
+                        self.steps.visit(coords(neighbor))
+                        queue.append(neighbor)
+
+            # Hết trọn một tầng mà đã gặp nhau => đường ngắn nhất đã được tìm thấy
+            if best >= 0:
+                path = self._join_path(prev_forward, prev_backward, source, target,
+                                       meet_forward, meet_backward)
+                self._set_stats(len(self.steps), visited_count, path)
+                return path, self.steps
+
+        # Một phía cạn frontier mà chưa gặp => không có đường đi
+        self._set_stats(len(self.steps), visited_count, [])
+        return [], self.steps
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        BFS hai chiều không ghi trace.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        """
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        if source == target:
+            self._set_stats(1, 1, [start])
+            return [start]
+
+        dist_forward = array('i', [-1]) * grid.size
+        dist_backward = array('i', [-1]) * grid.size
+        prev_forward = array('i', [-1]) * grid.size
+        prev_backward = array('i', [-1]) * grid.size
+        dist_forward[source] = dist_backward[target] = 0
+        prev_forward[source] = source
+        prev_backward[target] = target
+        queue_forward = deque([source])
+        queue_backward = deque([target])
+        visited_count = 2
+        expanded = 0
+        best = -1
+        meet_forward = meet_backward = -1
+
+        token = self.cancel_token
+        while queue_forward and queue_backward:
+            forward = len(queue_forward) <= len(queue_backward)
+            if forward:
+                queue, dist, prev, other_dist = queue_forward, dist_forward, prev_forward, dist_backward
+            else:
+                queue, dist, prev, other_dist = queue_backward, dist_backward, prev_backward, dist_forward
+            popleft, append = queue.popleft, queue.append
+
+            for _ in range(len(queue)):
+                current = popleft()
+                expanded += 1
+                if token is not None and not expanded & CANCEL_CHECK_MASK:
+                    token.check()
+                next_dist = dist[current] + 1
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    other = other_dist[neighbor]
+                    if other >= 0:
+                        if best < 0 or next_dist + other < best:
+                            best = next_dist + other
+                            if forward:
+                                meet_forward, meet_backward = current, neighbor
+                            else:
+                                meet_forward, meet_backward = neighbor, current
+                    if dist[neighbor] < 0:
+                        dist[neighbor] = next_dist
+                        prev[neighbor] = current
+                        if other < 0:
+                            visited_count += 1
+                        append(neighbor)
+
+            if best >= 0:
+                path = self._join_path(prev_forward, prev_backward, source, target,
+                                       meet_forward, meet_backward)
+                self._set_stats(expanded, visited_count, path)
+                return path
+
+        self._set_stats(expanded, visited_count, [])
+        return []
+
+    def _trace_back(self, previous: array, root: int, node: int) -> List[int]:
+        """Lần con trỏ cha từ node về root, trả về node id theo thứ tự node -> root."""
+        nodes = [node]
+        while node != root:
+            node = previous[node]
+            nodes.append(node)
+        return nodes
+
+    def _join_path(self, prev_forward: array, prev_backward: array, source: int, target: int,
+                   meet_forward: int, meet_backward: int) -> List[Tuple[int, int]]:
+        """
+        Ghép hai nửa đường đi tại cạnh gặp nhau.
+
+        Args:
+            prev_forward, prev_backward: Con trỏ cha của hai phía
+            source, target: Node id Start và Exit
+            meet_forward: Ô thuộc phía xuôi của cạnh gặp
+            meet_backward: Ô thuộc phía ngược của cạnh gặp (kề meet_forward)
+
+        Returns:
+            Danh sách các ô (x, y) từ start đến goal
+        """
+        nodes = self._trace_back(prev_forward, source, meet_forward)
+        nodes.reverse()
+        tail = self._trace_back(prev_backward, target, meet_backward)
+        coords = self.maze.coords
+        return [coords(node) for node in nodes + tail]
+
+    def _half_path(self, dist_forward: array, prev_forward: array, prev_backward: array,
+                   source: int, target: int, node: int) -> List[Tuple[int, int]]:
+        """Đường đi hiển thị cho một ô trong trace (nửa xuôi hoặc nửa ngược)."""
+        if dist_forward[node] >= 0:
+            nodes = self._trace_back(prev_forward, source, node)
+            nodes.reverse()
+        else:
+            nodes = self._trace_back(prev_backward, target, node)
+        coords = self.maze.coords
+        return [coords(n) for n in nodes]
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]]):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path)
+        }
+
+    def get_next_move(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Lấy bước đi tiếp theo cho AI.
+
+        Args:
+            start: Vị trí hiện tại của AI
+            goal: Vị trí mục tiêu
+
+        Returns:
+            Tọa độ bước đi tiếp theo hoặc None nếu không có đường
+        """
+        path, _ = self.find_path(start, goal, record_steps=False)
+        if len(path) > 1:
+            return path[1]
+        return None
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp và đặc điểm của thuật toán.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'BFS hai chiều (Bidirectional BFS)',
+            'time_complexity': 'O(V + E), thực tế ~O(b^(d/2))',
+            'space_complexity': 'O(V)',
+            'description': 'Chạy BFS đồng thời từ Start và Exit, dừng khi hai vùng gặp nhau',
+            'advantages': [
+                'Duyệt ít ô hơn BFS một chiều trên mê cung lớn, thoáng',
+                'Vẫn đảm bảo đường đi ngắn nhất (trọng số = 1)',
+                'Không cần heuristic'
+            ],
+            'disadvantages': [
+                'Cần biết trước đích (không dùng cho tìm kiếm nhiều đích)',
+                'Gấp đôi bộ nhớ khoảng cách / con trỏ cha',
+                'Lợi ích nhỏ trên mê cung hành lang hẹp (perfect maze)'
+            ]
+        }
@@ -0,0 +1,104 @@
+"""
+==============================================================================
+BUCKET QUEUE - HÀNG ĐỢI ƯU TIÊN KHÓA NGUYÊN (THUẬT TOÁN DIAL)
+==============================================================================
+
+Mô tả:
+    Khi trọng số cạnh là số nguyên nhỏ (chi phí địa hình 1..C), khóa của
+    Dijkstra là số nguyên và chỉ TĂNG dần. Khi đang lấy ra khóa d, mọi
+    khóa còn trong hàng đợi đều nằm trong [d, d + C]. Vì vậy chỉ cần
+    C + 1 "xô" (bucket) xoay vòng thay cho Binary Heap:
+
+        bucket[k mod (C + 1)] chứa các phần tử có khóa k
+
+    - push: thêm vào cuối bucket tương ứng - O(1)
+    - pop:  tiến con trỏ đến bucket khác rỗng đầu tiên rồi lấy phần tử
+            CUỐI (LIFO) - O(1) khấu hao, tổng số bước tiến ≤ khóa lớn nhất
+
+So với heapq:
+    - Không so sánh tuple, không O(log V) mỗi thao tác
+    - Chỉ dùng được khi khóa nguyên, không âm và tăng đơn điệu
+      (Dijkstra, A* với heuristic nhất quán); trọng số tùy ý thì dùng heapq
+
+Độ phức tạp:
+    - Dijkstra với Dial: O(V + E + D) với D = khoảng cách lớn nhất
+    - Bộ nhớ: O(V + C)
+==============================================================================
+"""
+
+from typing import Any, Dict, Tuple
+
+
+class BucketQueue:
+    """
+    Hàng đợi ưu tiên khóa nguyên, xoay vòng `span` bucket.
+
+    Khóa được push phải nằm trong [khóa nhỏ nhất hiện tại, + span).
+
+    Attributes:
+        pushes, pops: Số lần push / pop
+        bucket_scans: Số bucket rỗng con trỏ phải bước qua
+        max_size: Số phần tử lớn nhất từng có trong hàng đợi
+    """
+
+    __slots__ = ('_buckets', '_span', '_cursor', '_size',
+                 'pushes', 'pops', 'bucket_scans', 'max_size')
+
+    def __init__(self, span: int, start_key: int = 0):
+        """
+        Args:
+            span: Số bucket = (khóa lớn nhất - khóa nhỏ nhất) + 1 có thể cùng tồn tại
+            start_key: Khóa nhỏ nhất ban đầu
+        """
+        self._buckets = [[] for _ in range(span)]
+        self._span = span
+        self._cursor = start_key
+        self._size = 0
+        self.pushes = 0
+        self.pops = 0
+        self.bucket_scans = 0
+        self.max_size = 0
+
+    def push(self, key: int, item: Any):
+        """Thêm item với khóa key (cursor <= key < cursor + span)."""
+        self._buckets[key % self._span].append(item)
+        self._size += 1
+        self.pushes += 1
+        if self._size > self.max_size:
+            self.max_size = self._size
+
+    def pop(self) -> Tuple[int, Any]:
+        """
+        Lấy phần tử có khóa nhỏ nhất (LIFO trong cùng bucket).
+
+        Returns:
+            (khóa, item)
+
+        Raises:
+            IndexError: Nếu hàng đợi rỗng
+        """
+        if not self._size:
+            raise IndexError('pop từ BucketQueue rỗng')
+        buckets, span = self._buckets, self._span
+        while not buckets[self._cursor % span]:
+            self._cursor += 1
+            self.bucket_scans += 1
+        self._size -= 1
+        self.pops += 1
+        return self._cursor, buckets[self._cursor % span].pop()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Bộ đếm để hiển thị trong trace / bảng so sánh."""
+        return {
+            'bucket_pushes': self.pushes,
+            'bucket_pops': self.pops,
+            'bucket_scans': self.bucket_scans,
+            'bucket_max_size': self.max_size
+        }
+
+    def __repr__(self) -> str:
+        return f'BucketQueue({self._size} phần tử, {self._span} bucket, khóa >= {self._cursor})'
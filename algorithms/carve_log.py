@@ -0,0 +1,198 @@
+"""
+==============================================================================
+CARVE LOG - NHẬT KÝ ĐÀO TƯỜNG CỦA BỘ SINH MÊ CUNG
+==============================================================================
+
+Mô tả bài toán:
+    MazeGenerator từng chép cả lưới ở mỗi vòng lặp để trực quan hóa:
+    khoảng 2·W·H/4 bước, mỗi bước W·H ô => O(V²) bộ nhớ và thời gian,
+    mê cung 51x51 đã tốn vài MB, 1001x1001 thì không chạy nổi.
+
+Ý tưởng:
+    Backtracking chỉ ĐÀO (tường -> đường), không bao giờ lấp lại, nên lưới
+    ở bước k = lưới ban đầu + các lần đào xảy ra trước bước k. Chỉ cần ghi:
+    - Mỗi lần đào (push): cặp (tường, ô) vào một array('i')
+    - Mỗi bước: ô đang xét và kích thước stack (2 array('i'))
+    Số lần đào trước bước k suy ra được từ kích thước stack:
+        stack_size[k] = 1 + push - pop,  k = push + pop
+        => push = (k + stack_size[k] - 1) // 2
+    Bước k là push nếu stack bước sau lớn hơn, là pop (quay lui) nếu nhỏ hơn.
+
+Tương thích:
+    log[k] trả về Mapping giống dict bước cũ ('maze', 'current',
+    'stack_size'); 'maze' được dựng lại khi truy cập.
+
+Độ phức tạp:
+    - Ghi một bước: O(1), bộ nhớ O(V) cả trace (4 byte/số)
+    - Dựng lưới ở bước k: O(V) (chép lưới ban đầu + áp các lần đào)
+    - replay(): duyệt mọi bước trên MỘT lưới, O(1) mỗi bước
+==============================================================================
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Iterator, Tuple
+
+from models.compact_grid import PATH, CompactGrid
+
+
+class CarveStep(Mapping):
+    """
+    Một bước của CarveLog, hành xử như dict bước cũ.
+
+    Các khóa:
+        - 'maze': CompactGrid tại bước này (dựng lại mỗi lần truy cập)
+        - 'current': Ô (x, y) đang ở đỉnh stack
+        - 'stack_size': Kích thước stack
+        - 'carved': Số lần đào đã xảy ra trước bước này
+    """
+
+    __slots__ = ('_log', '_index')
+
+    _KEYS = ('maze', 'current', 'stack_size', 'carved')
+
+    def __init__(self, log: 'CarveLog', index: int):
+        self._log = log
+        self._index = index
+
+    def __getitem__(self, key):
+        log = self._log
+        if key == 'maze':
+            return log.grid_at(self._index)
+        if key == 'current':
+            return log.base.coords(log._current[self._index])
+        if key == 'stack_size':
+            return log._stack_size[self._index]
+        if key == 'carved':
+            return log.carved_before(self._index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f'CarveStep({self._index}, current={self["current"]}, stack_size={self["stack_size"]})'
+
+
+class CarveLog(Sequence):
+    """
+    Danh sách các bước sinh mê cung, lưu dạng nhật ký đào.
+
+    Cách dùng trong bộ sinh:
+        log = CarveLog(grid)                 # grid: lưới trước vòng lặp
+        log.add_step(current, len(stack))    # đầu mỗi vòng lặp
+        log.carve(wall, cell)                # khi phá tường và đào ô mới
+
+    Cách dùng khi hiển thị:
+        len(log), log[k]['maze'], log.grid_at(k), for k, grid in log.replay()
+    """
+
+    def __init__(self, grid: CompactGrid):
+        """
+        Args:
+            grid: Lưới ban đầu (được chép lại, các lần đào sau không ảnh hưởng)
+        """
+        self.base = grid.copy()
+        # Cặp (tường, ô) của từng lần đào, theo thứ tự
+        self._carves = array('i')
+        # Mỗi bước: node id ô đang xét và kích thước stack
+        self._current = array('i')
+        self._stack_size = array('i')
+
+    # ===== GHI NHẬT KÝ =====
+
+    def add_step(self, current: int, stack_size: int):
+        """Chốt một bước (đầu vòng lặp, trước khi đào hoặc quay lui)."""
+        self._current.append(current)
+        self._stack_size.append(stack_size)
+
+    def carve(self, wall: int, cell: int):
+        """Ghi một lần phá tường `wall` và đào ô `cell` (node id)."""
+        self._carves.append(wall)
+        self._carves.append(cell)
+
+    # ===== TRUY XUẤT =====
+
+    def carved_before(self, index: int) -> int:
+        """Số lần đào (push) xảy ra trước bước index."""
+        if index < 0:
+            index += len(self._current)
+        return (index + self._stack_size[index] - 1) // 2
+
+    def action(self, index: int) -> str:
+        """
+        Việc bộ sinh làm ở bước index.
+
+        Returns:
+            'push' (đào ô mới) hoặc 'pop' (quay lui)
+        """
+        if index < 0:
+            index += len(self._current)
+        return 'push' if self.carved_before(index) < self._carved_until(index + 1) else 'pop'
+
+    def _carved_until(self, index: int) -> int:
+        # Bước index có thể là "sau bước cuối": khi đó là tổng số lần đào
+        if index >= len(self._current):
+            return len(self._carves) // 2
+        return self.carved_before(index)
+
+    def grid_at(self, index: int) -> CompactGrid:
+        """
+        Dựng lưới tại bước index (trước việc đào của chính bước đó).
+
+        Returns:
+            CompactGrid mới, độc lập với nhật ký
+        """
+        if index < 0:
+            index += len(self._current)
+        if not 0 <= index < len(self._current):
+            raise IndexError(index)
+        grid = self.base.copy()
+        cells = grid.cells
+        for node in self._carves[:2 * self.carved_before(index)]:
+            cells[node] = PATH
+        return grid
+
+    def replay(self) -> Iterator[Tuple[int, CompactGrid]]:
+        """
+        Duyệt mọi bước theo thứ tự trên MỘT lưới, đào dần (O(1) mỗi bước).
+
+        Lưới được dùng chung giữa các lần yield: chép (grid.copy()) nếu
+        cần giữ lại.
+
+        Yields:
+            (index, grid) với grid là lưới tại bước index
+        """
+        grid = self.base.copy()
+        cells = grid.cells
+        carves = self._carves
+        applied = 0
+        for index in range(len(self._current)):
+            target = 2 * self.carved_before(index)
+            while applied < target:
+                cells[carves[applied]] = PATH
+                applied += 1
+            yield index, grid
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._current)))]
+        if index < 0:
+            index += len(self._current)
+        if not 0 <= index < len(self._current):
+            raise IndexError(index)
+        return CarveStep(self, index)
+
+    def estimated_bytes(self) -> int:
+        """Bộ nhớ của nhật ký (byte), không tính lưới ban đầu."""
+        return sum(log.buffer_info()[1] * log.itemsize
+                   for log in (self._carves, self._current, self._stack_size))
+
+    def __repr__(self) -> str:
+        return f'CarveLog({len(self)} bước, {len(self._carves) // 2} lần đào)'
@@ -0,0 +1,214 @@
+"""
+==============================================================================
+SO SÁNH THUẬT TOÁN - ĐO THỜI GIAN CÓ THỐNG KÊ, CHẠY NGOÀI LUỒNG GIAO DIỆN
+==============================================================================
+
+Mô tả bài toán:
+    Chạy mỗi thuật toán MỘT lần bằng time.time() trên luồng Tk cho số đo
+    nhiễu (độ phân giải đồng hồ, GC, cache CPU nguội) và làm treo cửa sổ.
+
+Cách đo:
+    1. Chế độ nhanh (record_steps=False): chỉ đo thuật toán, không ghi trace
+    2. Chạy khởi động (warm-up): dựng sẵn các index cache theo mê cung
+       (CSR, đồ thị nút giao, bảng mốc ALT, đồ thị cụm HPA*) và làm nóng
+       bytecode / cache CPU - không tính vào kết quả
+    3. Lặp N lần, mỗi lần đo bằng time.perf_counter_ns() với GC tạm tắt
+    4. Báo trung vị (median), p95 và độ lệch chuẩn của N lần đo
+    5. Thêm MỘT lần chạy dưới tracemalloc (không tính giờ) để lấy bộ nhớ
+       đỉnh của một truy vấn
+    Mỗi lần chạy có giới hạn thời gian (CancelToken(timeout) gắn vào
+    solver): một solver chậm bất thường chỉ được báo "quá giờ", không giữ
+    kênh so sánh (và tiến trình con) mãi
+
+Chạy song song:
+    Mỗi thuật toán là một tác vụ của ProcessPoolExecutor. Tiến trình con
+    dựng lại Maze từ CompactGrid (pickle được) nên cache index là riêng
+    của tiến trình đó. Giao diện kiểm tra các future bằng root.after và
+    hiện từng thuật toán ngay khi nó xong.
+
+    Lưu ý: tiến trình con được tạo bằng "spawn" (mọi hệ điều hành), file
+    chạy chính phải có `if __name__ == '__main__':`.
+==============================================================================
+"""
+
+import gc
+import math
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models import Maze
+from models.compact_grid import CompactGrid
+from .registry import get_solver, solver_names
+from .task_executor import CancelToken, TaskCancelled
+
+# Số lần chạy khởi động và số lần đo mặc định
+DEFAULT_WARMUP = 2
+DEFAULT_REPEATS = 9
+# Giới hạn thời gian mỗi lần chạy (giây)
+DEFAULT_TIMEOUT = 10.0
+
+
+def comparison_names() -> List[str]:
+    """
+    Các thuật toán được so sánh, theo thứ tự đăng ký trong registry.
+
+    Solver tăng dần (LPA*) được đo bằng số ô chạm khi sửa đường, không đo
+    kiểu tìm một lần nên không nằm trong bảng so sánh.
+    """
+    return solver_names(incremental=False)
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """
+    Thống kê các lần đo (nano giây) ra mili giây.
+
+    p95 theo hạng gần nhất (nearest-rank); độ lệch chuẩn mẫu, 0 nếu chỉ
+    có một lần đo.
+
+    Returns:
+        Dict {runs, median_ms, p95_ms, stdev_ms, min_ms}
+    """
+    ordered = sorted(samples_ns)
+    if not ordered:
+        return {'runs': 0, 'median_ms': 0.0, 'p95_ms': 0.0, 'stdev_ms': 0.0, 'min_ms': 0.0}
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    stdev = statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    return {
+        'runs': len(ordered),
+        'median_ms': statistics.median(ordered) / 1e6,
+        'p95_ms': p95 / 1e6,
+        'stdev_ms': stdev / 1e6,
+        'min_ms': ordered[0] / 1e6
+    }
+
+
+def trace_allocations(run: Callable, interrupts: Tuple = (TaskCancelled,)) -> Tuple[int, int, bool]:
+    """
+    Chạy run() một lần dưới tracemalloc, đo cấp phát của riêng lần chạy đó.
+
+    tracemalloc được bật ngay trước và tắt ngay sau lần chạy nên đỉnh chỉ
+    gồm lần chạy này, như nhau trên mọi phiên bản Python. Nếu nơi khác
+    đang trace thì trace đó bị dừng (mất các cấp phát đã ghi) và được bật
+    lại với cùng số frame sau khi đo.
+
+    Args:
+        run: Hàm không tham số cần đo
+        interrupts: Các exception coi là "chạy dở" (vẫn báo đỉnh tới lúc dừng)
+
+    Returns:
+        (peak, retained, completed): byte cấp phát đỉnh, byte còn giữ lại
+        sau lần chạy, False nếu run() dừng giữa chừng
+    """
+    gc.collect()
+    frames = tracemalloc.get_traceback_limit() if tracemalloc.is_tracing() else None
+    if frames is not None:
+        tracemalloc.stop()
+    tracemalloc.start()
+    completed = True
+    try:
+        run()
+    except interrupts:
+        completed = False
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if frames is not None:
+            tracemalloc.start(frames)
+    return peak, current, completed
+
+
+def time_solver(name: str, maze, start: Tuple[int, int], goal: Tuple[int, int],
+                warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS,
+                timeout: Optional[float] = DEFAULT_TIMEOUT) -> Dict:
+    """
+    Đo một thuật toán trên mê cung (chạy trong tiến trình hiện tại).
+
+    Args:
+        name: Tên thuật toán trong registry
+        maze: Maze (để các index được cache giữa các lần chạy)
+        start, goal: Điểm đầu, điểm đích
+        warmup: Số lần chạy khởi động (không tính)
+        repeats: Số lần đo
+        timeout: Giới hạn giây cho mỗi lần chạy (None = không giới hạn)
+
+    Returns:
+        Dict {name, path, stats, time (giây, trung vị), timing, peak_bytes,
+        timed_out}. Quá giờ thì timed_out = True, path = [], time và
+        peak_bytes = None, dừng luôn các lần chạy còn lại
+    """
+    solver = get_solver(name).create(maze)
+
+    def new_token():
+        # Luôn có token (kể cả không giới hạn giờ) để executor dừng được việc đo
+        return CancelToken(timeout or None)
+
+    def run(token):
+        solver.cancel_token = token
+        return solver.find_path(start, goal, record_steps=False)[0]
+
+    clock = time.perf_counter_ns
+    samples = []
+    path = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(warmup):
+            run(new_token())
+        for _ in range(max(1, repeats)):
+            gc.collect()
+            gc.disable()
+            # Token tạo trước khi bấm giờ: số đo chỉ gồm thuật toán
+            token = new_token()
+            started = clock()
+            path = run(token)
+            samples.append(clock() - started)
+            if gc_was_enabled:
+                gc.enable()
+    except TaskCancelled:
+        return {
+            'name': name,
+            'path': [],
+            'stats': {},
+            'time': None,
+            'timing': summarize(samples),
+            'peak_bytes': None,
+            'timed_out': True,
+            'timeout': timeout
+        }
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    stats = dict(solver.stats)
+
+    # Bộ nhớ đỉnh của một truy vấn (index đã dựng sẵn từ lúc khởi động)
+    token = new_token()
+    peak, _, _ = trace_allocations(lambda: run(token))
+
+    timing = summarize(samples)
+    return {
+        'name': name,
+        'path': path,
+        'stats': stats,
+        'time': timing['median_ms'] / 1000,
+        'timing': timing,
+        'peak_bytes': peak,
+        'timed_out': False,
+        'timeout': timeout
+    }
+
+
+def measure(name: str, grid: CompactGrid, start: Tuple[int, int], goal: Tuple[int, int],
+            warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS,
+            timeout: Optional[float] = DEFAULT_TIMEOUT) -> Dict:
+    """
+    Tác vụ cho ProcessPoolExecutor: dựng lại Maze từ lưới rồi gọi time_solver.
+
+    Args:
+        grid: CompactGrid của mê cung (được pickle sang tiến trình con)
+        Các tham số khác: như time_solver
+    """
+    maze = Maze(grid.width, grid.height)
+    maze.set_grid(grid)
+    maze.start_pos, maze.exit_pos = tuple(start), tuple(goal)
+    return time_solver(name, maze, start, goal, warmup, repeats, timeout)
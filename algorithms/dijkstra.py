@@ -22,21 +22,48 @@ Chiến lược: THAM LAM (Greedy)
     3. Với mỗi đỉnh v kề u: nếu d[u] + w(u,v) < d[v] thì cập nhật
     4. Dừng khi đến đích hoặc hết đỉnh
 
+Trọng số (địa hình):
+    w(u, v) = chi phí bước vào ô v (CompactGrid.edge_costs(), mặc định 1,
+    bùn / nước đắt hơn). Chi phí là số nguyên nhỏ nên khóa của Heap là
+    số nguyên tăng dần => dùng được hàng đợi bucket của Dial.
+
 Cấu trúc dữ liệu:
-    - Min-Heap (heapq): Lấy đỉnh có d nhỏ nhất - O(log V)
-    - Dictionary: Lưu distances và previous - O(1) lookup
-    - Set: Đánh dấu đỉnh đã xử lý
+    - Hàng đợi ưu tiên (chọn bằng tham số queue):
+        + 'bucket': BucketQueue xoay vòng C + 1 bucket (Dial) - O(1)
+        + 'heap':   Min-Heap (heapq) - O(log V), dùng cho trọng số tùy ý
+        + 'auto':   bucket khi chi phí lớn nhất <= BUCKET_MAX_COST
+    - CompactGrid: mê cung dạng bytearray, mỗi ô là một node id số nguyên
+    - array('i'): Lưu distances và previous theo node id - O(1) lookup
+    - bytearray: Đánh dấu đỉnh đã xử lý
 
 Độ phức tạp:
-    - Thời gian: O((V + E) log V) với Binary Heap
-    - Không gian: O(V)
+    - Thời gian: O((V + E) log V) với Binary Heap,
+                 O(V + E + D) với Dial (D = khoảng cách lớn nhất)
+    - Không gian: O(V) (+ O(C) bucket)
 
 Tham khảo: Chương 6 - Chiến lược tham lam
 ==============================================================================
 """
 
 import heapq
-from typing import List, Tuple, Optional, Dict
+from array import array
+from typing import Generator, List, Tuple, Optional, Dict
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from .bucket_queue import BucketQueue
+from .junction_search import JunctionSearch
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+# Loại hàng đợi ưu tiên
+QUEUE_AUTO = 'auto'
+QUEUE_BUCKET = 'bucket'
+QUEUE_HEAP = 'heap'
+
+# Chế độ 'auto' dùng bucket khi chi phí ô lớn nhất không vượt quá ngưỡng này
+# (số bucket = chi phí lớn nhất + 1; vượt ngưỡng thì heapq có lợi hơn)
+BUCKET_MAX_COST = 64
 
 
 class Dijkstra:
@@ -45,23 +72,43 @@ class Dijkstra:
     
     Đặc điểm:
         - Chiến lược THAM LAM: luôn chọn đỉnh có khoảng cách nhỏ nhất
-        - Sử dụng Min-Heap để tối ưu việc chọn đỉnh
+        - Sử dụng hàng đợi bucket (Dial) hoặc Min-Heap để chọn đỉnh
         - Đảm bảo tìm đường ngắn nhất với trọng số không âm
     """
     
-    def __init__(self, maze: List[List[int]]):
+    def __init__(self, maze, use_junctions: bool = False, queue: str = QUEUE_AUTO):
         """
         Khởi tạo thuật toán Dijkstra.
 
         Args:
-            maze: Ma trận mê cung (0 = đường đi, 1 = tường)
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+            use_junctions: True = chế độ nhanh chạy trên đồ thị nút giao
+                           (hành lang đã thu gọn, xem JunctionSearch);
+                           mê cung có địa hình thì vẫn tìm trên lưới
+            queue: 'auto', 'bucket' (Dial) hoặc 'heap' (heapq)
         """
-        self.maze = maze
-        self.height = len(maze)
-        self.width = len(maze[0])
+        if queue not in (QUEUE_AUTO, QUEUE_BUCKET, QUEUE_HEAP):
+            raise ValueError(f'Loại hàng đợi không hợp lệ: {queue}')
+        self.queue = queue
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        # Chế độ nhanh trên đồ thị nút giao (index cache theo mê cung)
+        self.use_junctions = use_junctions
+        self._junction_search = JunctionSearch(maze) if use_junctions else None
         # Lưu các bước để debug và trực quan hóa
+        self.steps = []
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
         
-    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], List, Dict]:
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
         """
         Tìm đường đi ngắn nhất từ start đến goal bằng Dijkstra.
 
@@ -77,113 +124,313 @@ class Dijkstra:
         Args:
             start: Tọa độ bắt đầu (x, y)
             goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+                          (chỉ trả về đường đi, bộ đếm nằm trong self.stats;
+                          với use_junctions thì tìm trên đồ thị nút giao)
 
         Returns:
             path: Danh sách các ô trên đường đi ngắn nhất
-            steps: Các bước để trực quan hóa
-            tables: Dict chứa {distances, previous, visited}
+            steps: StepTrace - các bước để trực quan hóa ([] ở chế độ nhanh)
+            tables: Dict chứa {distances, previous, visited} ({} ở chế độ nhanh)
         """
-        self.steps = []
+        if not record_steps:
+            # Đồ thị nút giao giả định mỗi bước chi phí 1
+            if self.use_junctions and not self.maze.weighted:
+                path = self._junction_search.find_path(start, goal)
+                self.stats = dict(self._junction_search.stats)
+                return path, [], {}
+            if self._queue_kind() == QUEUE_BUCKET:
+                return self._find_path_dial(start, goal), [], {}
+            return self._find_path_fast(start, goal), [], {}
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        Dijkstra có ghi trace, chạy lười: yield từng bước ngay khi chốt.
 
-        # ===== KHỞI TẠO =====
-        # distances[v] = khoảng cách ngắn nhất từ start đến v
-        distances = {start: 0}
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps, tables) như find_path.
 
-        # previous[v] = đỉnh trước v trên đường đi ngắn nhất (để tái tạo path)
-        previous = {}
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
 
-        # Min-Heap: (khoảng_cách, x, y) - luôn pop đỉnh có d nhỏ nhất
-        heap = [(0, start[0], start[1])]
-        # Tập các đỉnh đã xử lý xong (không cần xét lại)
-        visited = set()
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        # Trace dạng delta: chỉ ghi ô mới xử lý và các lần cập nhật distances
+        self.steps = StepTrace(scores=('distances',))
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return [], self.steps, {}
 
-        # 4 hướng di chuyển: Lên, Phải, Xuống, Trái
-        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        # ===== KHỞI TẠO =====
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        kind = self._queue_kind()
+
+        # distances[v] = khoảng cách ngắn nhất từ start đến v (-1 = vô cực)
+        distances = array('i', [-1]) * grid.size
+        distances[source] = 0
+        self.steps.set_score('distances', start, 0)
+
+        # previous[v] = đỉnh trước v trên đường đi ngắn nhất (để tái tạo path)
+        previous = array('i', [-1]) * grid.size
+
+        # Hàng đợi ưu tiên: (khoảng_cách, node) - luôn pop đỉnh có d nhỏ nhất
+        if kind == QUEUE_BUCKET:
+            # Dial: khóa đang xét là d thì mọi khóa trong hàng đợi <= d + C
+            open_list = BucketQueue(grid.cost_range()[1] + 1)
+            push, pop = open_list.push, open_list.pop
+        else:
+            open_list = []
+            push = lambda dist, node: heapq.heappush(open_list, (dist, node))
+            pop = lambda: heapq.heappop(open_list)
+        push(0, source)
+        pushes = 1
+        # Các đỉnh đã xử lý xong (không cần xét lại)
+        visited = bytearray(grid.size)
+        visited_count = 0
 
         # ===== VÒNG LẶP CHÍNH =====
-        while heap:
+        while open_list:
             # THAM LAM: Lấy đỉnh có khoảng cách nhỏ nhất
-            current_dist, x, y = heapq.heappop(heap)
-            current = (x, y)
+            current_dist, current = pop()
 
             # Bỏ qua nếu đã xử lý (có thể có nhiều entry trong heap)
-            if current in visited:
+            if visited[current]:
                 continue
 
             # Đánh dấu đã xử lý
-            visited.add(current)
+            visited[current] = 1
+            visited_count += 1
+            current_cell = coords(current)
+            self.steps.visit(current_cell)
 
             # Lưu bước hiện tại để trực quan hóa
-            self.steps.append({
-                'current': current,
-                'visited': visited.copy(),
-                'distances': distances.copy(),
-                'heap_size': len(heap),
-                'current_distance': current_dist
-            })
+            self.steps.add_step(
+                current=current_cell,
+                heap_size=len(open_list),
+                current_distance=current_dist
+            )
+            yield self.steps[-1]
 
             # ===== KIỂM TRA ĐÃ ĐẾN ĐÍCH =====
-            if current == goal:
-                path = self._reconstruct_path(previous, start, goal)
-                tables = {
-                    'distances': distances,
-                    'previous': previous,
-                    'visited': visited
-                }
-                return path, self.steps, tables
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_stats(len(self.steps), visited_count, path, pushes, kind, current_dist)
+                return path, self.steps, self._build_tables(distances, previous, visited)
 
             # ===== DUYỆT CÁC ĐỈNH KỀ (RELAX) =====
-            for dx, dy in directions:
-                new_x, new_y = x + dx, y + dy
-                neighbor = (new_x, new_y)
+            # Danh sách kề CSR dựng sẵn: chỉ chứa ô đường đi (Lên, Phải, Xuống, Trái)
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
 
-                # Kiểm tra hợp lệ: trong biên, là đường đi, chưa xử lý
-                if (0 <= new_x < self.width and 
-                    0 <= new_y < self.height and 
-                    self.maze[new_y][new_x] == 0 and 
-                    neighbor not in visited):
-
-                    # Tính khoảng cách mới (mỗi bước = 1 đơn vị)
-                    new_dist = current_dist + 1
+                # Kiểm tra hợp lệ: chưa xử lý
+                if not visited[neighbor]:
+                    # Tính khoảng cách mới (w = chi phí bước vào ô kề)
+                    new_dist = current_dist + costs[neighbor]
 
                     # RELAX: Nếu tìm được đường ngắn hơn, cập nhật
-                    if neighbor not in distances or new_dist < distances[neighbor]:
+                    if distances[neighbor] < 0 or new_dist < distances[neighbor]:
                         distances[neighbor] = new_dist
+                        self.steps.set_score('distances', coords(neighbor), new_dist)
                         previous[neighbor] = current
-                        # Thêm vào Heap (có thể có nhiều entry cho cùng đỉnh)
-                        heapq.heappush(heap, (new_dist, new_x, new_y))
+                        # Thêm vào hàng đợi (có thể có nhiều entry cho cùng đỉnh)
+                        push(new_dist, neighbor)
+                        pushes += 1
 
         # Không tìm thấy đường đi
-        return [], self.steps, {'distances': distances, 'previous': previous, 'visited': visited}
+        self._set_stats(len(self.steps), visited_count, [], pushes, kind)
+        return [], self.steps, self._build_tables(distances, previous, visited)
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Dijkstra (heapq) không ghi trace - dùng khi chỉ cần đường đi và bộ đếm.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        """
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        distances = array('i', [-1]) * grid.size
+        distances[source] = 0
+        previous = array('i', [-1]) * grid.size
+        heap = [(0, source)]
+        pushes = 1
+        heappop, heappush = heapq.heappop, heapq.heappush
+        visited = bytearray(grid.size)
+        visited_count = 0
+
+        token = self.cancel_token
+        while heap:
+            current_dist, current = heappop(heap)
+            if visited[current]:
+                continue
+            visited[current] = 1
+            visited_count += 1
+            if token is not None and not visited_count & CANCEL_CHECK_MASK:
+                token.check()
+
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_stats(visited_count, visited_count, path, pushes, QUEUE_HEAP, current_dist)
+                return path
+
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if not visited[neighbor]:
+                    new_dist = current_dist + costs[neighbor]
+                    old = distances[neighbor]
+                    if old < 0 or new_dist < old:
+                        distances[neighbor] = new_dist
+                        previous[neighbor] = current
+                        heappush(heap, (new_dist, neighbor))
+                        pushes += 1
+
+        self._set_stats(visited_count, visited_count, [], pushes, QUEUE_HEAP)
+        return []
+
+    def _find_path_dial(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Dijkstra với hàng đợi bucket xoay vòng (Dial), không ghi trace.
 
-    def _reconstruct_path(self, previous: Dict, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        Viết thẳng các bucket vào vòng lặp (không gọi BucketQueue) nhưng
+        cùng quy tắc: lấy bucket khác rỗng đầu tiên, LIFO trong bucket
+        => cùng thứ tự duyệt với find_path ở chế độ 'bucket'.
         """
-        Tái tạo đường đi từ bảng previous.
+        grid = self.maze
+        if not (grid.in_bounds(*start) and grid.in_bounds(*goal)):
+            self._set_stats(0, 0, [])
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        distances = array('i', [-1]) * grid.size
+        distances[source] = 0
+        previous = array('i', [-1]) * grid.size
+        visited = bytearray(grid.size)
+        visited_count = 0
+
+        span = grid.cost_range()[1] + 1
+        buckets = [[] for _ in range(span)]
+        buckets[0].append(source)
+        pending = pushes = 1
+        current_dist = 0
+
+        token = self.cancel_token
+        while pending:
+            bucket = buckets[current_dist % span]
+            while bucket:
+                current = bucket.pop()
+                pending -= 1
+                if visited[current]:
+                    continue
+                visited[current] = 1
+                visited_count += 1
+                if token is not None and not visited_count & CANCEL_CHECK_MASK:
+                    token.check()
+
+                if current == target:
+                    path = self._reconstruct_path(previous, source, target)
+                    self._set_stats(visited_count, visited_count, path, pushes, QUEUE_BUCKET, current_dist)
+                    return path
+
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    if not visited[neighbor]:
+                        new_dist = current_dist + costs[neighbor]
+                        old = distances[neighbor]
+                        if old < 0 or new_dist < old:
+                            distances[neighbor] = new_dist
+                            previous[neighbor] = current
+                            # new_dist - current_dist <= C nên không đè lên bucket đang xét
+                            buckets[new_dist % span].append(neighbor)
+                            pending += 1
+                            pushes += 1
+            current_dist += 1
+
+        self._set_stats(visited_count, visited_count, [], pushes, QUEUE_BUCKET)
+        return []
+
+    def _queue_kind(self) -> str:
+        """Loại hàng đợi thực dùng cho mê cung hiện tại ('bucket' hoặc 'heap')."""
+        if self.queue != QUEUE_AUTO:
+            return self.queue
+        return QUEUE_BUCKET if self.maze.cost_range()[1] <= BUCKET_MAX_COST else QUEUE_HEAP
+
+    def _reconstruct_path(self, previous: array, source: int, target: int) -> List[Tuple[int, int]]:
+        """
+        Tái tạo đường đi từ mảng previous.
         
-        Thuật toán: Truy ngược từ goal về start theo bảng previous.
+        Thuật toán: Truy ngược từ goal về start theo mảng previous.
 
         Args:
-            previous: Bảng đỉnh trước (previous[v] = đỉnh đến trước v)
-            start: Điểm bắt đầu
-            goal: Điểm kết thúc
+            previous: Mảng đỉnh trước (previous[v] = node đến trước v, -1 = không có)
+            source: Node id điểm bắt đầu
+            target: Node id điểm kết thúc
 
         Returns:
-            Danh sách các ô trên đường đi (từ start đến goal)
+            Danh sách các ô (x, y) trên đường đi (từ start đến goal)
         """
-        path = []
-        current = goal
+        nodes = []
+        current = target
 
         # Truy ngược từ goal về start
-        while current != start:
-            path.append(current)
-            if current not in previous:
+        while current != source:
+            nodes.append(current)
+            if previous[current] < 0:
                 return []  # Không có đường đi
             current = previous[current]
 
-        path.append(start)
-        path.reverse()  # Đảo ngược để có thứ tự từ start -> goal
+        nodes.append(source)
+        nodes.reverse()  # Đảo ngược để có thứ tự từ start -> goal
+
+        coords = self.maze.coords
+        return [coords(node) for node in nodes]
 
-        return path
+    def _build_tables(self, distances: array, previous: array, visited: bytearray) -> Dict:
+        """
+        Chuyển các mảng theo node id về bảng khóa (x, y) để hiển thị.
+
+        Chỉ chạy một lần ở cuối (chế độ ghi trace), không nằm trong vòng lặp.
+        """
+        coords = self.maze.coords
+        return {
+            'distances': {coords(v): d for v, d in enumerate(distances) if d >= 0},
+            'previous': {coords(v): coords(u) for v, u in enumerate(previous) if u >= 0},
+            'visited': {coords(v) for v, done in enumerate(visited) if done}
+        }
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]], pushes: int = 0,
+                   queue: str = QUEUE_HEAP, cost: int = 0):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path),
+            'path_cost': cost if path else 0,
+            'queue': queue,
+            # 'heap_pushes' hoặc 'bucket_pushes' tùy hàng đợi đã dùng
+            f'{queue}_pushes': pushes
+        }
 
     def get_complexity_info(self) -> dict:
         """
@@ -196,17 +443,18 @@ class Dijkstra:
         """
         return {
             'name': 'Dijkstra (Tham lam)',
-            'time_complexity': 'O((V + E) log V)',
+            'time_complexity': 'O((V + E) log V), Dial: O(V + E + D)',
             'space_complexity': 'O(V)',
-            'description': 'Chiến lược THAM LAM: luôn chọn đỉnh có khoảng cách nhỏ nhất, dùng Heap tối ưu.',
+            'description': 'Chiến lược THAM LAM: luôn chọn đỉnh có khoảng cách nhỏ nhất, '
+                           'dùng hàng đợi bucket (Dial) khi chi phí địa hình là số nguyên nhỏ.',
             'advantages': [
                 'Tìm được đường đi ngắn nhất CHÍNH XÁC',
-                'Hiệu quả với đồ thị có trọng số không âm',
+                'Hiệu quả với đồ thị có trọng số không âm (bùn, nước...)',
                 'Phù hợp cho đồ thị lớn',
                 'Cung cấp thông tin khoảng cách đến mọi đỉnh'
             ],
             'disadvantages': [
-                'Chậm hơn BFS khi trọng số bằng nhau',
+                'Không hơn BFS khi trọng số bằng nhau',
                 'Không sử dụng heuristic để tối ưu hướng',
                 'Phức tạp hơn BFS',
                 'Duyệt nhiều ô không cần thiết'
@@ -0,0 +1,249 @@
+"""
+==============================================================================
+THUẬT TOÁN ELLER - SINH MÊ CUNG THEO TỪNG HÀNG, BỘ NHỚ O(WIDTH)
+==============================================================================
+
+Mô tả bài toán:
+    MazeGenerator (Backtracking) giữ cả lưới, mảng visited và một Stack có
+    thể dài tới W·H/4 ô: mê cung 10k x 10k cần hàng trăm MB trước khi ghi
+    được ô nào. Cần sinh mê cung "perfect" theo TỪNG HÀNG, hàng nào xong thì
+    đưa ngay ra ngoài (ghi file, vẽ, giải) và quên đi.
+
+Ý tưởng (Eller, 1982):
+    Chỉ nhớ hàng ô hiện tại, mỗi ô thuộc một TẬP (các ô đã nối với nhau qua
+    các hàng phía trên). Với mỗi hàng ô:
+    1. Ô chưa có tập (không được nối xuống từ hàng trên) -> tập mới
+    2. Nối NGANG ngẫu nhiên hai ô kề thuộc hai tập khác nhau (gộp tập);
+       hàng cuối nối MỌI cặp khác tập để cả mê cung liên thông
+    3. Nối XUỐNG ngẫu nhiên, mỗi tập ÍT NHẤT một ô (nếu không tập đó bị
+       cô lập vĩnh viễn); ô nối xuống mang tập của mình sang hàng sau
+    Không bao giờ nối hai ô cùng tập => không có chu trình => perfect maze.
+
+Cài đặt:
+    - Cùng bố cục với MazeGenerator: ô ở tọa độ lẻ, tường ở giữa, viền tường
+    - Tập trong một hàng: Union-Find trên chỉ số cột (array('i'), nén đường
+      kiểu halving); mã tập mang sang hàng sau là gốc Union-Find (một cột)
+    - Mỗi hàng ô cho ra 2 hàng lưới: hàng ô (có các tường ngang đã phá) và
+      hàng tường bên dưới (có các lối xuống)
+    - iter_rows() là generator: hàng lưới nào xong thì yield hàng đó
+
+Đầu ra:
+    - iter_rows(): từng hàng bytes 0/1 (như một hàng của CompactGrid)
+    - write(path): ghi thẳng ra file bit grid (1 bit/ô, đọc lại bằng mmap
+      qua models.bit_grid.BitGrid)
+    - generate(): dựng CompactGrid như MazeGenerator (cho mê cung vừa RAM)
+
+Độ phức tạp:
+    - Thời gian: O(W × H × α) - α là hàm Ackermann ngược của Union-Find
+    - Không gian: O(W) - vài mảng theo số cột, không phụ thuộc H
+
+Tham khảo: Chương 4 - Đồ thị (Union-Find, cây khung)
+==============================================================================
+"""
+
+import random
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from models.bit_grid import BitGrid
+from models.compact_grid import PATH, WALL, CompactGrid
+
+# Xác suất phá tường ngang giữa hai ô khác tập / mở lối xuống của một ô
+JOIN_PROBABILITY = 0.5
+DOWN_PROBABILITY = 0.5
+
+
+class EllerGenerator:
+    """
+    Lớp sinh mê cung perfect theo từng hàng bằng thuật toán Eller.
+
+    Chỉ giữ trạng thái của một hàng (O(width)), nên sinh được mê cung
+    lớn tùy ý và đưa từng hàng ra ngay khi xong.
+    """
+
+    def __init__(self, width: int, height: int, seed: Optional[int] = None):
+        """
+        Khởi tạo bộ sinh.
+
+        Args:
+            width: Chiều rộng mê cung (số cột, nên là số LẺ)
+            height: Chiều cao mê cung (số hàng, nên là số LẺ)
+            seed: Hạt giống ngẫu nhiên (cùng seed => cùng mê cung);
+                  None = dùng bộ sinh chung của module random
+        """
+        self.width = width
+        self.height = height
+        self._random = random.Random(seed) if seed is not None else random
+        # CancelToken của việc nền đang sinh mê cung (None = không hủy)
+        self.cancel_token = None
+
+    def iter_rows(self) -> Iterator[bytes]:
+        """
+        Sinh mê cung, yield từng hàng lưới từ trên xuống.
+
+        Yields:
+            bytes dài width: 0 = đường đi, 1 = tường (đủ height hàng)
+
+        Raises:
+            TaskCancelled: Nếu cancel_token bị hủy giữa chừng
+        """
+        width, height = self.width, self.height
+        # Ô ở cột / hàng lẻ trong khoảng 1 .. size - 2
+        columns = max(0, (width - 1) // 2)
+        rows = max(0, (height - 1) // 2)
+        rand = self._random.random
+        token = self.cancel_token
+
+        wall_row = bytes([WALL]) * width
+        open_cells = bytes([PATH]) * columns
+        identity = array('i', range(columns))
+        # Trạng thái O(columns): tập mang xuống từ hàng trên (-1 = chưa có),
+        # Union-Find của hàng hiện tại, cột đầu tiên của mỗi tập mang xuống
+        carry = array('i', [-1]) * columns
+        parent = array('i', identity)
+        first = array('i', [-1]) * columns
+        remaining = array('i', [0]) * columns
+        has_down = bytearray(columns)
+
+        def find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        y = 0
+        yield self._finish_row(wall_row, y)
+        y += 1
+
+        for row_index in range(rows):
+            if token is not None:
+                token.check()
+            last = row_index == rows - 1
+
+            # ===== BƯỚC 1: TẬP CỦA TỪNG Ô =====
+            # Ô cùng tập mang xuống được gộp vào ô đầu tiên của tập đó
+            parent[:] = identity
+            for column in range(columns):
+                label = carry[column]
+                if label >= 0:
+                    head = first[label]
+                    if head < 0:
+                        first[label] = column
+                    else:
+                        parent[column] = head
+            for column in range(columns):
+                label = carry[column]
+                if label >= 0:
+                    first[label] = -1
+
+            # ===== BƯỚC 2: NỐI NGANG =====
+            cells = bytearray(wall_row)
+            cells[1:2 * columns:2] = open_cells
+            for column in range(columns - 1):
+                left, right = find(column), find(column + 1)
+                if left != right and (last or rand() < JOIN_PROBABILITY):
+                    parent[right] = left
+                    cells[2 * column + 2] = PATH
+            yield self._finish_row(cells, y)
+            y += 1
+            if last:
+                break
+
+            # ===== BƯỚC 3: NỐI XUỐNG (mỗi tập ít nhất một ô) =====
+            below = bytearray(wall_row)
+            for column in range(columns):
+                root = carry[column] = find(column)
+                remaining[root] += 1
+            for column in range(columns):
+                root = carry[column]
+                remaining[root] -= 1
+                if rand() < DOWN_PROBABILITY or not (remaining[root] or has_down[root]):
+                    has_down[root] = 1
+                    below[2 * column + 1] = PATH
+                else:
+                    carry[column] = -1
+            for column in range(columns):
+                has_down[column] = 0
+            yield self._finish_row(below, y)
+            y += 1
+
+        # Hàng tường còn lại (viền dưới, và hàng thừa khi height chẵn)
+        while y < height:
+            yield self._finish_row(wall_row, y)
+            y += 1
+
+    def _finish_row(self, row, y: int) -> bytes:
+        """
+        Chốt một hàng lưới: mở Start (1, 1) và Exit (width-2, height-2)
+        như MazeGenerator.
+
+        Args:
+            row: Hàng lưới (bytes / bytearray dài width)
+            y: Chỉ số hàng
+
+        Returns:
+            bytes của hàng (bất biến, người nhận giữ lại được)
+        """
+        if y == 1 and self.width > 2:
+            row = bytearray(row)
+            row[1] = PATH
+        if y == self.height - 2 and self.width > 2:
+            row = bytearray(row)
+            row[self.width - 2] = PATH
+        return bytes(row)
+
+    def generate(self, record_steps: bool = False) -> Tuple[CompactGrid, List]:
+        """
+        Sinh cả mê cung vào một CompactGrid (dùng như MazeGenerator.generate).
+
+        Args:
+            record_steps: Chỉ để cùng chữ ký với MazeGenerator; Eller không
+                          ghi trace từng bước
+
+        Returns:
+            maze: CompactGrid mê cung (0 = đường đi, 1 = tường)
+            steps: Luôn là []
+        """
+        grid = CompactGrid(self.width, self.height)
+        stride, width = grid.stride, self.width
+        for y, row in enumerate(self.iter_rows()):
+            start = (y + 1) * stride + 1
+            grid.cells[start:start + width] = row
+        return grid, []
+
+    def write(self, path: str) -> int:
+        """
+        Sinh mê cung thẳng ra file bit grid (1 bit/ô), bộ nhớ O(width).
+
+        Đọc lại bằng models.bit_grid.BitGrid.open(path) (mmap).
+
+        Returns:
+            Số byte đã ghi
+        """
+        return BitGrid.write(path, self.width, self.height, self.iter_rows())
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp và đặc điểm của thuật toán.
+
+        Dùng để hiển thị trong Debug Panel.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'Eller (theo từng hàng)',
+            'time_complexity': 'O(N × M × α)',
+            'space_complexity': 'O(M) - chỉ một hàng',
+            'description': 'Mỗi hàng: gộp tập ngẫu nhiên theo chiều ngang, mỗi tập nối xuống ít nhất một ô.',
+            'advantages': [
+                'Tạo mê cung "perfect" (chỉ 1 đường đi)',
+                'Bộ nhớ chỉ theo chiều rộng, sinh được mê cung rất lớn',
+                'Hàng nào xong đưa ra ngay (ghi file, vẽ) - không cần Stack sâu'
+            ],
+            'disadvantages': [
+                'Cấu trúc thiên theo hàng (nhiều hành lang ngang)',
+                'Không quay lui được về các hàng đã đưa ra',
+                'Khó hình dung hơn Backtracking'
+            ]
+        }
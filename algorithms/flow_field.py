@@ -0,0 +1,239 @@
+"""
+==============================================================================
+FLOW FIELD - TRƯỜNG KHOẢNG CÁCH QUANH NGƯỜI CHƠI CHO AI TRUY ĐUỔI
+==============================================================================
+
+Mô tả bài toán:
+    Trước đây mỗi lượt AI, kẻ địch chạy một BFS mới từ vị trí của nó đến
+    người chơi chỉ để đọc path[1]. Mọi kẻ địch đều đuổi CÙNG một mục tiêu,
+    nên ta đảo chiều: giữ một bản đồ khoảng cách BFS có gốc tại người chơi.
+
+    - dist[v] = số bước từ ô v đến người chơi (-1 = không tới được)
+    - Bước đi của kẻ địch tại ô v: ô kề u có dist[u] = dist[v] - 1
+      ("xuống dốc") - tra O(1), không phụ thuộc kích thước mê cung
+      hay số kẻ địch
+
+Cập nhật tăng dần khi người chơi đi 1 ô (p -> q, q kề p):
+    Khoảng cách mới d'(v) = dist(q, v) chỉ lệch tối đa 1 so với d(v).
+    1. Sóng GIẢM: các ô có đường ngắn nhất từ p đi qua q giảm đúng 1.
+       Đó là các ô tới được từ q qua những cạnh mà d tăng đúng 1
+       => BFS từ q chỉ trên các ô này.
+    2. Sóng TĂNG: các ô còn lại giữ nguyên hoặc tăng 1. Ô v ở mức k giữ
+       nguyên khi còn một ô kề có d' = k - 1 ("chỗ dựa"). Chỉ ô kề của
+       ô vừa tăng mới có thể mất chỗ dựa, nên ta xét theo từng mức k,
+       bắt đầu từ p (d'(p) = 1).
+    Chỉ các ô thực sự đổi giá trị (và ô kề của chúng) bị chạm tới.
+
+    Người chơi nhảy xa hơn 1 ô (tải game, đổi vị trí) hoặc mê cung bị
+    sửa (version lưới đổi) => dựng lại bằng một BFS đầy đủ.
+
+Độ phức tạp:
+    - Dựng lại: O(V + E)
+    - Cập nhật khi người chơi đi 1 ô: O(số ô đổi khoảng cách + ô kề của chúng)
+    - Tra bước đi cho một kẻ địch: O(bậc) = O(1)
+==============================================================================
+"""
+
+from array import array
+from collections import deque
+from typing import Optional, Tuple
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+
+# Đánh dấu ô trong một lần cập nhật tăng dần
+_DECREASED = 1
+_INCREASED = 2
+
+
+class FlowField:
+    """
+    Bản đồ khoảng cách BFS có gốc tại mục tiêu (người chơi).
+
+    Dùng được thay BFS trong Enemy.update_ai: get_next_move(start, goal)
+    tự đồng bộ mục tiêu rồi tra bước xuống dốc.
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo flow field (chưa có mục tiêu).
+
+        Args:
+            maze: Maze, CompactGrid hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        self.distance = None
+        self.target = -1
+        self.version = None
+        self._marks = None
+        # Bộ đếm: số lần dựng lại, số lần cập nhật tăng dần, số ô đổi ở lần gần nhất
+        self.stats = {'rebuilds': 0, 'incremental_updates': 0, 'cells_updated': 0}
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def set_target(self, goal: Tuple[int, int]):
+        """
+        Đặt mục tiêu mới cho trường khoảng cách.
+
+        Mục tiêu kề mục tiêu cũ (người chơi đi 1 ô) => cập nhật tăng dần;
+        trường hợp khác => dựng lại.
+
+        Args:
+            goal: Vị trí người chơi (x, y)
+        """
+        grid = self.maze
+        if not grid.is_open(*goal):
+            self.distance, self.target, self.version = None, -1, None
+            return
+        node = grid.node_id(*goal)
+        if self.distance is not None and self.version == grid.version:
+            if node == self.target:
+                return
+            if self.distance[node] == 1:
+                self._move_target(node)
+                return
+        self._rebuild(node)
+
+    def _rebuild(self, source: int):
+        """BFS đầy đủ từ mục tiêu."""
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        size = self.maze.size
+        distance = array('i', [-1]) * size
+        distance[source] = 0
+        queue = deque([source])
+        popleft, append = queue.popleft, queue.append
+        while queue:
+            current = popleft()
+            next_dist = distance[current] + 1
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if distance[neighbor] < 0:
+                    distance[neighbor] = next_dist
+                    append(neighbor)
+
+        self.distance = distance
+        self.target = source
+        self.version = self.maze.version
+        self._marks = bytearray(size)
+        self.stats['rebuilds'] += 1
+        self.stats['cells_updated'] = size
+
+    def _move_target(self, new_target: int):
+        """Dời gốc sang ô kề new_target, chỉ sửa các ô đổi khoảng cách."""
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        distance, marks = self.distance, self._marks
+        touched = []
+
+        # ===== SÓNG GIẢM: các ô có đường ngắn nhất đi qua new_target =====
+        distance[new_target] = 0
+        marks[new_target] = _DECREASED
+        touched.append(new_target)
+        queue = deque([new_target])
+        while queue:
+            current = queue.popleft()
+            # Khoảng cách cũ của current là distance[current] + 1
+            old_next = distance[current] + 2
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if not marks[neighbor] and distance[neighbor] == old_next:
+                    distance[neighbor] = old_next - 1
+                    marks[neighbor] = _DECREASED
+                    touched.append(neighbor)
+                    queue.append(neighbor)
+
+        # ===== SÓNG TĂNG: theo từng mức, bắt đầu từ gốc cũ =====
+        old_target = self.target
+        distance[old_target] = 1
+        marks[old_target] = _INCREASED
+        touched.append(old_target)
+        level = [old_target]
+        while level:
+            # Ô kề (mức cũ + 1) của các ô vừa tăng có thể mất chỗ dựa
+            candidates = set()
+            for current in level:
+                old_next = distance[current]  # = khoảng cách cũ + 1
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    if not marks[neighbor] and distance[neighbor] == old_next:
+                        candidates.add(neighbor)
+
+            level = []
+            for candidate in candidates:
+                support = distance[candidate] - 1
+                for neighbor in neighbors[offsets[candidate]:offsets[candidate + 1]]:
+                    if distance[neighbor] == support:
+                        break
+                else:
+                    distance[candidate] += 1
+                    marks[candidate] = _INCREASED
+                    touched.append(candidate)
+                    level.append(candidate)
+
+        for node in touched:
+            marks[node] = 0
+        self.target = new_target
+        self.stats['incremental_updates'] += 1
+        self.stats['cells_updated'] = len(touched)
+
+    def get_distance(self, pos: Tuple[int, int]) -> Optional[int]:
+        """Số bước từ pos đến mục tiêu (None nếu không tới được)."""
+        if self.distance is None or not self.maze.is_open(*pos):
+            return None
+        value = self.distance[self.maze.node_id(*pos)]
+        return value if value >= 0 else None
+
+    def next_move(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Bước xuống dốc từ pos về phía mục tiêu.
+
+        Returns:
+            Ô kề (x, y) gần mục tiêu hơn 1 bước, hoặc None nếu đã ở mục tiêu
+            hay không tới được
+        """
+        grid = self.maze
+        if self.distance is None or self.version != grid.version or not grid.is_open(*pos):
+            return None
+        node = grid.node_id(*pos)
+        downhill = self.distance[node] - 1
+        if downhill < 0:
+            return None
+        adjacency = self._get_adjacency()
+        for neighbor in adjacency.neighbors[adjacency.offsets[node]:adjacency.offsets[node + 1]]:
+            if self.distance[neighbor] == downhill:
+                return grid.coords(neighbor)
+        return None
+
+    def get_next_move(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Cùng giao diện với BFS.get_next_move (dùng cho Enemy.update_ai).
+
+        Args:
+            start: Vị trí hiện tại của AI (kẻ địch)
+            goal: Vị trí mục tiêu (người chơi)
+        """
+        self.set_target(goal)
+        return self.next_move(start)
+
+    def get_complexity_info(self) -> dict:
+        """Thông tin độ phức tạp để hiển thị trong Debug Panel."""
+        return {
+            'name': 'Flow Field (BFS từ người chơi)',
+            'time_complexity': 'O(Δ) mỗi bước người chơi, O(1) mỗi kẻ địch',
+            'space_complexity': 'O(V)',
+            'description': 'Giữ bản đồ khoảng cách BFS có gốc tại người chơi, '
+                           'cập nhật tăng dần khi người chơi đi 1 ô; kẻ địch đi theo hướng xuống dốc.',
+            'advantages': [
+                'Tra bước đi O(1) cho mọi kẻ địch',
+                'Chi phí không tăng theo số kẻ địch',
+                'Chỉ sửa các ô đổi khoảng cách khi người chơi di chuyển'
+            ],
+            'disadvantages': [
+                'Tốn O(V) bộ nhớ cho bản đồ khoảng cách',
+                'Phải dựng lại khi mê cung bị sửa hoặc người chơi nhảy xa',
+                'Trên mê cung hoàn hảo, một bước có thể đổi khoảng cách của nửa mê cung'
+            ]
+        }
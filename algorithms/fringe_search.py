@@ -0,0 +1,429 @@
+"""
+==============================================================================
+FRINGE SEARCH - A* KHÔNG CẦN HEAP, DUYỆT THEO NGƯỠNG NHƯ IDA*
+==============================================================================
+
+Mô tả bài toán:
+    IDA* tốn ít bộ nhớ nhưng mỗi lượt phải DFS lại từ start. A* không lặp
+    lại nhưng mỗi thao tác Heap tốn O(log V) và mỗi phần tử Heap là một
+    tuple Python.
+
+Ý tưởng Fringe Search (Björnsson và cộng sự, 2005):
+    Giữ lại "rìa" (fringe) giữa các lượt thay vì DFS lại từ đầu:
+    - Fringe là danh sách liên kết các ô đang chờ; mỗi lượt quét từ đầu
+      danh sách với ngưỡng flimit
+    - Ô có f > flimit: để nguyên trong danh sách, ghi lại f nhỏ nhất
+    - Ô có f <= flimit: mở rộng - các ô con được chèn NGAY SAU nó (nên được
+      xét ngay trong lượt này, giống DFS), rồi gỡ nó khỏi danh sách
+    - Hết lượt: flimit = f nhỏ nhất đã gặp, quét lại
+    - Cache g theo node: ô con chỉ được chèn khi tìm được g nhỏ hơn
+    Với h consistent, ô đích được mở rộng lần đầu là đường đi NGẮN NHẤT.
+
+Cài đặt (8 byte/ô):
+    - Danh sách liên kết ĐƠN vòng tròn bằng một array('i') next theo node
+      id, thêm một node canh (HEAD = grid.size); next = -1 nghĩa là không
+      nằm trong fringe (không cần mảng cờ riêng). Ô đang quét được gỡ nhờ
+      giữ ô đứng trước nó trong lúc quét
+    - Ô đã nằm trong fringe mà tìm được g nhỏ hơn: giữ nguyên chỗ (danh
+      sách đơn không gỡ được ô bất kỳ trong O(1)), chỉ hạ g; f của nó được
+      tính vào f nhỏ nhất của lượt vì nó có thể nằm trước con trỏ quét
+    - Không có mảng cha: dựng đường đi từ g - từ đích lùi về ô kề p có
+      g[p] + cost(ô) <= g[ô] (cha lúc gán g luôn thỏa vì g chỉ giảm)
+    - Không có Heap, không có tuple
+
+Đánh đổi:
+    Cache g là một phần của thuật toán nên bộ nhớ vẫn O(V), nhưng chỉ 2 số
+    4 byte mỗi ô (g và next), không có phần tử Heap nào và không phải DFS
+    lại từ đầu như IDA*. Ngưỡng tăng đúng bằng f nhỏ nhất bị cắt (không
+    nhánh cận như IDA*), mỗi lượt quét lại các ô còn nằm trong fringe.
+
+Độ phức tạp:
+    - Thời gian: O(số lượt * kích thước fringe + V) trường hợp xấu
+    - Không gian: O(V) - 2 mảng int theo node id (8 byte/ô)
+==============================================================================
+"""
+
+from array import array
+from typing import Dict, Generator, List, Tuple
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+# Ngưỡng "vô cực" (chưa gặp ô nào vượt ngưỡng)
+INF = float('inf')
+
+
+class FringeSearch:
+    """
+    Fringe Search: duyệt theo ngưỡng f trên danh sách liên kết, không Heap.
+
+    Đặc điểm:
+        - Cùng giao diện find_path với AStar: trả về (path, steps, tables)
+        - Đường đi tối ưu (h consistent)
+        - Trạng thái theo ô chỉ có g và con trỏ next (8 byte/ô)
+        - self.stats có thêm 'iterations', 'threshold' (ngưỡng cuối) và
+          'fringe_max_size'; mỗi bước của trace ghi lượt và ngưỡng của lượt đó
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo Fringe Search.
+
+        Args:
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        # Lưu các bước để debug và trực quan hóa
+        self.steps = StepTrace(scores=('g_score',))
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Manhattan nhân chi phí ô nhỏ nhất (admissible, consistent)."""
+        return self.maze.cost_range()[0] * (abs(pos[0] - goal[0]) + abs(pos[1] - goal[1]))
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
+        """
+        Tìm đường đi ngắn nhất từ start đến goal bằng Fringe Search.
+
+        Thuật toán:
+            1. fringe = [start], g[start] = 0, flimit = h(start)
+            2. Quét fringe từ đầu: ô có f > flimit thì bỏ qua (ghi f nhỏ
+               nhất); ô có f <= flimit thì mở rộng - chèn các ô con có g
+               tốt hơn ngay sau nó rồi gỡ nó khỏi fringe
+            3. Mở rộng tới đích -> lần ngược con trỏ cha
+            4. Hết lượt: flimit = f nhỏ nhất đã bỏ qua, quét lại;
+               fringe rỗng -> không có đường đi
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách các ô trên đường đi ngắn nhất
+            steps: StepTrace - mỗi bước là một ô được mở rộng, kèm lượt và
+                   ngưỡng ([] ở chế độ nhanh)
+            tables: Dict {g_score, previous, visited, thresholds} ({} ở chế độ nhanh)
+        """
+        if not record_steps:
+            return self._find_path_fast(start, goal), [], {}
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        Fringe Search có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps, tables) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        self.steps = StepTrace(scores=('g_score',))
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, [], 0, 0, 0)
+            return [], self.steps, {}
+
+        # ===== KHỞI TẠO =====
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        head = grid.size
+        # Danh sách liên kết đơn vòng tròn: head -> ... -> head, -1 = ngoài fringe
+        following = array('i', [-1]) * (grid.size + 1)
+        g_score = array('i', [-1]) * grid.size
+        expanded_flags = bytearray(grid.size)
+
+        following[head] = source
+        following[source] = head
+        g_score[source] = 0
+        self.steps.set_score('g_score', start, 0)
+        fringe_size = max_fringe = 1
+        visited_count = 1
+        flimit = self.heuristic(start, goal)
+        thresholds = []
+        expanded = iterations = 0
+
+        # ===== CÁC LƯỢT QUÉT FRINGE VỚI NGƯỠNG TĂNG DẦN =====
+        while following[head] != head:
+            iterations += 1
+            thresholds.append(flimit)
+            fmin = INF
+            # Ô đứng trước ô đang quét (để gỡ ô đang quét khỏi danh sách đơn)
+            before = head
+            node = following[head]
+            while node != head:
+                node_g = g_score[node]
+                node_cell = coords(node)
+                h = self.heuristic(node_cell, goal)
+                if node_g + h > flimit:
+                    if node_g + h < fmin:
+                        fmin = node_g + h
+                    before = node
+                    node = following[node]
+                    continue
+
+                expanded += 1
+                expanded_flags[node] = 1
+                self.steps.visit(node_cell)
+                self.steps.add_step(
+                    current=node_cell,
+                    iteration=iterations,
+                    threshold=flimit,
+                    next_threshold=None if fmin == INF else fmin,
+                    fringe_size=fringe_size,
+                    current_g=node_g,
+                    current_f=node_g + h,
+                    heuristic=h
+                )
+                yield self.steps[-1]
+
+                # ===== KIỂM TRA ĐÃ ĐẾN ĐÍCH =====
+                if node == target:
+                    path = self._reconstruct_path(g_score, source, target)
+                    self._set_stats(expanded, visited_count, path, iterations, flimit, max_fringe, node_g)
+                    return path, self.steps, self._build_tables(g_score, expanded_flags, thresholds, source)
+
+                # ===== CHÈN CÁC Ô CON NGAY SAU Ô ĐANG XÉT =====
+                # Chèn ngược thứ tự để ô kề đầu tiên được xét trước
+                for position in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                    child = neighbors[position]
+                    child_g = node_g + costs[child]
+                    old = g_score[child]
+                    if old >= 0 and child_g >= old:
+                        continue
+                    if old < 0:
+                        visited_count += 1
+                    g_score[child] = child_g
+                    self.steps.set_score('g_score', coords(child), child_g)
+                    if following[child] >= 0:
+                        # Đã trong fringe: giữ chỗ, f mới có thể nằm trước con trỏ quét
+                        child_f = child_g + self.heuristic(coords(child), goal)
+                        if child_f < fmin:
+                            fmin = child_f
+                        continue
+                    following[child] = following[node]
+                    following[node] = child
+                    fringe_size += 1
+                if fringe_size > max_fringe:
+                    max_fringe = fringe_size
+
+                # Gỡ ô vừa mở rộng; ô kế tiếp là ô con đầu tiên (nếu có)
+                after = following[node]
+                following[before] = after
+                following[node] = -1
+                fringe_size -= 1
+                node = after
+
+            flimit = fmin
+
+        # Fringe rỗng: không có đường đi
+        self._set_stats(expanded, visited_count, [], iterations, thresholds[-1] if thresholds else 0,
+                        max_fringe)
+        return [], self.steps, self._build_tables(g_score, expanded_flags, thresholds, source)
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Fringe Search không ghi trace.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        Các thao tác danh sách liên kết được viết thẳng trong vòng lặp.
+        """
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, [], 0, 0, 0)
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        scale = grid.cost_range()[0]
+        stride = grid.stride
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        head = grid.size
+        following = array('i', [-1]) * (grid.size + 1)
+        g_score = array('i', [-1]) * grid.size
+
+        following[head] = source
+        following[source] = head
+        g_score[source] = 0
+        fringe_size = max_fringe = 1
+        visited_count = 1
+        flimit = last_limit = self.heuristic(start, goal)
+        expanded = iterations = 0
+        token = self.cancel_token
+
+        while following[head] != head:
+            iterations += 1
+            fmin = INF
+            before = head
+            node = following[head]
+            while node != head:
+                node_g = g_score[node]
+                y, x = divmod(node, stride)
+                f = node_g + scale * (abs(x - goal_x) + abs(y - goal_y))
+                if f > flimit:
+                    if f < fmin:
+                        fmin = f
+                    before = node
+                    node = following[node]
+                    continue
+
+                expanded += 1
+                if token is not None and not expanded & CANCEL_CHECK_MASK:
+                    token.check()
+                if node == target:
+                    path = self._reconstruct_path(g_score, source, target)
+                    self._set_stats(expanded, visited_count, path, iterations, flimit, max_fringe, node_g)
+                    return path
+
+                for position in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                    child = neighbors[position]
+                    child_g = node_g + costs[child]
+                    old = g_score[child]
+                    if old >= 0 and child_g >= old:
+                        continue
+                    if old < 0:
+                        visited_count += 1
+                    g_score[child] = child_g
+                    if following[child] >= 0:
+                        y, x = divmod(child, stride)
+                        f = child_g + scale * (abs(x - goal_x) + abs(y - goal_y))
+                        if f < fmin:
+                            fmin = f
+                        continue
+                    following[child] = following[node]
+                    following[node] = child
+                    fringe_size += 1
+                if fringe_size > max_fringe:
+                    max_fringe = fringe_size
+
+                after = following[node]
+                following[before] = after
+                following[node] = -1
+                fringe_size -= 1
+                node = after
+
+            last_limit = flimit
+            flimit = fmin
+
+        self._set_stats(expanded, visited_count, [], iterations, last_limit, max_fringe)
+        return []
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _parent(self, g_score: array, node: int) -> int:
+        """
+        Một ô cha của node suy từ g: ô kề p có g[p] + cost(node) <= g[node].
+
+        Cha lúc node được gán g luôn thỏa (g của nó chỉ giảm sau đó), nên
+        với node đã có g (khác start) luôn tìm được; g giảm ngặt dọc theo
+        chuỗi cha nên lần ngược luôn về tới start.
+        """
+        adjacency = self._adjacency
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        budget = g_score[node] - self.maze.edge_costs()[node]
+        for position in range(offsets[node], offsets[node + 1]):
+            parent = neighbors[position]
+            if 0 <= g_score[parent] <= budget:
+                return parent
+        return -1
+
+    def _reconstruct_path(self, g_score: array, source: int, target: int) -> List[Tuple[int, int]]:
+        """Lần ngược cha (suy từ g) từ target về source, trả về các ô (x, y) theo chiều đi."""
+        nodes = [target]
+        current = target
+        while current != source:
+            current = self._parent(g_score, current)
+            if current < 0:
+                return []
+            nodes.append(current)
+        nodes.reverse()
+        coords = self.maze.coords
+        return [coords(node) for node in nodes]
+
+    def _build_tables(self, g_score: array, expanded: bytearray, thresholds: List[int],
+                      source: int) -> Dict:
+        """
+        Chuyển các mảng theo node id về bảng khóa (x, y) để hiển thị.
+
+        Chỉ chạy một lần ở cuối (chế độ ghi trace), không nằm trong vòng lặp;
+        bảng cha được suy từ g như khi dựng đường đi.
+        """
+        coords = self.maze.coords
+        previous = {}
+        for v, g in enumerate(g_score):
+            if g >= 0 and v != source:
+                parent = self._parent(g_score, v)
+                if parent >= 0:
+                    previous[coords(v)] = coords(parent)
+        return {
+            'g_score': {coords(v): g for v, g in enumerate(g_score) if g >= 0},
+            'previous': previous,
+            'visited': {coords(v) for v, done in enumerate(expanded) if done},
+            'thresholds': list(thresholds)
+        }
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]],
+                   iterations: int, threshold: int, max_fringe: int, cost: int = 0):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất (visited_count = số ô đã có g)."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path),
+            'path_cost': cost if path else 0,
+            'iterations': iterations,
+            'threshold': threshold,
+            'fringe_max_size': max_fringe
+        }
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp thuật toán Fringe Search.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'Fringe Search',
+            'time_complexity': 'O(số lượt × |fringe| + V) trường hợp xấu',
+            'space_complexity': 'O(V) - 8 byte/ô (g, next), không Heap',
+            'description': 'Quét danh sách rìa theo ngưỡng f như IDA*, giữ rìa giữa các lượt',
+            'formula': 'mở rộng ô có f(n) = g(n) + h(n) <= flimit',
+            'heuristic': 'Manhattan distance nhân chi phí ô nhỏ nhất',
+            'advantages': [
+                'Không có Heap: chèn / gỡ O(1) trên danh sách liên kết mảng',
+                'Không DFS lại từ đầu mỗi lượt như IDA*',
+                'Vẫn cho đường đi ngắn nhất (h consistent)'
+            ],
+            'disadvantages': [
+                'Bộ nhớ vẫn O(V) (g và next, 8 byte/ô)',
+                'Mỗi lượt quét lại các ô còn trong fringe',
+                'Thứ tự mở rộng không theo f nhỏ nhất nên có thể mở rộng lại ô'
+            ]
+        }
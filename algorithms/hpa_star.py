@@ -0,0 +1,314 @@
+"""
+==============================================================================
+HPA* - TÌM ĐƯỜNG PHÂN CẤP CHO MÊ CUNG LỚN
+==============================================================================
+
+Mô tả bài toán:
+    Trên mê cung 1000x1000, A* phẳng mở rộng hàng trăm nghìn ô cho MỖI
+    lần tìm. HPA* tìm trên đồ thị trừu tượng nhỏ (models.cluster_graph):
+    các ô lối vào giữa những cụm kề nhau, nối bởi khoảng cách nội cụm
+    đã tính sẵn.
+
+Thuật toán:
+    1. Nối Start vào đồ thị: tìm trong cụm của Start khoảng cách tới
+       mọi nút trừu tượng của cụm => nhiều nguồn ban đầu
+    2. Nối Goal: tìm NGƯỢC trong cụm của Goal khoảng cách từ mỗi nút
+       của cụm tới Goal => khi chốt nút đó, ghi nhận ứng viên
+       best = g(nút) + khoảng cách vào Goal
+       (Start và Goal cùng cụm: thêm ứng viên đi thẳng trong cụm)
+    3. A* trên đồ thị trừu tượng, h = c_min * Manhattan tới Goal;
+       dừng khi f nhỏ nhất trong Heap >= best
+    4. Làm mịn (refine): trải từng cạnh trừu tượng thành ô - cạnh liên
+       cụm là 2 ô kề nhau, cạnh nội cụm tìm lại trong phạm vi một cụm;
+       đi thẳng trong cụm (Start và Goal cùng cụm) cũng tìm lại như vậy.
+       Trace ghi các ô được chốt trong những lần tìm này sau các nút
+       trừu tượng, nên mê cung chỉ có một cụm vẫn có animation
+
+Chất lượng đường đi:
+    Đường đi chỉ được phép qua các ô lối vào đại diện nên GẦN tối ưu
+    (thường dài hơn tối ưu vài phần trăm), đổi lại số node mở rộng
+    giảm mạnh trên mê cung lớn.
+
+Độ phức tạp:
+    - Tiền xử lý: O(V * số lối vào mỗi cụm), cập nhật cục bộ khi sửa ô
+    - Mỗi truy vấn: O(N log N) trên đồ thị trừu tượng (N nút)
+      + O(cluster_size²) cho mỗi cụm trên đường đi khi làm mịn
+==============================================================================
+"""
+
+import heapq
+from typing import Dict, Generator, List, Tuple
+
+from models.cluster_graph import DEFAULT_CLUSTER_SIZE, ClusterGraph
+from models.compact_grid import CompactGrid
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+
+class HPAStar:
+    """
+    HPA* trên ClusterGraph của mê cung.
+
+    Đặc điểm:
+        - Cùng giao diện find_path với AStar: trả về (path, steps, tables)
+        - Mỗi bước của trace là một nút trừu tượng (ô lối vào) được mở rộng,
+          rồi tới các ô được chốt khi làm mịn (có trường 'refine_segment')
+        - self.stats có thêm số node mở rộng trên đồ thị trừu tượng / khi
+          làm mịn và thống kê tiền xử lý của đồ thị cụm
+    """
+
+    def __init__(self, maze, cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        """
+        Khởi tạo HPA*.
+
+        Args:
+            maze: Maze (đồ thị cụm cache và cập nhật cục bộ theo mê cung),
+                  CompactGrid hoặc ma trận mê cung
+            cluster_size: Cạnh của mỗi cụm (ô)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        self.cluster_size = cluster_size
+        self._graph = maze if hasattr(maze, 'get_cluster_graph') else self.maze
+        self._index = None
+        self.steps = StepTrace(scores=('g_score',))
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+
+    def get_index(self) -> ClusterGraph:
+        """Đồ thị cụm của mê cung (lưới đã sửa thì chỉ cập nhật các cụm bị đổi)."""
+        self._index = ClusterGraph.of(self._graph, self.cluster_size, self._index)
+        return self._index
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
+        """
+        Tìm đường (gần tối ưu) từ start đến goal bằng HPA*.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách các ô (x, y) từ start đến goal
+            steps: StepTrace - mỗi bước là một nút trừu tượng ([] ở chế độ nhanh)
+            tables: Dict {g_score, previous, visited} theo ô lối vào ({} ở chế độ nhanh)
+        """
+        trace = StepTrace(scores=('g_score',)) if record_steps else None
+        return drain(self._search(start, goal, trace), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        HPA* có ghi trace, chạy lười: yield từng nút trừu tượng ngay khi mở rộng.
+
+        Khi kết thúc generator return (path, steps, tables) như find_path.
+        """
+        return self._search(start, goal, StepTrace(scores=('g_score',)))
+
+    def _search(self, start: Tuple[int, int], goal: Tuple[int, int], trace: StepTrace) -> Generator:
+        """Thân của find_path (trace = None: không ghi, không yield)."""
+        if trace is not None:
+            self.steps = trace
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, 0, [], None)
+            return [], (trace if trace is not None else []), {}
+
+        index = self.get_index()
+        local_before = index.local_expanded
+        node_cell, node_cluster, edges = index.node_cell, index.node_cluster, index.edges
+        coords = grid.coords
+        stride = grid.stride
+        scale = grid.cost_range()[0]
+        source, target = grid.node_id(*start), grid.node_id(*goal)
+        start_cluster, goal_cluster = index.cell_cluster[source], index.cell_cluster[target]
+        goal_y, goal_x = divmod(target, stride)
+
+        def heuristic(node: int) -> int:
+            y, x = divmod(node_cell[node], stride)
+            return scale * (abs(x - goal_x) + abs(y - goal_y))
+
+        # ===== NỐI START VÀ GOAL VÀO ĐỒ THỊ TRỪU TƯỢNG =====
+        start_dist, start_prev = index.search(source, start_cluster)
+        goal_dist, goal_prev = index.search(target, goal_cluster, reverse=True)
+        goal_links = {node: goal_dist[node_cell[node]] for node in index.cluster_nodes[goal_cluster]
+                      if node_cell[node] in goal_dist}
+
+        # best_node = -1: đi thẳng trong cụm (Start và Goal cùng cụm)
+        best, best_node = -1, -1
+        if start_cluster == goal_cluster and target in start_dist:
+            best = start_dist[target]
+
+        g_score, previous = {}, {}
+        heap = []
+        for node in index.cluster_nodes[start_cluster]:
+            distance = start_dist.get(node_cell[node])
+            if distance is not None:
+                g_score[node] = distance
+                heap.append((distance + heuristic(node), distance, node))
+                if trace is not None:
+                    trace.set_score('g_score', coords(node_cell[node]), distance)
+        heapq.heapify(heap)
+        closed = set()
+        expanded = 0
+        token = self.cancel_token
+
+        # ===== A* TRÊN ĐỒ THỊ TRỪU TƯỢNG =====
+        while heap:
+            current_f, current_g, current = heapq.heappop(heap)
+            if best >= 0 and current_f >= best:
+                break
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK:
+                token.check()
+            if trace is not None:
+                current_cell = coords(node_cell[current])
+                trace.visit(current_cell)
+                trace.add_step(
+                    current=current_cell,
+                    heap_size=len(heap),
+                    current_g=current_g,
+                    current_f=current_f,
+                    heuristic=current_f - current_g,
+                    cluster=node_cluster[current]
+                )
+                yield trace[-1]
+
+            # Nút của cụm Goal: ứng viên đường đi hoàn chỉnh
+            tail = goal_links.get(current)
+            if tail is not None and (best < 0 or current_g + tail < best):
+                best, best_node = current_g + tail, current
+
+            for neighbor, cost in edges[current].items():
+                if neighbor in closed:
+                    continue
+                tentative_g = current_g + cost
+                old = g_score.get(neighbor)
+                if old is None or tentative_g < old:
+                    g_score[neighbor] = tentative_g
+                    previous[neighbor] = current
+                    heapq.heappush(heap, (tentative_g + heuristic(neighbor), tentative_g, neighbor))
+                    if trace is not None:
+                        trace.set_score('g_score', coords(node_cell[neighbor]), tentative_g)
+
+        if best < 0:
+            self._set_stats(expanded, index.local_expanded - local_before, 0, [], index)
+            if trace is None:
+                return [], [], {}
+            return [], trace, self._build_tables(index, g_score, previous, closed)
+
+        # ===== LÀM MỊN: TRẢI CÁC CẠNH TRỪU TƯỢNG THÀNH Ô =====
+        refine_before = index.local_expanded
+        # Các lần tìm nội cụm khi làm mịn: (cụm, ô theo thứ tự chốt) - chỉ khi ghi trace
+        segments = []
+        if best_node < 0:
+            # Đi thẳng trong cụm: tìm lại tới Goal (dừng sớm) như một cạnh nội cụm
+            order = [] if trace is not None else None
+            _, local_prev = index.search(source, start_cluster, target=target, order=order)
+            if order is not None:
+                segments.append((start_cluster, order))
+            nodes = self._walk(local_prev, target, source)
+            nodes.reverse()
+        else:
+            chain = [best_node]
+            while chain[-1] in previous:
+                chain.append(previous[chain[-1]])
+            chain.reverse()
+
+            nodes = self._walk(start_prev, node_cell[chain[0]], source)
+            nodes.reverse()
+            for u, v in zip(chain, chain[1:]):
+                if node_cluster[u] != node_cluster[v]:
+                    nodes.append(node_cell[v])  # Cạnh liên cụm: hai ô kề nhau
+                    continue
+                order = [] if trace is not None else None
+                _, local_prev = index.search(node_cell[u], node_cluster[u], target=node_cell[v],
+                                             order=order)
+                if order is not None:
+                    segments.append((node_cluster[u], order))
+                segment = self._walk(local_prev, node_cell[v], node_cell[u])
+                segment.reverse()
+                nodes.extend(segment[1:])
+            # Nút cuối -> Goal: cây tìm ngược trỏ về phía Goal
+            nodes.extend(self._walk(goal_prev, node_cell[best_node], target)[1:])
+
+        path = [coords(node) for node in nodes]
+        self._set_stats(expanded, refine_before - local_before, index.local_expanded - refine_before,
+                        path, index)
+        self.stats['path_cost'] = best
+        if trace is None:
+            return path, [], {}
+
+        for segment, (cluster, order) in enumerate(segments, 1):
+            for node in order:
+                cell = coords(node)
+                trace.visit(cell)
+                trace.add_step(current=cell, cluster=cluster, refine_segment=segment)
+                yield trace[-1]
+        return path, trace, self._build_tables(index, g_score, previous, closed)
+
+    @staticmethod
+    def _walk(previous: Dict[int, int], node: int, stop: int) -> List[int]:
+        """Đi theo con trỏ previous từ node đến stop (có tính cả hai đầu)."""
+        nodes = [node]
+        while node != stop:
+            node = previous[node]
+            nodes.append(node)
+        return nodes
+
+    def _build_tables(self, index: ClusterGraph, g_score: Dict[int, int], previous: Dict[int, int],
+                      closed: set) -> Dict:
+        """Bảng khóa (x, y) theo ô lối vào (chỉ ở chế độ trace)."""
+        coords, node_cell = self.maze.coords, index.node_cell
+        return {
+            'g_score': {coords(node_cell[v]): g for v, g in g_score.items()},
+            'previous': {coords(node_cell[v]): coords(node_cell[u]) for v, u in previous.items()},
+            'visited': {coords(node_cell[v]) for v in closed}
+        }
+
+    def _set_stats(self, expanded: int, link_expanded: int, refine_expanded: int,
+                   path: List[Tuple[int, int]], index):
+        """Lưu bộ đếm: node trừu tượng, ô khi nối Start / Goal và khi làm mịn, tiền xử lý."""
+        self.stats = {
+            'nodes_expanded': expanded + link_expanded + refine_expanded,
+            'visited_count': expanded,
+            'path_length': len(path),
+            'path_cost': 0,
+            'abstract_expanded': expanded,
+            'link_expanded': link_expanded,
+            'refine_expanded': refine_expanded
+        }
+        if index is not None:
+            self.stats.update(index.stats)
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp thuật toán HPA*.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': f'HPA* (cụm {self.cluster_size}x{self.cluster_size})',
+            'time_complexity': 'O(N log N) trên đồ thị trừu tượng + O(cluster_size²) mỗi cụm khi làm mịn',
+            'space_complexity': 'O(V) bảng cụm + O(N + E) đồ thị trừu tượng',
+            'description': 'Chia mê cung thành cụm, tìm trên đồ thị các ô lối vào rồi làm mịn trong từng cụm',
+            'formula': 'f(n) = g(n) + h(n) trên nút trừu tượng',
+            'heuristic': 'Manhattan distance nhân chi phí ô nhỏ nhất',
+            'advantages': [
+                'Số node mở rộng giảm mạnh trên mê cung lớn',
+                'Tiền xử lý một lần, dùng cho mọi truy vấn',
+                'Sửa ô chỉ cập nhật các cụm bị ảnh hưởng'
+            ],
+            'disadvantages': [
+                'Đường đi gần tối ưu, không chắc ngắn nhất',
+                'Tốn thời gian tiền xử lý (xem thống kê cụm)',
+                'Không lợi trên mê cung nhỏ hơn vài cụm'
+            ]
+        }
@@ -0,0 +1,426 @@
+"""
+==============================================================================
+IDA* (ITERATIVE DEEPENING A*) - TÌM ĐƯỜNG KHÔNG CẦN HEAP
+==============================================================================
+
+Mô tả bài toán:
+    Trên mê cung rất lớn, Heap của A* cùng bảng đỉnh trước (previous) và
+    các node nằm trong open list chiếm phần lớn bộ nhớ của một truy vấn.
+
+Ý tưởng IDA*:
+    Tìm kiếm theo chiều sâu (DFS) nhưng cắt nhánh khi
+        f(n) = g(n) + h(n) > ngưỡng (threshold)
+    - Ngưỡng đầu tiên: h(start)
+    - Hết một lượt mà chưa tới đích: nâng ngưỡng rồi DFS lại từ đầu
+    Đường đi hiện tại chính là stack DFS, không cần Heap hay bảng previous.
+
+Bitset đã mở (transposition):
+    Mê cung có chu trình (phá tường, đặt tường bằng chuột) có số đường đi
+    đơn tăng theo cấp số mũ: DFS thuần đi lại cùng một ô qua mọi đường.
+    Mỗi lượt giữ 1 bit/ô "đã mở trong lượt này" (bytearray V/8 byte, xóa
+    đầu mỗi lượt): tới lại một ô đã mở thì bỏ. Bit này tỉa luôn chu trình
+    trên đường đi hiện tại (ô trên stack đều đã mở), nên mỗi lượt mở mỗi
+    ô nhiều nhất một lần.
+    Đánh đổi: không có g theo ô nên đường RẺ HƠN tới sau vào một ô đã mở
+    cũng bị bỏ. Trên mê cung hoàn hảo (mỗi ô chỉ có một đường đơn từ
+    start) kết quả vẫn tối ưu; mê cung có chu trình thì đường tìm được có
+    thể dài hơn tối ưu.
+
+Nâng ngưỡng và dừng:
+    - Trong lượt giữ f nhỏ nhất của các ô bị cắt (f > ngưỡng). Không ô nào
+      bị cắt => đã mở hết vùng liên thông với start => không có đường
+    - Ngưỡng mới = max(f nhỏ nhất bị cắt, ngưỡng cũ + bước), bước gấp đôi
+      sau mỗi lượt (kiểu IDA*_CR): mê cung hoàn hảo có đường dài hơn
+      Manhattan rất nhiều, nâng từng 2 * c_min một thì cần hàng chục nghìn lượt
+    - Vì ngưỡng có thể vượt chi phí của đường cần tìm, lượt tìm thấy đích
+      chạy tiếp kiểu nhánh cận (branch and bound): gặp đích với chi phí c
+      thì từ đó chỉ nhận f < c, hết lượt trả về đường tốt nhất
+
+Cài đặt:
+    - DFS bằng STACK tường minh (không đệ quy - đường đi có thể dài hàng
+      trăm nghìn ô): node, con trỏ vào danh sách kề CSR và g của mỗi mức,
+      đều là array('i') dài bằng độ sâu
+    - h(n) = c_min * Manhattan như A* (CompactGrid.cost_range())
+
+Đánh đổi:
+    - Bộ nhớ mỗi truy vấn: stack O(độ sâu) + bitset V/8 byte; không Heap,
+      không previous, không bảng g theo ô
+    - Thời gian: mỗi lượt duyệt lại các ô của lượt trước, nhưng ngưỡng
+      tăng theo cấp số nên số lượt chỉ khoảng log(độ dài đường đi)
+
+Độ phức tạp:
+    - Thời gian: O(số lượt × V), số lượt O(log C) với C chi phí đường đi
+    - Không gian: O(d + V/8) với d = độ sâu đường đi
+==============================================================================
+"""
+
+from array import array
+from typing import Dict, Generator, List, Tuple
+
+from models.adjacency import CSRAdjacency
+from models.compact_grid import CompactGrid
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+# Ngưỡng "vô cực" (không ô nào bị cắt)
+INF = float('inf')
+
+
+class IDAStar:
+    """
+    IDA*: DFS lặp sâu dần theo ngưỡng f, tỉa bằng bitset đã mở.
+
+    Đặc điểm:
+        - Cùng giao diện find_path với AStar: trả về (path, steps, tables)
+        - Đường đi tối ưu trên mê cung hoàn hảo; có chu trình thì có thể
+          dài hơn tối ưu (bitset không giữ g theo ô)
+        - self.stats có thêm 'iterations', 'threshold' (ngưỡng cuối) và
+          'max_depth'; mỗi bước của trace ghi lượt và ngưỡng của lượt đó
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo IDA*.
+
+        Args:
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Nguồn danh sách kề CSR: Maze tự cache theo version lưới,
+        # các dạng khác thì solver tự giữ bản dựng gần nhất
+        self._graph = maze if hasattr(maze, 'get_adjacency') else self.maze
+        self._adjacency = None
+        # Lưu các bước để debug và trực quan hóa
+        self.steps = StepTrace(scores=('g_score',))
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Manhattan nhân chi phí ô nhỏ nhất (admissible, consistent)."""
+        return self.maze.cost_range()[0] * (abs(pos[0] - goal[0]) + abs(pos[1] - goal[1]))
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
+        """
+        Tìm đường đi từ start đến goal bằng IDA*.
+
+        Thuật toán:
+            1. threshold = h(start)
+            2. DFS từ start, cắt nhánh có f > threshold (ghi f nhỏ nhất bị
+               cắt), bỏ ô đã mở trong lượt (bitset)
+            3. Chạm đích với chi phí c -> ghi lại đường (stack DFS), chỉ nhận
+               f < c cho tới hết lượt; hết lượt trả về đường tốt nhất
+            4. Không chạm: không ô nào bị cắt -> không có đường; ngược lại
+               nâng ngưỡng và lặp lại bước 2
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách các ô trên đường đi tìm được
+            steps: StepTrace - mỗi bước là một ô được đưa vào đường đi DFS,
+                   kèm lượt và ngưỡng ([] ở chế độ nhanh)
+            tables: Dict {g_score, visited, thresholds} ({} ở chế độ nhanh)
+        """
+        if not record_steps:
+            return self._find_path_fast(start, goal), [], {}
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        IDA* có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps, tables) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        self.steps = StepTrace(scores=('g_score',))
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, [], 0, 0, 0)
+            return [], self.steps, {}
+
+        # ===== KHỞI TẠO =====
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        table_size = (grid.size + 7) >> 3
+        # g đã ghi vào trace của mỗi ô (chỉ ở chế độ trace): ghi lại khi đổi
+        recorded = {}
+        thresholds = []
+
+        threshold = self.heuristic(start, goal)
+        growth = 2 * grid.cost_range()[0]
+        expanded = iterations = max_depth = 0
+
+        # ===== CÁC LƯỢT DFS VỚI NGƯỠNG TĂNG DẦN =====
+        while True:
+            iterations += 1
+            thresholds.append(threshold)
+            limit = threshold
+            best_path, best_cost = None, None
+            next_threshold = INF
+            # Bit của node v: opened[v >> 3] & (1 << (v & 7)) - đã mở trong lượt
+            opened = bytearray(table_size)
+            opened[source >> 3] |= 1 << (source & 7)
+            level_expanded = 1
+            expanded += 1
+            nodes = array('i', [source])
+            cursor = array('i', [offsets[source]])
+            g_stack = array('i', [0])
+            max_depth = max(max_depth, 1)
+            yield self._record(start, 0, threshold, iterations, next_threshold, 1, best_cost,
+                               recorded, goal)
+            if source == target:
+                path = [start]
+                self._set_stats(expanded, level_expanded, path, iterations, threshold, max_depth)
+                return path, self.steps, self._build_tables(recorded, thresholds)
+
+            while nodes:
+                node = nodes[-1]
+                position = cursor[-1]
+                if position == offsets[node + 1]:
+                    # Hết ô kề: lùi lại
+                    nodes.pop()
+                    cursor.pop()
+                    g_stack.pop()
+                    continue
+                cursor[-1] = position + 1
+                child = neighbors[position]
+                bit = 1 << (child & 7)
+                if opened[child >> 3] & bit:
+                    # Đã mở trong lượt (gồm cả các ô trên đường đi hiện tại)
+                    continue
+                child_g = g_stack[-1] + costs[child]
+                child_cell = coords(child)
+                child_f = child_g + self.heuristic(child_cell, goal)
+                if child_f > limit:
+                    if child_f < next_threshold:
+                        next_threshold = child_f
+                    continue
+
+                opened[child >> 3] |= bit
+                level_expanded += 1
+                expanded += 1
+                nodes.append(child)
+                if len(nodes) > max_depth:
+                    max_depth = len(nodes)
+
+                # ===== KIỂM TRA ĐÃ ĐẾN ĐÍCH =====
+                if child == target:
+                    # Nhánh cận: giữ đường tốt nhất, từ giờ chỉ nhận f < chi phí của nó
+                    best_path = [coords(n) for n in nodes]
+                    best_cost = child_g
+                    limit = child_g - 1
+                    yield self._record(child_cell, child_g, threshold, iterations, next_threshold,
+                                       len(nodes), best_cost, recorded, goal)
+                    nodes.pop()
+                    continue
+                cursor.append(offsets[child])
+                g_stack.append(child_g)
+                yield self._record(child_cell, child_g, threshold, iterations, next_threshold,
+                                   len(nodes), best_cost, recorded, goal)
+
+            if best_path is not None:
+                self._set_stats(expanded, level_expanded, best_path, iterations, threshold,
+                                max_depth, best_cost)
+                return best_path, self.steps, self._build_tables(recorded, thresholds)
+            if next_threshold == INF:
+                # Không ô nào bị cắt: đã mở hết vùng liên thông với start mà chưa tới đích
+                self._set_stats(expanded, level_expanded, [], iterations, threshold, max_depth)
+                return [], self.steps, self._build_tables(recorded, thresholds)
+            threshold = max(next_threshold, threshold + growth)
+            growth *= 2
+
+    def _record(self, cell: Tuple[int, int], g: int, threshold: int, iteration: int,
+                next_threshold, depth: int, best_cost, recorded: Dict, goal: Tuple[int, int]):
+        """Ghi một bước trace (ô vừa vào đường đi DFS) và trả về bước đó."""
+        steps = self.steps
+        steps.visit(cell)
+        if recorded.get(cell) != g:
+            recorded[cell] = g
+            steps.set_score('g_score', cell, g)
+        h = self.heuristic(cell, goal)
+        steps.add_step(
+            current=cell,
+            iteration=iteration,
+            threshold=threshold,
+            # f nhỏ nhất đã bị cắt trong lượt này (ngưỡng lượt sau không nhỏ hơn)
+            next_threshold=None if next_threshold == INF else next_threshold,
+            depth=depth,
+            current_g=g,
+            current_f=g + h,
+            heuristic=h,
+            # Chi phí đường tốt nhất đã tìm thấy trong lượt (nhánh cận)
+            best_cost=best_cost
+        )
+        return steps[-1]
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        IDA* không ghi trace.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        Bộ nhớ: ba array('i') dài bằng độ sâu và bitset V/8 byte.
+        """
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, [], 0, 0, 0)
+            return []
+
+        adjacency = self._get_adjacency()
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        costs = grid.edge_costs()
+        scale = grid.cost_range()[0]
+        stride = grid.stride
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        # Làm việc trên tọa độ có viền (x + 1, y + 1) - hiệu Manhattan không đổi
+        goal_x, goal_y = goal[0] + 1, goal[1] + 1
+        table_size = (grid.size + 7) >> 3
+
+        threshold = self.heuristic(start, goal)
+        growth = 2 * scale
+        expanded = iterations = 0
+        max_depth = 1
+        token = self.cancel_token
+        if source == target:
+            self._set_stats(1, 1, [start], 1, threshold, 1)
+            return [start]
+
+        while True:
+            iterations += 1
+            limit = threshold
+            best_path, best_cost = None, 0
+            next_threshold = INF
+            opened = bytearray(table_size)
+            opened[source >> 3] |= 1 << (source & 7)
+            expanded += 1
+            level_expanded = 1
+            nodes = array('i', [source])
+            cursor = array('i', [offsets[source]])
+            g_stack = array('i', [0])
+
+            while nodes:
+                node = nodes[-1]
+                position = cursor[-1]
+                if position == offsets[node + 1]:
+                    nodes.pop()
+                    cursor.pop()
+                    g_stack.pop()
+                    continue
+                cursor[-1] = position + 1
+                child = neighbors[position]
+                bit = 1 << (child & 7)
+                if opened[child >> 3] & bit:
+                    continue
+                child_g = g_stack[-1] + costs[child]
+                y, x = divmod(child, stride)
+                child_f = child_g + scale * (abs(x - goal_x) + abs(y - goal_y))
+                if child_f > limit:
+                    if child_f < next_threshold:
+                        next_threshold = child_f
+                    continue
+
+                opened[child >> 3] |= bit
+                level_expanded += 1
+                expanded += 1
+                if token is not None and not expanded & CANCEL_CHECK_MASK:
+                    token.check()
+                nodes.append(child)
+                if len(nodes) > max_depth:
+                    max_depth = len(nodes)
+                if child == target:
+                    coords = grid.coords
+                    best_path = [coords(n) for n in nodes]
+                    best_cost = child_g
+                    limit = child_g - 1
+                    nodes.pop()
+                    continue
+                cursor.append(offsets[child])
+                g_stack.append(child_g)
+
+            if best_path is not None:
+                self._set_stats(expanded, level_expanded, best_path, iterations, threshold,
+                                max_depth, best_cost)
+                return best_path
+            if next_threshold == INF:
+                self._set_stats(expanded, level_expanded, [], iterations, threshold, max_depth)
+                return []
+            threshold = max(next_threshold, threshold + growth)
+            growth *= 2
+
+    def _get_adjacency(self) -> CSRAdjacency:
+        """Danh sách kề CSR của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._adjacency = CSRAdjacency.of(self._graph, self._adjacency)
+        return self._adjacency
+
+    def _build_tables(self, recorded: Dict, thresholds: List[int]) -> Dict:
+        """Bảng để hiển thị: g đã ghi của các ô, các ô đã thăm, ngưỡng từng lượt."""
+        return {
+            'g_score': dict(recorded),
+            'visited': set(recorded),
+            'thresholds': list(thresholds)
+        }
+
+    def _set_stats(self, expanded: int, visited_count: int, path: List[Tuple[int, int]],
+                   iterations: int, threshold: int, max_depth: int, cost: int = 0):
+        """
+        Lưu bộ đếm tóm tắt của lần chạy gần nhất.
+
+        nodes_expanded cộng dồn mọi lượt (một ô được đếm lại ở mỗi lượt);
+        visited_count là số ô khác nhau đã mở ở lượt cuối.
+        """
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path),
+            'path_cost': cost if path else 0,
+            'iterations': iterations,
+            'threshold': threshold,
+            'max_depth': max_depth,
+            # Bitset đã mở: 1 bit mỗi ô
+            'table_bytes': (self.maze.size + 7) >> 3
+        }
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp thuật toán IDA*.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'IDA* (Iterative Deepening A*)',
+            'time_complexity': 'O(số lượt × V), số lượt O(log C)',
+            'space_complexity': 'O(d + V/8) - stack DFS và bitset 1 bit/ô',
+            'description': 'DFS cắt nhánh theo ngưỡng f, bỏ ô đã mở trong lượt (bitset); '
+                           'hết lượt thì nâng ngưỡng, lượt tìm thấy đích chạy nhánh cận',
+            'formula': 'cắt nhánh khi f(n) = g(n) + h(n) > threshold',
+            'heuristic': 'Manhattan distance nhân chi phí ô nhỏ nhất',
+            'advantages': [
+                'Không có Heap, bảng g hay bảng đỉnh trước, đường đi là stack DFS',
+                'Chỉ 1 bit mỗi ô để tỉa chu trình và ô đã mở',
+                'Không cần tiền xử lý'
+            ],
+            'disadvantages': [
+                'Mỗi lượt duyệt lại các ô của lượt trước',
+                'Ngưỡng vượt chi phí đường đi => lượt cuối mở thêm ô thừa',
+                'Mê cung có chu trình: đường tìm được có thể dài hơn tối ưu'
+            ]
+        }
@@ -0,0 +1,427 @@
+"""
+==============================================================================
+JUMP POINT SEARCH (JPS) - A* NHẢY CÓC TRÊN LƯỚI 4 HƯỚNG
+==============================================================================
+
+Mô tả bài toán:
+    Trên lưới đồng chi phí, rất nhiều đường đi ngắn nhất là "đối xứng"
+    (chỉ khác thứ tự các bước). A* thường đẩy MỌI ô của hành lang vào
+    Heap dù chúng không có lựa chọn nào khác ngoài đi thẳng.
+
+Ý tưởng JPS:
+    Thay vì thêm từng ô kề, từ mỗi node ta "nhảy" thẳng theo một hướng
+    cho đến khi gặp một ĐIỂM NHẢY (jump point):
+    - Ô đích
+    - Ô có "hàng xóm bắt buộc" (forced neighbor): một ô bên cạnh mở ra
+      mà trước đó bị tường chắn => từ đây có thể rẽ theo cách mới
+    - (Khi nhảy dọc) ô mà từ đó nhảy ngang tìm được điểm nhảy
+    Chỉ các điểm nhảy mới được đưa vào Heap.
+
+Biến thể 4 hướng (không đi chéo):
+    - Đang đi NGANG: xét trên, dưới và tiếp tục ngang
+    - Đang đi DỌC:   xét trái, phải và tiếp tục dọc
+    - Nhảy ngang dừng ở ô có hàng xóm bắt buộc phía trên/dưới
+    - Nhảy dọc dừng khi một lần nhảy ngang từ ô đó tìm được điểm nhảy
+    Các lần nhảy được cài bằng VÒNG LẶP (không đệ quy) trên node id.
+
+Chi phí:
+    - "Điểm nhảy đã mở rộng": số node lấy ra khỏi Heap (như A*)
+    - "Ô đã quét": tổng số ô các lần nhảy phải kiểm tra (có lặp lại)
+    Hai số này được báo cáo riêng để so sánh công bằng với A*.
+
+Độ phức tạp:
+    - Thời gian: O(V) ô quét cho mỗi hướng nhảy, thực tế rất ít node vào Heap
+    - Không gian: O(V) - bảng g và con trỏ cha theo node id
+==============================================================================
+"""
+
+import heapq
+from array import array
+from typing import Generator, List, Tuple, Dict
+
+from models.compact_grid import CompactGrid
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+
+class JPSAStar:
+    """
+    A* với Jump Point Search cho mê cung 4 hướng, chi phí đều.
+
+    Đặc điểm:
+        - Cùng giao diện find_path với AStar: trả về (path, steps, tables)
+        - Độ dài đường đi tối ưu như A*
+        - self.stats có thêm 'jump_points_expanded' và 'cells_scanned'
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo JPS.
+
+        Args:
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        # Lưu các bước để debug và trực quan hóa
+        self.steps = StepTrace(scores=('g_score', 'f_score'))
+        # Bộ đếm tóm tắt của lần chạy gần nhất (có cả khi không ghi trace)
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+        # Trạng thái của lần nhảy hiện tại
+        self._target = -1
+        self._cells_scanned = 0
+
+    def heuristic(self, pos: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Khoảng cách Manhattan (admissible, consistent trên lưới 4 hướng)."""
+        return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
+        """
+        Tìm đường đi ngắn nhất từ start đến goal bằng JPS.
+
+        Thuật toán:
+            1. Push start vào Heap với f = h(start)
+            2. Pop điểm nhảy có f nhỏ nhất; nếu là đích -> dựng đường đi
+            3. Với mỗi hướng được phép (tỉa theo hướng đến), nhảy thẳng
+               tới điểm nhảy kế tiếp, relax g = g(cha) + độ dài đoạn nhảy
+            4. Đường đi cuối được "trải" ra từng ô giữa các điểm nhảy
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách TẤT CẢ các ô trên đường đi ngắn nhất
+            steps: StepTrace - mỗi bước là một điểm nhảy được mở rộng
+                   ([] ở chế độ nhanh)
+            tables: Dict {g_score, f_score, previous, visited} theo điểm nhảy
+                    ({} ở chế độ nhanh)
+        """
+        if not record_steps:
+            return self._find_path_fast(start, goal), [], {}
+        return drain(self.iter_steps(start, goal), self.cancel_token)
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        JPS có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        find_path(record_steps=True) chính là chạy hết generator này;
+        khi kết thúc generator return (path, steps, tables) như find_path.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+
+        Yields:
+            TraceStep của bước vừa xử lý
+        """
+        self.steps = StepTrace(scores=('g_score', 'f_score'))
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, 0, [])
+            return [], self.steps, {}
+
+        # ===== KHỞI TẠO =====
+        coords = grid.coords
+        source = grid.node_id(*start)
+        target = self._target = grid.node_id(*goal)
+        self._cells_scanned = 0
+
+        g_score = array('i', [-1]) * grid.size
+        f_score = array('i', [-1]) * grid.size
+        previous = array('i', [-1]) * grid.size
+        closed = bytearray(grid.size)
+        g_score[source] = 0
+        f_score[source] = self.heuristic(start, goal)
+        self.steps.set_score('g_score', start, 0)
+        self.steps.set_score('f_score', start, f_score[source])
+        # Đường đi (đã trải từng ô) tới điểm nhảy của mỗi bước, dựng lười
+        self.steps.set_path_builder(
+            lambda cell: self._reconstruct_path(previous, source, grid.node_id(*cell)))
+
+        heap = [(f_score[source], 0, source)]
+        expanded = 0
+
+        # ===== VÒNG LẶP CHÍNH =====
+        while heap:
+            current_f, current_g, current = heapq.heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            current_cell = coords(current)
+            self.steps.visit(current_cell)
+            self.steps.add_step(
+                current=current_cell,
+                heap_size=len(heap),
+                current_g=current_g,
+                current_f=current_f,
+                heuristic=self.heuristic(current_cell, goal),
+                cells_scanned=self._cells_scanned
+            )
+            yield self.steps[-1]
+
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_stats(expanded, expanded, self._cells_scanned, path)
+                return path, self.steps, self._build_tables(g_score, f_score, previous, closed)
+
+            # ===== NHẢY THEO CÁC HƯỚNG ĐƯỢC PHÉP =====
+            for direction in self._directions(current, previous[current]):
+                jump_point = self._jump(current + direction, direction)
+                if jump_point < 0 or closed[jump_point]:
+                    continue
+                # Đoạn nhảy là đường thẳng: chi phí = số ô đã đi qua
+                tentative_g = current_g + self._segment_length(current, jump_point)
+                if g_score[jump_point] < 0 or tentative_g < g_score[jump_point]:
+                    jump_cell = coords(jump_point)
+                    g_score[jump_point] = tentative_g
+                    f_score[jump_point] = tentative_g + self.heuristic(jump_cell, goal)
+                    self.steps.set_score('g_score', jump_cell, tentative_g)
+                    self.steps.set_score('f_score', jump_cell, f_score[jump_point])
+                    previous[jump_point] = current
+                    heapq.heappush(heap, (f_score[jump_point], tentative_g, jump_point))
+
+        self._set_stats(expanded, expanded, self._cells_scanned, [])
+        return [], self.steps, self._build_tables(g_score, f_score, previous, closed)
+
+    def _find_path_fast(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        JPS không ghi trace.
+
+        Cùng thứ tự duyệt với find_path nên cho cùng đường đi và bộ đếm.
+        """
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, 0, [])
+            return []
+
+        stride = grid.stride
+        source = grid.node_id(*start)
+        target = self._target = grid.node_id(*goal)
+        goal_y, goal_x = divmod(target, stride)
+        self._cells_scanned = 0
+        g_score = array('i', [-1]) * grid.size
+        previous = array('i', [-1]) * grid.size
+        closed = bytearray(grid.size)
+        g_score[source] = 0
+        heap = [(self.heuristic(start, goal), 0, source)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        jump, directions = self._jump, self._directions
+        expanded = 0
+
+        token = self.cancel_token
+        while heap:
+            _, current_g, current = heappop(heap)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK:
+                token.check()
+
+            if current == target:
+                path = self._reconstruct_path(previous, source, target)
+                self._set_stats(expanded, expanded, self._cells_scanned, path)
+                return path
+
+            for direction in directions(current, previous[current]):
+                jump_point = jump(current + direction, direction)
+                if jump_point < 0 or closed[jump_point]:
+                    continue
+                distance = jump_point - current
+                if distance < 0:
+                    distance = -distance
+                if distance >= stride:
+                    distance //= stride
+                tentative_g = current_g + distance
+                old = g_score[jump_point]
+                if old < 0 or tentative_g < old:
+                    g_score[jump_point] = tentative_g
+                    previous[jump_point] = current
+                    y, x = divmod(jump_point, stride)
+                    heappush(heap, (tentative_g + abs(x - goal_x) + abs(y - goal_y), tentative_g, jump_point))
+
+        self._set_stats(expanded, expanded, self._cells_scanned, [])
+        return []
+
+    # ===== CÁC HÀM NHẢY =====
+
+    def _directions(self, node: int, parent: int) -> List[int]:
+        """
+        Các hướng được phép nhảy tiếp từ node (tỉa theo hướng đến).
+
+        - Node gốc (không có cha): cả 4 hướng
+        - Đến theo chiều ngang: trên, dưới, tiếp tục ngang
+        - Đến theo chiều dọc: trái, phải, tiếp tục dọc
+        Chỉ giữ các hướng mà ô kề là đường đi.
+        """
+        cells = self.maze.cells
+        stride = self.maze.stride
+        if parent < 0:
+            candidates = self.maze.neighbor_offsets
+        else:
+            delta = node - parent
+            if -stride < delta < stride:
+                forward = 1 if delta > 0 else -1
+                candidates = (-stride, stride, forward)
+            else:
+                forward = stride if delta > 0 else -stride
+                candidates = (-1, 1, forward)
+        return [d for d in candidates if cells[node + d] == 0]
+
+    def _jump(self, node: int, direction: int) -> int:
+        """Nhảy từ node theo direction, trả về điểm nhảy hoặc -1."""
+        if direction == 1 or direction == -1:
+            return self._jump_horizontal(node, direction)
+        return self._jump_vertical(node, direction)
+
+    def _jump_horizontal(self, node: int, step: int) -> int:
+        """
+        Nhảy ngang (step = ±1) cho đến điểm nhảy.
+
+        Dừng tại ô có hàng xóm bắt buộc: ô trên (hoặc dưới) mở nhưng ô
+        trên (dưới) phía sau bị tường chắn. Viền canh đảm bảo không
+        bao giờ đi ra ngoài lưới.
+
+        Returns:
+            Node id điểm nhảy, hoặc -1 nếu đâm vào tường
+        """
+        cells = self.maze.cells
+        stride = self.maze.stride
+        target = self._target
+        scanned = 0
+        while True:
+            scanned += 1
+            if cells[node]:
+                node = -1
+                break
+            if node == target:
+                break
+            up = node - stride
+            down = node + stride
+            if (cells[up] == 0 and cells[up - step]) or (cells[down] == 0 and cells[down - step]):
+                break
+            node += step
+        self._cells_scanned += scanned
+        return node
+
+    def _jump_vertical(self, node: int, step: int) -> int:
+        """
+        Nhảy dọc (step = ±stride) cho đến điểm nhảy.
+
+        Ngoài hàng xóm bắt buộc trái/phải, ô hiện tại cũng là điểm nhảy
+        nếu một lần nhảy ngang từ nó tìm thấy điểm nhảy (vì trên lưới
+        4 hướng mọi lối rẽ đều phải đi qua một đoạn ngang).
+
+        Returns:
+            Node id điểm nhảy, hoặc -1 nếu đâm vào tường
+        """
+        cells = self.maze.cells
+        target = self._target
+        jump_horizontal = self._jump_horizontal
+        while True:
+            self._cells_scanned += 1
+            if cells[node]:
+                return -1
+            if node == target:
+                return node
+            left = node - 1
+            right = node + 1
+            if (cells[left] == 0 and cells[left - step]) or (cells[right] == 0 and cells[right - step]):
+                return node
+            if (cells[right] == 0 and jump_horizontal(right, 1) >= 0) or \
+                    (cells[left] == 0 and jump_horizontal(left, -1) >= 0):
+                return node
+            node += step
+
+    def _segment_length(self, a: int, b: int) -> int:
+        """Độ dài đoạn thẳng giữa hai điểm nhảy cùng hàng hoặc cùng cột."""
+        distance = abs(b - a)
+        return distance // self.maze.stride if distance >= self.maze.stride else distance
+
+    # ===== DỰNG KẾT QUẢ =====
+
+    def _reconstruct_path(self, previous: array, source: int, target: int) -> List[Tuple[int, int]]:
+        """
+        Dựng đường đi đầy đủ: lần ngược các điểm nhảy rồi trải từng đoạn.
+
+        Args:
+            previous: Con trỏ cha giữa các điểm nhảy (-1 = không có)
+            source: Node id điểm bắt đầu
+            target: Node id điểm kết thúc
+
+        Returns:
+            Danh sách các ô (x, y) liên tiếp từ start đến goal
+        """
+        jump_points = [target]
+        current = target
+        while current != source:
+            current = previous[current]
+            if current < 0:
+                return []
+            jump_points.append(current)
+        jump_points.reverse()
+
+        stride = self.maze.stride
+        nodes = [source]
+        for a, b in zip(jump_points, jump_points[1:]):
+            if abs(b - a) < stride:
+                step = 1 if b > a else -1
+            else:
+                step = stride if b > a else -stride
+            nodes.extend(range(a + step, b + step, step))
+
+        coords = self.maze.coords
+        return [coords(node) for node in nodes]
+
+    def _build_tables(self, g_score: array, f_score: array, previous: array, closed: bytearray) -> Dict:
+        """Chuyển các mảng theo node id về bảng khóa (x, y) (chỉ ở chế độ trace)."""
+        coords = self.maze.coords
+        return {
+            'g_score': {coords(v): g for v, g in enumerate(g_score) if g >= 0},
+            'f_score': {coords(v): f for v, f in enumerate(f_score) if f >= 0},
+            'previous': {coords(v): coords(u) for v, u in enumerate(previous) if u >= 0},
+            'visited': {coords(v) for v, done in enumerate(closed) if done}
+        }
+
+    def _set_stats(self, expanded: int, visited_count: int, scanned: int, path: List[Tuple[int, int]]):
+        """Lưu bộ đếm tóm tắt của lần chạy gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': visited_count,
+            'path_length': len(path),
+            'jump_points_expanded': expanded,
+            'cells_scanned': scanned
+        }
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp thuật toán JPS.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'Jump Point Search (JPS, 4 hướng)',
+            'time_complexity': 'O(V) ô quét, rất ít node vào Heap',
+            'space_complexity': 'O(V)',
+            'description': 'A* chỉ đưa các điểm nhảy vào Heap, các đoạn thẳng được quét bằng vòng lặp',
+            'formula': 'f(n) = g(n) + h(n), g tăng theo độ dài đoạn nhảy',
+            'heuristic': 'Manhattan distance: h(n) = |x_n - x_goal| + |y_n - y_goal|',
+            'advantages': [
+                'Mở rộng ít node hơn A* nhiều bậc trên lưới thoáng / có vòng',
+                'Vẫn cho đường đi ngắn nhất',
+                'Không cần tiền xử lý'
+            ],
+            'disadvantages': [
+                'Chỉ đúng cho lưới chi phí đều',
+                'Các lần nhảy vẫn phải quét nhiều ô (xem "Ô đã quét")',
+                'Lợi ích nhỏ trên mê cung hành lang hẹp'
+            ]
+        }
@@ -0,0 +1,206 @@
+"""
+==============================================================================
+TÌM ĐƯỜNG TRÊN ĐỒ THỊ NÚT GIAO (DIJKSTRA / A* SAU KHI THU GỌN HÀNH LANG)
+==============================================================================
+
+Mô tả bài toán:
+    Dijkstra và A* trên lưới phải đẩy TỪNG Ô của hành lang vào Heap.
+    Sau khi thu gọn hành lang (models.junction_graph), đồ thị chỉ còn
+    các nút (ngã rẽ, ngõ cụt) nối bởi cạnh có trọng số = độ dài hành lang.
+    Chạy Dijkstra / A* trên đồ thị nhỏ này rồi "trải" kết quả về từng ô.
+
+Neo điểm đầu / cuối:
+    Start hoặc Goal có thể nằm giữa hành lang. Khi đó nó được neo vào
+    2 nút ở hai đầu hành lang với chi phí = số bước đến mỗi đầu:
+    - Start: khởi tạo Heap với NHIỀU nguồn (nút, chi phí ban đầu)
+    - Goal:  khi chốt một nút neo của Goal, ghi nhận ứng viên
+             best = d(nút) + số bước từ nút vào Goal
+    - Start và Goal cùng hành lang: ứng viên đi thẳng |pos_s - pos_g|
+    Dừng khi khóa nhỏ nhất trong Heap >= best.
+
+Heuristic (chế độ A*):
+    h(nút) = Manhattan(nút, Goal) - vẫn admissible vì mọi hành lang
+    đều dài ít nhất bằng khoảng cách Manhattan giữa hai đầu.
+
+Độ phức tạp:
+    - Thời gian: O((J + E) log J) với J = số nút << V
+    - Không gian: O(J) cho bảng khoảng cách, dùng chung bảng tra của index
+==============================================================================
+"""
+
+import heapq
+from array import array
+from typing import List, Tuple
+
+from models.compact_grid import CompactGrid
+from models.junction_graph import JunctionGraph
+
+
+class JunctionSearch:
+    """
+    Dijkstra / A* chạy trên JunctionGraph của mê cung.
+
+    Được Dijkstra và AStar dùng ở chế độ nhanh khi bật use_junctions.
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo bộ tìm đường trên đồ thị nút.
+
+        Args:
+            maze: Maze (dùng index đã cache), CompactGrid hoặc ma trận mê cung
+        """
+        self.maze = CompactGrid.coerce(maze)
+        # Maze tự cache đồ thị nút theo version lưới
+        self._graph = maze if hasattr(maze, 'get_junction_graph') else self.maze
+        self._index = None
+        self.stats = {}
+
+    def get_index(self) -> JunctionGraph:
+        """Đồ thị nút của mê cung (dựng lại chỉ khi lưới đã đổi version)."""
+        self._index = JunctionGraph.of(self._graph, self._index)
+        return self._index
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  use_heuristic: bool = False) -> List[Tuple[int, int]]:
+        """
+        Tìm đường đi ngắn nhất trên đồ thị nút rồi trải ra từng ô.
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            use_heuristic: True = A* (Manhattan), False = Dijkstra
+
+        Returns:
+            Danh sách các ô (x, y) từ start đến goal ([] nếu không có đường)
+        """
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._set_stats(0, 0, [], None)
+            return []
+
+        index = self.get_index()
+        source = grid.node_id(*start)
+        target = grid.node_id(*goal)
+        stride = grid.stride
+        goal_y, goal_x = divmod(target, stride)
+        junction_cells = index.junction_cells
+        offsets, targets, edges = index.junction_offsets, index.junction_targets, index.junction_edges
+        weights = index.edge_weight
+
+        # ===== ỨNG VIÊN ĐI THẲNG (cùng ô / cùng hành lang) =====
+        best, best_junction = -1, -1
+        if source == target:
+            best = 0
+        elif index.cell_edge[source] >= 0 and index.cell_edge[source] == index.cell_edge[target]:
+            best = abs(index.cell_pos[source] - index.cell_pos[target])
+
+        # Số bước từ mỗi nút neo của Goal vào Goal
+        goal_anchors = dict(index.anchors(target))
+
+        # ===== KHỞI TẠO NHIỀU NGUỒN =====
+        distance = array('i', [-1]) * index.junction_count
+        previous = array('i', [-1]) * index.junction_count
+        via_edge = array('i', [-1]) * index.junction_count
+        closed = bytearray(index.junction_count)
+        heap = []
+        pushes = 0
+        for junction, cost in index.anchors(source):
+            if distance[junction] < 0 or cost < distance[junction]:
+                distance[junction] = cost
+                key = cost
+                if use_heuristic:
+                    y, x = divmod(junction_cells[junction], stride)
+                    key += abs(x - goal_x) + abs(y - goal_y)
+                heap.append((key, cost, junction))
+                pushes += 1
+        heapq.heapify(heap)
+        heappop, heappush = heapq.heappop, heapq.heappush
+        expanded = 0
+
+        # ===== DIJKSTRA / A* TRÊN ĐỒ THỊ NÚT =====
+        while heap:
+            key, current_dist, current = heappop(heap)
+            if best >= 0 and key >= best:
+                break
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+
+            # Nút neo của Goal: ứng viên đường đi hoàn chỉnh
+            tail = goal_anchors.get(current)
+            if tail is not None and (best < 0 or current_dist + tail < best):
+                best, best_junction = current_dist + tail, current
+
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if closed[neighbor]:
+                    continue
+                edge = edges[i]
+                new_dist = current_dist + weights[edge]
+                if distance[neighbor] < 0 or new_dist < distance[neighbor]:
+                    distance[neighbor] = new_dist
+                    previous[neighbor] = current
+                    via_edge[neighbor] = edge
+                    key = new_dist
+                    if use_heuristic:
+                        y, x = divmod(junction_cells[neighbor], stride)
+                        key += abs(x - goal_x) + abs(y - goal_y)
+                    heappush(heap, (key, new_dist, neighbor))
+                    pushes += 1
+
+        if best < 0:
+            self._set_stats(expanded, pushes, [], index)
+            return []
+        path = self._expand_path(index, source, target, best_junction, previous, via_edge)
+        self._set_stats(expanded, pushes, path, index)
+        return path
+
+    def _expand_path(self, index: JunctionGraph, source: int, target: int, best_junction: int,
+                     previous: array, via_edge: array) -> List[Tuple[int, int]]:
+        """
+        Trải đường đi trên đồ thị nút thành danh sách ô liên tiếp.
+
+        best_junction = -1 nghĩa là đi thẳng trong cùng hành lang.
+        """
+        coords = self.maze.coords
+        if best_junction < 0:
+            if source == target:
+                return [coords(source)]
+            edge = index.cell_edge[source]
+            first = index.edge_offsets[edge]
+            a, b = index.cell_pos[source], index.cell_pos[target]
+            step = 1 if b > a else -1
+            return [coords(index.edge_cells[first + i]) for i in range(a, b + step, step)]
+
+        # Chuỗi nút từ nút xuất phát đến best_junction
+        chain = [best_junction]
+        while previous[chain[-1]] >= 0:
+            chain.append(previous[chain[-1]])
+        chain.reverse()
+
+        # Start -> nút đầu chuỗi (dọc hành lang nếu Start ở giữa)
+        nodes = [source] + index.walk_to_junction(source, chain[0])
+        # Các cạnh giữa những nút liên tiếp
+        for u, v in zip(chain, chain[1:]):
+            nodes.extend(index.corridor(via_edge[v], u))
+            nodes.append(index.junction_cells[v])
+        # Nút cuối chuỗi -> Goal
+        tail = index.walk_to_junction(target, best_junction)
+        tail.reverse()
+        nodes.extend(tail[1:])
+        nodes.append(target)
+        if nodes[-1] == nodes[-2]:
+            nodes.pop()
+        return [coords(node) for node in nodes]
+
+    def _set_stats(self, expanded: int, pushes: int, path: List[Tuple[int, int]], index):
+        """Lưu bộ đếm của lần chạy gần nhất (nút thay cho ô)."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': expanded,
+            'path_length': len(path),
+            'heap_pushes': pushes,
+            'junction_count': index.junction_count if index is not None else 0
+        }
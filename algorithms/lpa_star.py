@@ -0,0 +1,332 @@
+"""
+==============================================================================
+LPA* (LIFELONG PLANNING A*) - TÌM LẠI ĐƯỜNG TĂNG DẦN KHI SỬA TƯỜNG
+==============================================================================
+
+Mô tả bài toán:
+    Người chơi click để bật / tắt tường, đường đi đang hiển thị phải cập
+    nhật ngay. Chạy lại A* từ đầu sau mỗi lần sửa thì lặp lại gần như
+    toàn bộ công việc cũ, dù chỉ một ô thay đổi.
+
+Ý tưởng LPA*:
+    Mỗi ô giữ hai giá trị:
+    - g(s):   khoảng cách đã "chốt" từ lần tìm trước
+    - rhs(s): giá trị nhìn trước một bước = min_{p kề s} g(p) + c(s)
+              (rhs(start) = 0)
+    Ô có g = rhs là NHẤT QUÁN. Khi sửa ô, chỉ rhs của ô đó và các ô kề
+    bị tính lại; các ô không nhất quán vào hàng đợi với khóa
+        key(s) = (min(g, rhs) + h(s), min(g, rhs))
+    rồi được xử lý như A*:
+    - g > rhs (quá nhất quán): g = rhs, lan sang các ô kề
+    - g < rhs (thiếu nhất quán): g = ∞, tính lại chính nó và ô kề
+    Dừng khi key nhỏ nhất >= key(goal) và goal nhất quán.
+    => Lần tìm đầu giống hệt A*; các lần sau chỉ chạm vào phần cây tìm
+       kiếm bị ảnh hưởng bởi ô vừa sửa.
+
+So với D* Lite:
+    D* Lite là LPA* tìm ngược từ đích để Start được di chuyển. Ở đây
+    start / exit cố định, chỉ tường thay đổi, nên LPA* là đủ.
+
+Danh sách kề:
+    Lưới đổi sau mỗi lần sửa nên LPA* đọc thẳng CompactGrid
+    (neighbor_offsets + viền tường canh) thay vì dựng lại CSR O(V).
+
+Độ phức tạp:
+    - Lần đầu: như A*, O((V + E) log V)
+    - Mỗi lần sửa: O(k log k) với k = số ô bị ảnh hưởng (thường << V)
+==============================================================================
+"""
+
+import heapq
+from array import array
+from typing import Dict, Generator, Iterable, List, Tuple
+
+from models.compact_grid import CompactGrid, PATH
+from .step_trace import StepTrace, drain
+from .task_executor import CANCEL_CHECK_MASK
+
+# "Vô cùng" cho g / rhs (vừa kiểu array('i'))
+INF = 2 ** 31 - 1
+
+
+class LPAStar:
+    """
+    Lifelong Planning A*: tìm đường một lần, sau đó sửa lại khi ô thay đổi.
+
+    Đặc điểm:
+        - find_path() cùng giao diện với AStar: trả về (path, steps, tables)
+        - update_cells() báo các ô vừa sửa và trả về đường đi mới
+        - self.stats có 'nodes_touched' (số ô đổi g / rhs) của lần chạy gần nhất
+    """
+
+    def __init__(self, maze):
+        """
+        Khởi tạo LPA*.
+
+        Args:
+            maze: CompactGrid, Maze hoặc ma trận mê cung (0 = đường đi, 1 = tường)
+        """
+        self.maze = CompactGrid.coerce(maze)
+        self.height = self.maze.height
+        self.width = self.maze.width
+        self.steps = StepTrace(scores=('g_score',))
+        self.stats = {}
+        # CancelToken của việc nền đang chạy solver này (None = không hủy)
+        self.cancel_token = None
+        self.start = -1
+        self.goal = -1
+        self.repairs = 0
+        self.initial_expanded = 0
+        self._g = None
+        self._rhs = None
+        self._heap = []
+        self._open = {}
+        self._scale = 1
+
+    # ===== HÀM PHỤ =====
+
+    def _heuristic(self, node: int) -> int:
+        """c_min * Manhattan từ node đến goal (consistent)."""
+        stride = self.maze.stride
+        y, x = divmod(node, stride)
+        goal_y, goal_x = divmod(self.goal, stride)
+        return self._scale * (abs(x - goal_x) + abs(y - goal_y))
+
+    def _key(self, node: int) -> Tuple[int, int]:
+        best = min(self._g[node], self._rhs[node])
+        return (best + self._heuristic(node), best)
+
+    def _update_vertex(self, node: int, touched: set):
+        """Tính lại rhs(node) từ các ô kề rồi đưa vào / bỏ khỏi hàng đợi."""
+        grid = self.maze
+        g, rhs = self._g, self._rhs
+        if node != self.start:
+            best = INF
+            if grid.cells[node] == PATH:
+                cost = grid.edge_costs()[node]
+                cells = grid.cells
+                for offset in grid.neighbor_offsets:
+                    previous = node + offset
+                    if cells[previous] == PATH and g[previous] != INF and g[previous] + cost < best:
+                        best = g[previous] + cost
+            if best != rhs[node]:
+                rhs[node] = best
+                touched.add(node)
+        if g[node] != rhs[node]:
+            key = self._key(node)
+            self._open[node] = key
+            heapq.heappush(self._heap, (key, node))
+        else:
+            self._open.pop(node, None)
+
+    def _compute(self, touched: set, trace: StepTrace = None) -> Generator:
+        """
+        Xử lý các ô không nhất quán đến khi đường tới goal đã chốt.
+
+        Là generator: yield từng bước khi có trace (không có trace thì
+        không yield gì), return số ô đã lấy ra và xử lý.
+        """
+        grid = self.maze
+        cells, offsets = grid.cells, grid.neighbor_offsets
+        g, rhs = self._g, self._rhs
+        heap, open_keys = self._heap, self._open
+        goal = self.goal
+        expanded = 0
+        token = self.cancel_token
+
+        while heap:
+            key, node = heap[0]
+            if open_keys.get(node) != key:
+                heapq.heappop(heap)  # Mục cũ (khóa đã đổi hoặc đã nhất quán)
+                continue
+            if key >= self._key(goal) and g[goal] == rhs[goal]:
+                break
+            heapq.heappop(heap)
+            del open_keys[node]
+            expanded += 1
+            if token is not None and not expanded & CANCEL_CHECK_MASK and token.cancelled:
+                # g / rhs đang dở dang: lần sửa sau phải tìm lại từ đầu
+                self._g = None
+                token.check()
+            touched.add(node)
+
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]     # Quá nhất quán: chốt giá trị
+            else:
+                g[node] = INF           # Thiếu nhất quán: bỏ giá trị cũ, tính lại
+                self._update_vertex(node, touched)
+            if trace is not None:
+                cell = grid.coords(node)
+                trace.visit(cell)
+                if g[node] != INF:
+                    trace.set_score('g_score', cell, g[node])
+                trace.add_step(current=cell, current_g=g[node] if g[node] != INF else None,
+                               current_rhs=rhs[node] if rhs[node] != INF else None,
+                               queue_size=len(open_keys))
+                yield trace[-1]
+            # Ô vừa thành tường cũng phải báo cho các ô kề từng đi qua nó
+            for offset in offsets:
+                neighbor = node + offset
+                if cells[neighbor] == PATH:
+                    self._update_vertex(neighbor, touched)
+        return expanded
+
+    def _extract_path(self) -> List[Tuple[int, int]]:
+        """Lần ngược từ goal theo ô kề có g + c nhỏ nhất."""
+        grid = self.maze
+        g, cells, costs = self._g, grid.cells, grid.edge_costs()
+        if g[self.goal] == INF:
+            return []
+        nodes = [self.goal]
+        current = self.goal
+        while current != self.start:
+            best, best_node = INF, -1
+            for offset in grid.neighbor_offsets:
+                previous = current + offset
+                if cells[previous] == PATH and g[previous] != INF and g[previous] + costs[current] < best:
+                    best, best_node = g[previous] + costs[current], previous
+            if best_node < 0 or len(nodes) > grid.size:
+                return []
+            nodes.append(best_node)
+            current = best_node
+        nodes.reverse()
+        coords = grid.coords
+        return [coords(node) for node in nodes]
+
+    # ===== GIAO DIỆN =====
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int],
+                  record_steps: bool = True) -> Tuple[List[Tuple[int, int]], List, Dict]:
+        """
+        Lần tìm đầu tiên (khởi tạo toàn bộ g / rhs, chạy như A*).
+
+        Args:
+            start: Tọa độ bắt đầu (x, y)
+            goal: Tọa độ đích (x, y)
+            record_steps: False = chế độ nhanh, bỏ qua toàn bộ việc ghi trace
+
+        Returns:
+            path: Danh sách các ô trên đường đi ngắn nhất
+            steps: StepTrace - các ô được xử lý ([] ở chế độ nhanh)
+            tables: Dict {g_score, visited} ({} ở chế độ nhanh)
+        """
+        trace = StepTrace(scores=('g_score',)) if record_steps else None
+        return drain(self._plan(start, goal, trace))
+
+    def iter_steps(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Generator:
+        """
+        Lần tìm đầu có ghi trace, chạy lười: yield từng bước ngay khi chốt.
+
+        Khi kết thúc generator return (path, steps, tables) như find_path.
+        """
+        return self._plan(start, goal, StepTrace(scores=('g_score',)))
+
+    def _plan(self, start: Tuple[int, int], goal: Tuple[int, int], trace: StepTrace) -> Generator:
+        """Thân của lần tìm đầu (trace = None: không ghi, không yield)."""
+        if trace is not None:
+            self.steps = trace
+        grid = self.maze
+        if not (grid.is_open(*start) and grid.is_open(*goal)):
+            self._g = None
+            self._set_stats(0, 0, [])
+            return [], (trace if trace is not None else []), {}
+
+        self.start, self.goal = grid.node_id(*start), grid.node_id(*goal)
+        self._scale = grid.cost_range()[0]
+        self._g = array('i', [INF]) * grid.size
+        self._rhs = array('i', [INF]) * grid.size
+        self._rhs[self.start] = 0
+        self._heap = [(self._key(self.start), self.start)]
+        self._open = {self.start: self._heap[0][0]}
+        self.repairs = 0
+
+        touched = {self.start}
+        expanded = yield from self._compute(touched, trace)
+        self.initial_expanded = expanded
+        path = self._extract_path()
+        self._set_stats(expanded, len(touched), path)
+        if trace is None:
+            return path, [], {}
+        coords, g = grid.coords, self._g
+        tables = {
+            'g_score': {coords(v): value for v, value in enumerate(g) if value != INF},
+            'visited': set(trace.visited)
+        }
+        return path, trace, tables
+
+    def update_cells(self, cells: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Sửa lại đường đi sau khi các ô (tường / chi phí) đã thay đổi trên lưới.
+
+        Chỉ rhs của các ô vừa sửa và ô kề của chúng được tính lại, rồi LPA*
+        xử lý phần cây tìm kiếm bị ảnh hưởng. Nếu chi phí ô nhỏ nhất giảm
+        (heuristic cũ không còn admissible) hoặc start / goal bị lấp thì
+        tìm lại từ đầu.
+
+        Args:
+            cells: Các ô (x, y) vừa bị sửa
+
+        Returns:
+            Đường đi mới từ start đến goal ([] nếu không còn đường)
+        """
+        grid = self.maze
+        start, goal = grid.coords(self.start), grid.coords(self.goal)
+        if (self._g is None or not (grid.is_open(*start) and grid.is_open(*goal))
+                or grid.cost_range()[0] < self._scale):
+            path = self.find_path(start, goal, record_steps=False)[0]
+            self.stats['repair'] = False
+            return path
+
+        touched = set()
+        for x, y in cells:
+            node = grid.node_id(x, y)
+            self._update_vertex(node, touched)
+            for offset in grid.neighbor_offsets:
+                if grid.cells[node + offset] == PATH:
+                    self._update_vertex(node + offset, touched)
+        # Khóa của các ô còn trong hàng đợi không đổi: h chỉ phụ thuộc goal
+        expanded = drain(self._compute(touched))
+        self.repairs += 1
+        path = self._extract_path()
+        self._set_stats(expanded, len(touched), path)
+        self.stats['repair'] = True
+        return path
+
+    def _set_stats(self, expanded: int, touched: int, path: List[Tuple[int, int]]):
+        """Lưu bộ đếm của lần chạy / lần sửa gần nhất."""
+        self.stats = {
+            'nodes_expanded': expanded,
+            'visited_count': expanded,
+            'nodes_touched': touched,
+            'path_length': len(path),
+            'path_cost': self.maze.path_cost(path),
+            'initial_expanded': self.initial_expanded,
+            'repairs': self.repairs
+        }
+
+    def get_complexity_info(self) -> dict:
+        """
+        Trả về thông tin độ phức tạp thuật toán LPA*.
+
+        Returns:
+            Dict chứa thông tin phân tích thuật toán
+        """
+        return {
+            'name': 'LPA* (Lifelong Planning A*)',
+            'time_complexity': 'Lần đầu như A*; mỗi lần sửa O(k log k), k = ô bị ảnh hưởng',
+            'space_complexity': 'O(V)',
+            'description': 'Giữ g / rhs giữa các lần tìm, sau mỗi lần sửa tường chỉ xử lý lại '
+                           'các ô không nhất quán',
+            'formula': 'rhs(s) = min g(p) + c(s); key = (min(g, rhs) + h, min(g, rhs))',
+            'heuristic': 'Manhattan distance nhân chi phí ô nhỏ nhất',
+            'advantages': [
+                'Sửa đường đi sau khi đổi tường mà không tìm lại từ đầu',
+                'Lần tìm đầu tối ưu như A*',
+                'Số ô chạm tới tỉ lệ với phần bị ảnh hưởng'
+            ],
+            'disadvantages': [
+                'Giữ g / rhs / hàng đợi cho cả mê cung giữa các lần sửa',
+                'Sửa gần start có thể lan ra gần như toàn bộ cây tìm kiếm',
+                'Cài đặt phức tạp hơn A*'
+            ]
+        }
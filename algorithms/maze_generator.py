@@ -20,15 +20,21 @@ Chiến lược: ĐỆ QUY + QUAY LUI (Backtracking)
     - Không gian: O(N × M) - lưu ma trận và Stack
 
 Cấu trúc dữ liệu:
-    - Stack (List): Lưu các ô đã đi qua để quay lui
-    - Set: Đánh dấu các ô đã thăm - O(1) lookup
+    - CompactGrid: Mê cung dạng bytearray, mỗi ô là một node id
+    - Stack (List): Lưu node id các ô đã đi qua để quay lui
+    - bytearray: Đánh dấu các ô đã thăm - O(1) lookup
+    - CarveLog: Trace các bước dạng nhật ký đào (không chép lưới mỗi bước)
 
 Tham khảo: Chương 3 - Đệ quy và chiến lược quay lui
 ==============================================================================
 """
 
 import random
-from typing import List, Tuple, Set
+from typing import Optional, Sequence, Tuple
+
+from models.compact_grid import CompactGrid
+from .carve_log import CarveLog
+from .task_executor import CANCEL_CHECK_MASK
 
 
 class MazeGenerator:
@@ -39,22 +45,27 @@ class MazeGenerator:
     chỉ có đúng 1 đường đi duy nhất.
     """
     
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None):
         """
         Khởi tạo bộ sinh mê cung.
 
         Args:
             width: Chiều rộng mê cung (số cột, nên là số LẺ)
             height: Chiều cao mê cung (số hàng, nên là số LẺ)
+            seed: Hạt giống ngẫu nhiên (cùng seed => cùng mê cung);
+                  None = dùng bộ sinh chung của module random
         """
         self.width = width
         self.height = height
+        self._random = random.Random(seed) if seed is not None else random
         # Khởi tạo toàn bộ là tường (1), sau đó đào đường (0)
-        self.maze = [[1 for _ in range(width)] for _ in range(height)]
+        self.maze = CompactGrid(width, height)
         # Lưu các bước để debug và trực quan hóa quá trình sinh
         self.steps = []
+        # CancelToken của việc nền đang sinh mê cung (None = không hủy)
+        self.cancel_token = None
 
-    def generate(self) -> Tuple[List[List[int]], List]:
+    def generate(self, record_steps: bool = True) -> Tuple[CompactGrid, Sequence]:
         """
         Sinh mê cung bằng thuật toán Backtracking (DFS + Random).
 
@@ -66,89 +77,104 @@ class MazeGenerator:
                c. Nếu không -> pop Stack (QUAY LUI)
             3. Kết thúc khi Stack rỗng
 
+        Args:
+            record_steps: False = chế độ nhanh, không ghi trace
+
         Returns:
-            maze: Ma trận mê cung (0 = đường đi, 1 = tường)
-            steps: Các bước sinh mê cung để debug/trực quan hóa
+            maze: CompactGrid mê cung (0 = đường đi, 1 = tường)
+            steps: CarveLog các bước sinh mê cung để debug/trực quan hóa;
+                   steps[k]['maze'] dựng lại lưới ở bước k ([] ở chế độ nhanh)
         """
         self.steps = []
+        grid = self.maze = CompactGrid(self.width, self.height)
+        cells = grid.cells
 
         # ===== BƯỚC 1: KHỞI TẠO =====
         # Bắt đầu từ ô (1, 1) - tránh viền ngoài
-        start_x, start_y = 1, 1
-        self.maze[start_y][start_x] = 0  # Đánh dấu là đường đi
-
-        # Stack để thực hiện DFS và quay lui
-        stack = [(start_x, start_y)]
-        # Tập các ô đã thăm - dùng Set để lookup O(1)
-        visited = {(start_x, start_y)}
+        start = grid.node_id(1, 1)
+        cells[start] = 0  # Đánh dấu là đường đi
+
+        # Stack để thực hiện DFS và quay lui (lưu node id)
+        stack = [start]
+        # Các ô đã thăm - bytearray theo node id, lookup O(1)
+        visited = bytearray(grid.size)
+        visited[start] = 1
+        # Các ô được phép đào tới (tránh viền ngoài của mê cung)
+        allowed = self._build_allowed(grid)
+        # Ô kế tiếp cách 2 ô: Lên, Phải, Xuống, Trái
+        jumps = tuple(2 * offset for offset in grid.neighbor_offsets)
+        token = self.cancel_token
+        choice = self._random.choice
+        iterations = 0
+        # Nhật ký đào: chỉ ghi (ô đang xét, cỡ stack) mỗi bước và (tường, ô) mỗi lần đào
+        log = CarveLog(grid) if record_steps else None
+        if log is not None:
+            self.steps = log
         
         # ===== BƯỚC 2: VÒNG LẶP CHÍNH =====
         while stack:
             # Lấy ô trên cùng Stack (không pop ngay)
-            current_x, current_y = stack[-1]
+            current = stack[-1]
+            iterations += 1
+            if token is not None and not iterations & CANCEL_CHECK_MASK:
+                token.check()
 
-            # Lưu bước hiện tại để trực quan hóa
-            self.steps.append({
-                'maze': [row[:] for row in self.maze],  # Copy ma trận
-                'current': (current_x, current_y),
-                'stack_size': len(stack)
-            })
+            # Lưu bước hiện tại để trực quan hóa (O(1), không chép lưới)
+            if log is not None:
+                log.add_step(current, len(stack))
 
             # Tìm các ô kế tiếp chưa thăm (cách 2 ô để có chỗ cho tường)
-            neighbors = self._get_unvisited_neighbors(current_x, current_y, visited)
+            neighbors = [current + jump for jump in jumps
+                         if allowed[current + jump] and not visited[current + jump]]
 
             if neighbors:
                 # ===== TRƯỜNG HỢP 1: CÒN Ô CHƯA THĂM =====
                 # Chọn ngẫu nhiên một ô kế tiếp
-                next_x, next_y = random.choice(neighbors)
+                next_node = choice(neighbors)
 
                 # Phá tường giữa ô hiện tại và ô kế tiếp
-                wall_x = (current_x + next_x) // 2
-                wall_y = (current_y + next_y) // 2
-                self.maze[wall_y][wall_x] = 0  # Phá tường
-                self.maze[next_y][next_x] = 0  # Đánh dấu ô mới là đường
+                wall = (current + next_node) // 2
+                cells[wall] = 0                        # Phá tường
+                cells[next_node] = 0                   # Đánh dấu ô mới là đường
+                if log is not None:
+                    log.carve(wall, next_node)
 
                 # Đánh dấu đã thăm và thêm vào stack
-                visited.add((next_x, next_y))
-                stack.append((next_x, next_y))
+                visited[next_node] = 1
+                stack.append(next_node)
             else:
                 # ===== TRƯỜNG HỢP 2: KHÔNG CÒN Ô NÀO - QUAY LUI =====
                 stack.pop()
 
         # ===== BƯỚC 3: HOÀN TẤT =====
         # Đảm bảo điểm Start và Exit là đường đi
-        self.maze[1][1] = 0                              # Start (góc trái-trên)
-        self.maze[self.height - 2][self.width - 2] = 0   # Exit (góc phải-dưới)
+        grid.set(1, 1, 0)                              # Start (góc trái-trên)
+        grid.set(self.width - 2, self.height - 2, 0)   # Exit (góc phải-dưới)
+        # Các ô đào trực tiếp trên cells không tăng version - đánh dấu lưới đã đổi
+        grid.version += 1
         
-        return self.maze, self.steps
+        return grid, self.steps
     
-    def _get_unvisited_neighbors(self, x: int, y: int, visited: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    def _build_allowed(self, grid: CompactGrid) -> bytearray:
         """
-        Lấy danh sách các ô kế tiếp chưa thăm.
+        Đánh dấu các ô hợp lệ để đào tới theo node id.
         
-        Lưu ý: Các ô kế tiếp cách 2 ô (không phải 1) để chừa chỗ cho tường.
+        Lưu ý: Các ô kế tiếp cách 2 ô (không phải 1) để chừa chỗ cho tường,
+        nên phải nằm trong 1 <= x < width - 1 và 1 <= y < height - 1.
+        Bước nhảy 2 ô từ một ô hợp lệ luôn rơi vào trong lưới (kể cả viền).
 
         Args:
-            x, y: Tọa độ ô hiện tại
-            visited: Tập các ô đã thăm
+            grid: Lưới đang sinh
 
         Returns:
-            Danh sách các ô kế tiếp hợp lệ (chưa thăm và trong biên)
+            bytearray với allowed[node] = 1 nếu node được phép đào tới
         """
-        neighbors = []
-        # 4 hướng: Lên(-2), Phải(+2), Xuống(+2), Trái(-2)
-        directions = [(0, -2), (2, 0), (0, 2), (-2, 0)]
-
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-
-            # Kiểm tra trong biên (tránh viền ngoài) và chưa thăm
-            if (1 <= new_x < self.width - 1 and 
-                1 <= new_y < self.height - 1 and 
-                (new_x, new_y) not in visited):
-                neighbors.append((new_x, new_y))
-
-        return neighbors
+        allowed = bytearray(grid.size)
+        inner = max(0, self.width - 2)
+        for y in range(1, self.height - 1):
+            start = grid.node_id(1, y)
+            allowed[start:start + inner] = b'\x01' * inner
+        return allowed
 
     def get_complexity_info(self) -> dict:
         """
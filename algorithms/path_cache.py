@@ -0,0 +1,183 @@
+"""
+==============================================================================
+PATH CACHE - BỘ NHỚ ĐỆM KẾT QUẢ TÌM ĐƯỜNG (LRU, KHÓA THEO NỘI DUNG)
+==============================================================================
+
+Mô tả bài toán:
+    Tìm đường, so sánh thuật toán... thường chạy lại ĐÚNG cùng một lần
+    tìm kiếm trên mê cung chưa đổi. Ta lưu lại kết quả (đường đi, trace,
+    bảng điểm, bộ đếm) và trả ngay ở lần gọi sau.
+
+Khóa cache:
+    (digest nội dung lưới, tên thuật toán, start, goal, có ghi trace không)
+    - digest lấy từ Maze.fingerprint(): cùng nội dung => cùng khóa, kể cả
+      khi mê cung được tạo lại giống hệt hoặc sửa ô rồi sửa về như cũ
+    - Kết quả chế độ nhanh không có trace nên khóa riêng với chế độ trace
+
+Thu hồi (eviction):
+    OrderedDict theo thứ tự dùng gần nhất (LRU). Khi vượt số mục tối đa
+    hoặc vượt giới hạn bộ nhớ ước lượng thì bỏ mục ít dùng nhất.
+    Trace của mê cung lớn có thể rất nặng, nên một kết quả lớn hơn cả
+    giới hạn bộ nhớ sẽ không được lưu.
+
+Độ phức tạp:
+    - get / put: O(1) (không tính ước lượng kích thước khi put)
+==============================================================================
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def deep_sizeof(value) -> int:
+    """
+    Bộ nhớ của một giá trị tính cả nội dung (byte).
+
+    Đi vào dict / list / tuple / set; số và chuỗi tính như sys.getsizeof
+    (số nhỏ Python dùng chung nên kết quả hơi lớn hơn thực tế - an toàn
+    cho giới hạn bộ nhớ).
+    """
+    getsizeof = sys.getsizeof
+    total = 0
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        total += getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+    return total
+
+
+class PathCache:
+    """
+    Cache LRU cho kết quả tìm đường, có giới hạn số mục và bộ nhớ.
+
+    Mỗi mục là dict dữ liệu thuần: 'path', 'steps', 'tables', 'stats',
+    'time' (và 'algorithm' - tên solver, dựng lại từ registry khi cần).
+
+    Attributes:
+        max_entries: Số mục tối đa
+        max_bytes: Tổng bộ nhớ ước lượng tối đa
+        hits, misses, evictions: Bộ đếm thống kê
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Số kết quả tối đa được giữ
+            max_bytes: Giới hạn tổng bộ nhớ ước lượng (byte)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(fingerprint, algorithm: str, start: Tuple[int, int], goal: Tuple[int, int],
+                 record_steps: bool = True) -> Tuple:
+        """
+        Tạo khóa cache.
+
+        Args:
+            fingerprint: GridFingerprint (Maze.fingerprint()) hoặc chuỗi digest
+            algorithm: Tên thuật toán (kèm biến thể nếu có)
+            start, goal: Điểm đầu, điểm đích
+            record_steps: Kết quả có kèm trace hay không
+        """
+        digest = getattr(fingerprint, 'digest', fingerprint)
+        return (digest, algorithm, tuple(start), tuple(goal), bool(record_steps))
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Lấy kết quả đã lưu (None nếu chưa có) và đánh dấu vừa dùng."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, entry: Dict[str, Any]):
+        """
+        Lưu một kết quả, thu hồi các mục cũ nhất nếu vượt giới hạn.
+
+        Kết quả lớn hơn cả max_bytes không được lưu.
+        """
+        size = self.estimate_size(entry)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._sizes[key] = size
+        self.total_bytes += size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Trả kết quả trong cache, hoặc gọi compute() rồi lưu lại.
+
+        Args:
+            key: Khóa từ make_key()
+            compute: Hàm chạy thuật toán, trả về dict kết quả
+        """
+        entry = self.get(key)
+        if entry is None:
+            entry = compute()
+            self.put(key, entry)
+        return entry
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        self.total_bytes -= self._sizes.pop(key)
+
+    def clear(self):
+        """Xóa toàn bộ kết quả (giữ nguyên bộ đếm)."""
+        self._entries.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+
+    @staticmethod
+    def estimate_size(entry: Dict[str, Any]) -> int:
+        """
+        Ước lượng bộ nhớ của một kết quả (byte).
+
+        Trace dùng StepTrace.estimated_bytes(); các giá trị khác (đường đi,
+        bảng điểm, bộ đếm) tính theo nội dung bằng deep_sizeof. Mục chỉ nên
+        giữ dữ liệu thuần (không giữ solver hay Maze), vì đối tượng khác
+        chỉ được tính phần vỏ.
+        """
+        total = sys.getsizeof(entry)
+        for value in entry.values():
+            estimated = getattr(value, 'estimated_bytes', None)
+            total += estimated() if estimated is not None else deep_sizeof(value)
+        return total
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Bộ đếm để hiển thị: hit, miss, eviction, số mục, bộ nhớ."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.total_bytes
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f'PathCache({len(self._entries)}/{self.max_entries} mục, '
+                f'{self.total_bytes // 1024} KB, hit={self.hits}, miss={self.misses})')
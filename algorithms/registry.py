@@ -0,0 +1,228 @@
+"""
+==============================================================================
+SỔ ĐĂNG KÝ THUẬT TOÁN - MỘT GIAO DIỆN CHUNG CHO MỌI SOLVER
+==============================================================================
+
+Mô tả bài toán:
+    Mỗi nơi dùng solver (nút chọn thuật toán, bảng so sánh, bộ đo, CLI)
+    từng tự viết chuỗi if/elif tên -> lớp, và tự xử lý khác biệt quy ước
+    gọi (BFS trả về 2 giá trị, các solver khác 3). Thêm một solver mới là
+    phải sửa nhiều nhánh ở nhiều file.
+
+Thiết kế:
+    - Solver (Protocol): solve(grid, start, goal, record=False) -> SolveResult
+    - SolveResult: path, stats (bộ đếm), steps (trace, None nếu không ghi),
+      tables (bảng khoảng cách / đỉnh trước, {} nếu solver không có)
+    - Capabilities: solver khai báo khả năng - tính theo chi phí địa hình
+      (weighted), sửa đường tăng dần (incremental), cần dựng index trước
+      (preprocessing), đường đi tối ưu hay chỉ gần tối ưu (optimal)
+    - SolverSpec: cài đặt Solver cho các lớp sẵn có (lớp + tham số khởi
+      tạo); create(maze) trả về instance khi cần iter_steps / cancel_token
+    - register(): thêm solver; solver_names(...) lọc theo khả năng.
+      Giao diện, bảng so sánh, bộ đo và CLI đều đọc danh sách từ đây
+
+Thứ tự đăng ký là thứ tự hiển thị.
+==============================================================================
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    from typing import Protocol
+except ImportError:  # Python 3.7
+    Protocol = object
+
+from models.landmarks import DEFAULT_LANDMARKS
+from .astar import AStar
+from .bfs import BFS
+from .bidirectional_astar import BidirectionalAStar
+from .bidirectional_bfs import BidirectionalBFS
+from .dijkstra import Dijkstra
+from .fringe_search import FringeSearch
+from .hpa_star import HPAStar
+from .ida_star import IDAStar
+from .jps import JPSAStar
+from .lpa_star import LPAStar
+
+
+class Capabilities(NamedTuple):
+    """
+    Khả năng solver khai báo.
+
+    Attributes:
+        weighted: Tìm theo chi phí địa hình (False = theo số bước)
+        incremental: Sửa đường đi tăng dần khi đổi ô (update_cells)
+        preprocessing: Dựng index theo mê cung trước khi tìm (cache trong Maze)
+        optimal: Đường đi tối ưu theo tiêu chí trên (False = gần tối ưu)
+    """
+    weighted: bool
+    incremental: bool = False
+    preprocessing: bool = False
+    optimal: bool = True
+
+
+class SolveResult(NamedTuple):
+    """
+    Kết quả chung của mọi solver.
+
+    Attributes:
+        path: Danh sách ô từ start tới goal ([] nếu không có đường)
+        stats: Bộ đếm của lần chạy (nodes_expanded, visited_count, ...)
+        steps: Trace từng bước, None nếu chạy với record=False
+        tables: Bảng dữ liệu để debug ({} nếu solver không có)
+    """
+    path: List[Tuple[int, int]]
+    stats: Dict
+    steps: Optional[List] = None
+    tables: Dict = {}
+
+    @classmethod
+    def from_raw(cls, raw: Tuple, stats: Dict, record: bool = True) -> 'SolveResult':
+        """
+        Chuyển giá trị trả về của find_path / iter_steps sang SolveResult.
+
+        Args:
+            raw: (path, steps) với BFS / BFS 2 chiều, (path, steps, tables) với các solver khác
+            stats: solver.stats của lần chạy
+            record: False = lần chạy không ghi trace (steps = None)
+        """
+        return cls(path=raw[0], stats=dict(stats), steps=raw[1] if record else None,
+                   tables=raw[2] if len(raw) > 2 else {})
+
+
+class Solver(Protocol):
+    """Giao diện chung: mọi thứ có name, capabilities và solve() đều dùng được."""
+
+    name: str
+    capabilities: Capabilities
+
+    def solve(self, grid, start: Tuple[int, int], goal: Tuple[int, int],
+              record: bool = False) -> SolveResult:
+        ...
+
+
+class SolverSpec:
+    """
+    Solver đăng ký từ một lớp sẵn có (find_path / iter_steps / stats).
+
+    Chỉ giữ lớp và tham số khởi tạo nên pickle được (gửi sang tiến trình con).
+    """
+
+    __slots__ = ('name', 'cls', 'options', 'capabilities', 'interactive')
+
+    def __init__(self, name: str, cls, options: Dict, capabilities: Capabilities,
+                 interactive: bool = True):
+        """
+        Args:
+            name: Tên hiển thị, cũng là khóa trong sổ đăng ký
+            cls: Lớp solver, khởi tạo bằng cls(maze, **options)
+            options: Tham số khởi tạo
+            capabilities: Khả năng của solver
+            interactive: Hiện trong danh sách chọn thuật toán của giao diện
+        """
+        self.name = name
+        self.cls = cls
+        self.options = options
+        self.capabilities = capabilities
+        self.interactive = interactive
+
+    def create(self, maze):
+        """Tạo instance solver cho mê cung (Maze, CompactGrid hoặc ma trận)."""
+        return self.cls(maze, **self.options)
+
+    def solve(self, grid, start: Tuple[int, int], goal: Tuple[int, int],
+              record: bool = False, token=None) -> SolveResult:
+        """
+        Tìm đường một lần.
+
+        Args:
+            grid: Maze (index được cache theo mê cung), CompactGrid hoặc ma trận
+            start, goal: Điểm đầu, điểm đích
+            record: True = ghi trace từng bước
+            token: CancelToken của việc nền (None = không hủy)
+        """
+        solver = self.create(grid)
+        solver.cancel_token = token
+        raw = solver.find_path(start, goal, record_steps=record)
+        return SolveResult.from_raw(raw, solver.stats, record)
+
+    def __repr__(self) -> str:
+        return f'SolverSpec({self.name!r}, {self.cls.__name__}, {self.options})'
+
+
+# Tên -> solver, theo thứ tự đăng ký
+REGISTRY: Dict[str, SolverSpec] = {}
+
+
+def register(name: str, cls, options: Optional[Dict] = None, weighted: bool = False,
+             incremental: bool = False, preprocessing: bool = False,
+             interactive: bool = True, optimal: bool = True) -> SolverSpec:
+    """
+    Đăng ký một solver (tên trùng thì thay bản cũ).
+
+    Returns:
+        SolverSpec vừa đăng ký
+    """
+    spec = SolverSpec(name, cls, options or {},
+                      Capabilities(weighted, incremental, preprocessing, optimal), interactive)
+    REGISTRY[name] = spec
+    return spec
+
+
+def get_solver(name: str) -> SolverSpec:
+    """
+    Raises:
+        KeyError: Nếu tên thuật toán chưa được đăng ký
+    """
+    return REGISTRY[name]
+
+
+def solver_names(interactive: Optional[bool] = None, **capabilities) -> List[str]:
+    """
+    Tên các solver đã đăng ký, lọc theo điều kiện.
+
+    Ví dụ: solver_names(incremental=False), solver_names(interactive=True)
+
+    Args:
+        interactive: True / False = chỉ lấy solver hiện / không hiện trên giao diện
+        capabilities: Tên khả năng -> giá trị cần khớp
+
+    Raises:
+        TypeError: Nếu có khả năng không tồn tại
+    """
+    unknown = set(capabilities) - set(Capabilities._fields)
+    if unknown:
+        raise TypeError(f'Khả năng không tồn tại: {", ".join(sorted(unknown))}')
+    return [name for name, spec in REGISTRY.items()
+            if (interactive is None or spec.interactive == interactive)
+            and all(getattr(spec.capabilities, key) == value for key, value in capabilities.items())]
+
+
+# ===== CÁC SOLVER CÓ SẴN =====
+
+register('BFS', BFS)
+register('Dijkstra', Dijkstra, weighted=True)
+register('A*', AStar, weighted=True)
+# Open list bucket theo f, phá hòa LIFO: 'max_g' mở gần như cùng số ô nhưng
+# chậm hơn vì phải giữ mask các mức h trong mỗi bucket
+register('A* (bucket)', AStar, {'open_list': 'bucket', 'tie_break': 'lifo'}, weighted=True)
+# Heuristic ALT: bảng mốc dựng một lần cho mỗi mê cung (Maze cache)
+register('A* (ALT)', AStar, {'landmarks': DEFAULT_LANDMARKS}, weighted=True, preprocessing=True)
+register('BFS 2 chiều', BidirectionalBFS)
+register('A* 2 chiều', BidirectionalAStar)
+register('JPS', JPSAStar)
+# Phân cấp: đồ thị cụm dựng một lần, sửa ô chỉ cập nhật cụm bị đổi. Tính theo
+# chi phí địa hình nhưng chỉ đi qua các ô lối vào đại diện => gần tối ưu
+register('HPA*', HPAStar, weighted=True, preprocessing=True, optimal=False)
+# Không Heap (IDA*: stack DFS + bitset đã mở, Fringe: danh sách liên kết).
+# Bitset của IDA* không giữ g theo ô => mê cung có chu trình chỉ gần tối ưu
+register('IDA*', IDAStar, weighted=True, optimal=False)
+register('Fringe Search', FringeSearch, weighted=True)
+# Đồ thị nút giao chỉ dùng ở chế độ nhanh; trace giống hệt bản trên lưới
+# nên không hiện trong danh sách chọn của giao diện
+register('Dijkstra (nút giao)', Dijkstra, {'use_junctions': True}, weighted=True,
+         preprocessing=True, interactive=False)
+register('A* (nút giao)', AStar, {'use_junctions': True}, weighted=True,
+         preprocessing=True, interactive=False)
+# Tăng dần: dùng cho sửa đường khi click đặt / gỡ tường
+register('LPA*', LPAStar, weighted=True, incremental=True, interactive=False)
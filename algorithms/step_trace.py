@@ -0,0 +1,429 @@
+"""
+==============================================================================
+STEP TRACE - LƯU VẾT TỪNG BƯỚC THEO KIỂU DELTA
+==============================================================================
+
+Mô tả bài toán:
+    Để trực quan hóa, BFS/Dijkstra/A* lưu lại trạng thái sau mỗi bước.
+    Cách cũ chép TOÀN BỘ visited (và g_score, f_score) ở mỗi bước
+    => O(V²) thời gian và bộ nhớ cho một lần tìm đường.
+
+Ý tưởng:
+    Chỉ ghi lại PHẦN THAY ĐỔI (delta) của từng bước:
+    - Ô mới được đánh dấu đã thăm  -> nhật ký thứ tự thăm
+    - Các cập nhật điểm số          -> nhật ký (ô, giá trị) theo thứ tự
+    - Các trường vô hướng của bước  -> dict nhỏ (current, heap_size, ...)
+    Bảng visited / g_score của bước k được dựng LƯỜI (lazy view) từ
+    tiền tố nhật ký khi cần, không sao chép.
+
+Tương thích:
+    trace[k] trả về một Mapping giống dict cũ, nên các đoạn code như
+    step['visited'], step.get('path', []), len(step['visited'])
+    trong MainWindow và DebugPanel vẫn chạy nguyên vẹn.
+
+Chạy lười (iter_steps):
+    Các solver có thêm generator iter_steps(start, goal): mỗi lần
+    add_step() thì yield bước vừa chốt. StepStream bọc generator đó để
+    animation chỉ kéo bước kế tiếp khi tới khung hình => hiện bước 1 ngay,
+    tạm dừng animation là dừng luôn việc tìm kiếm. find_path(record_steps
+    =True) chỉ là chạy hết generator (drain).
+
+Độ phức tạp:
+    - Ghi một sự kiện: O(1)
+    - Bộ nhớ: O(V + số lần cập nhật) thay vì O(V²)
+    - Tra cứu score của một ô tại bước k: O(số lần ô đó được cập nhật)
+==============================================================================
+"""
+
+import sys
+import time
+from collections.abc import Mapping, Sequence, Set
+from itertools import islice
+from typing import Any, Callable, Dict, Generator, Hashable, Iterable, List, Optional, Tuple
+
+from .task_executor import CANCEL_CHECK_MASK
+
+
+class VisitedView(Set):
+    """
+    Tập visited tại một bước, là tiền tố của nhật ký thứ tự thăm.
+
+    Hỗ trợ len(), in, duyệt và các phép toán tập hợp như một set
+    chỉ đọc, nhưng không sao chép dữ liệu.
+    """
+
+    __slots__ = ('_order', '_index', '_limit')
+
+    def __init__(self, order: List, index: Dict, limit: int):
+        self._order = order
+        self._index = index
+        self._limit = limit
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable) -> set:
+        # Kết quả của các phép toán tập hợp (|, &, -) là set thường
+        return set(iterable)
+
+    def __contains__(self, cell) -> bool:
+        position = self._index.get(cell)
+        return position is not None and position < self._limit
+
+    def __iter__(self):
+        return islice(self._order, self._limit)
+
+    def __len__(self) -> int:
+        return self._limit
+
+    def __repr__(self) -> str:
+        return f'VisitedView({len(self)} ô)'
+
+
+class _ScoreLog:
+    """
+    Nhật ký cập nhật của một bảng điểm (g_score, distances, ...).
+
+    history[cell] là list phẳng [vị_trí_0, giá_trị_0, vị_trí_1, giá_trị_1, ...]
+    với vị_trí là số thứ tự của lần cập nhật trong toàn bộ nhật ký.
+    """
+
+    __slots__ = ('cells', 'history', 'size')
+
+    def __init__(self):
+        # Thứ tự các ô xuất hiện lần đầu (để duyệt theo bước)
+        self.cells = []
+        self.history = {}
+        # Tổng số lần cập nhật đã ghi
+        self.size = 0
+
+    def set(self, cell: Hashable, value: Any):
+        entry = self.history.get(cell)
+        if entry is None:
+            self.history[cell] = [self.size, value]
+            self.cells.append(cell)
+        else:
+            entry.append(self.size)
+            entry.append(value)
+        self.size += 1
+
+
+class ScoreView(Mapping):
+    """
+    Bảng điểm (ô -> giá trị) tại một bước, dựng lười từ _ScoreLog.
+
+    Giá trị của một ô là lần cập nhật CUỐI CÙNG xảy ra trước bước đó.
+    """
+
+    __slots__ = ('_log', '_size', '_count')
+
+    def __init__(self, log: _ScoreLog, size: int, count: int):
+        self._log = log
+        # Chỉ các cập nhật có vị trí < size mới thuộc về bước này
+        self._size = size
+        # Số ô phân biệt đã có điểm tại bước này
+        self._count = count
+
+    def __getitem__(self, cell):
+        entry = self._log.history.get(cell)
+        if entry is not None:
+            # Duyệt ngược: mỗi ô chỉ được cập nhật vài lần
+            for i in range(len(entry) - 2, -1, -2):
+                if entry[i] < self._size:
+                    return entry[i + 1]
+        raise KeyError(cell)
+
+    def __contains__(self, cell) -> bool:
+        entry = self._log.history.get(cell)
+        return entry is not None and entry[0] < self._size
+
+    def __iter__(self):
+        return islice(self._log.cells, self._count)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f'ScoreView({len(self)} ô)'
+
+
+class TraceStep(Mapping):
+    """
+    Một bước trong StepTrace, hành xử như dict bước cũ.
+
+    Các khóa:
+        - 'visited': VisitedView của bước
+        - tên các bảng điểm của trace (vd 'g_score'): ScoreView
+        - 'path' (nếu trace có hàm dựng đường): đường đi từ gốc đến
+          'current', dựng lười bằng cách lần ngược con trỏ cha
+        - các trường vô hướng đã ghi bằng add_step()
+    """
+
+    __slots__ = ('_trace', '_fields', '_visited_count', '_marks')
+
+    def __init__(self, trace: 'StepTrace', fields: Dict, visited_count: int, marks: Tuple):
+        self._trace = trace
+        self._fields = fields
+        self._visited_count = visited_count
+        self._marks = marks
+
+    def __getitem__(self, key):
+        trace = self._trace
+        if key == 'visited':
+            return VisitedView(trace._visit_order, trace._visit_index, self._visited_count)
+        position = trace._score_position.get(key)
+        if position is not None:
+            size, count = self._marks[2 * position], self._marks[2 * position + 1]
+            return ScoreView(trace._score_logs[position], size, count)
+        if key == 'path' and trace._path_builder is not None and key not in self._fields:
+            return trace._path_builder(self._fields['current'])
+        return self._fields[key]
+
+    def __iter__(self):
+        yield from self._fields
+        yield 'visited'
+        yield from self._trace.score_names
+        if self._trace._path_builder is not None and 'path' not in self._fields:
+            yield 'path'
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def trace(self) -> 'StepTrace':
+        """StepTrace chứa bước này (để dựng lại các bước khác theo chỉ số)."""
+        return self._trace
+
+    def __repr__(self) -> str:
+        return f'TraceStep({self._fields!r}, visited={self._visited_count})'
+
+
+class StepTrace(Sequence):
+    """
+    Danh sách các bước của một lần tìm đường, lưu theo kiểu delta.
+
+    Cách dùng trong thuật toán:
+        trace = StepTrace(scores=('g_score', 'f_score'))
+        trace.visit(cell)                      # ô mới được thăm
+        trace.set_score('g_score', cell, 5)    # cập nhật điểm
+        trace.add_step(current=cell, heap_size=len(heap))
+
+    Cách dùng khi hiển thị (giống list các dict cũ):
+        len(trace), trace[k]['visited'], trace[-1].get('g_score')
+    """
+
+    def __init__(self, scores: Tuple[str, ...] = ()):
+        """
+        Khởi tạo trace rỗng.
+
+        Args:
+            scores: Tên các bảng điểm cần ghi nhật ký (vd 'distances')
+        """
+        self.score_names = tuple(scores)
+        self._score_position = {name: i for i, name in enumerate(self.score_names)}
+        self._score_logs = [_ScoreLog() for _ in self.score_names]
+        # Nhật ký visited: thứ tự thăm và vị trí của từng ô
+        self._visit_order = []
+        self._visit_index = {}
+        # Mỗi bước: (fields, số ô đã thăm, mốc của từng bảng điểm)
+        self._steps = []
+        # Hàm dựng 'path' lười của từng bước (tùy chọn)
+        self._path_builder = None
+
+    # ===== GHI NHẬT KÝ =====
+
+    def visit(self, cell: Hashable):
+        """Đánh dấu một ô mới được thăm."""
+        if cell not in self._visit_index:
+            self._visit_index[cell] = len(self._visit_order)
+            self._visit_order.append(cell)
+
+    def set_score(self, name: str, cell: Hashable, value: Any):
+        """Ghi lại một lần cập nhật điểm của ô trong bảng `name`."""
+        self._score_logs[self._score_position[name]].set(cell, value)
+
+    def set_path_builder(self, builder: Callable[[Hashable], List]):
+        """
+        Gắn hàm dựng đường đi để step['path'] được tính lười.
+
+        Thuật toán truyền vào hàm lần ngược con trỏ cha từ một ô về gốc.
+        Chỉ dùng khi con trỏ cha của một ô KHÔNG đổi sau khi ô đó được
+        duyệt (đúng với BFS), vì đường đi được lần theo bảng cuối cùng.
+
+        Args:
+            builder: Hàm nhận ô (x, y), trả về đường đi gốc -> ô đó
+        """
+        self._path_builder = builder
+
+    def add_step(self, **fields):
+        """
+        Chốt một bước: ghi các trường vô hướng và mốc hiện tại
+        của các nhật ký (không sao chép bảng nào).
+        """
+        marks = []
+        for log in self._score_logs:
+            marks.append(log.size)
+            marks.append(len(log.cells))
+        self._steps.append((fields, len(self._visit_order), tuple(marks)))
+
+    # ===== TRUY XUẤT =====
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._steps)))]
+        fields, visited_count, marks = self._steps[index]
+        return TraceStep(self, fields, visited_count, marks)
+
+    @property
+    def visited(self) -> VisitedView:
+        """Tập visited đầy đủ (gồm cả các ô được thăm sau bước cuối)."""
+        return VisitedView(self._visit_order, self._visit_index, len(self._visit_order))
+
+    def estimated_bytes(self) -> int:
+        """
+        Ước lượng bộ nhớ của trace (byte), dùng cho giới hạn của PathCache.
+
+        Tính các container và mỗi ô (tuple (x, y)) một lần; không đi sâu
+        vào từng số nguyên nhỏ vốn được Python dùng chung.
+        """
+        getsizeof = sys.getsizeof
+        cell_bytes = getsizeof((0, 0))
+        total = getsizeof(self._visit_order) + getsizeof(self._visit_index)
+        total += len(self._visit_order) * cell_bytes
+        total += getsizeof(self._steps)
+        for step in self._steps:
+            total += getsizeof(step) + getsizeof(step[0]) + getsizeof(step[2])
+        for log in self._score_logs:
+            total += getsizeof(log.cells) + getsizeof(log.history)
+            total += sum(getsizeof(entry) for entry in log.history.values())
+        return total
+
+    def __repr__(self) -> str:
+        return f'StepTrace({len(self)} bước, {len(self._visit_order)} ô đã thăm)'
+
+
+def drain(steps: Generator, token=None) -> Any:
+    """
+    Chạy hết một generator iter_steps và lấy giá trị nó return.
+
+    Args:
+        steps: Generator do iter_steps() của một solver trả về
+        token: CancelToken (tùy chọn) - kiểm tra sau mỗi CANCEL_CHECK_MASK + 1 bước
+
+    Returns:
+        Kết quả như find_path: (path, steps[, tables])
+
+    Raises:
+        TaskCancelled: Nếu token bị hủy giữa chừng
+    """
+    count = 0
+    try:
+        while True:
+            next(steps)
+            count += 1
+            if token is not None and not count & CANCEL_CHECK_MASK:
+                token.check()
+    except StopIteration as stop:
+        return stop.value
+
+
+class StepStream:
+    """
+    Danh sách bước được tính LƯỜI từ generator iter_steps của một solver.
+
+    Bước k chỉ được tính khi fetch(k) cần tới nó. Luồng chỉ giữ bước đang
+    hiện (khung hình hiện tại) và số bước đã tính; tua lại bước cũ thì
+    dựng lại nó từ StepTrace của solver (trace[k] - view nhỏ trên nhật ký
+    delta mà solver vẫn phải ghi), không giữ list các bước đã kéo ra.
+    Khi generator kết thúc, `result` chứa giá trị find_path trả về.
+
+    Yêu cầu: generator yield đúng một lần sau mỗi add_step() (bước thứ k
+    của luồng là trace[k]) - đúng với iter_steps của mọi solver.
+
+    Attributes:
+        result: Kết quả (path, steps[, tables]) khi đã chạy xong, None nếu chưa
+        elapsed: Tổng thời gian tính toán thật sự (giây), không tính lúc chờ
+    """
+
+    def __init__(self, steps: Generator):
+        """
+        Args:
+            steps: Generator do iter_steps() trả về (chưa chạy bước nào)
+        """
+        self._iterator = steps
+        # Số bước đã tính, StepTrace nguồn và bước đang giữ (chỉ số, bước)
+        self._count = 0
+        self._trace = None
+        self._current = (-1, None)
+        self.result = None
+        self.elapsed = 0.0
+
+    @property
+    def done(self) -> bool:
+        """True khi solver đã chạy xong (đã có result)."""
+        return self._iterator is None
+
+    def fetch(self, index: int) -> Optional[Mapping]:
+        """
+        Lấy bước thứ index, tính thêm các bước còn thiếu nếu cần.
+
+        Returns:
+            Bước (TraceStep), hoặc None nếu solver kết thúc trước bước đó
+        """
+        if index < 0:
+            return None
+        current_index, current = self._current
+        if index == current_index:
+            return current
+        if index < self._count:
+            # Tua lại: dựng bước cũ từ trace, không tính lại gì
+            step = self._trace[index]
+            self._current = (index, step)
+            return step
+        clock = time.perf_counter
+        started = clock()
+        try:
+            while self._iterator is not None and self._count <= index:
+                try:
+                    step = next(self._iterator)
+                except StopIteration as stop:
+                    self.result = stop.value
+                    self._iterator = None
+                    break
+                if self._trace is None:
+                    self._trace = step.trace
+                self._count += 1
+                if self._count > index:
+                    self._current = (index, step)
+        finally:
+            self.elapsed += clock() - started
+        return self._current[1] if self._current[0] == index else None
+
+    def finish(self) -> Any:
+        """Tính nốt các bước còn lại, trả về result."""
+        while not self.done:
+            self.fetch(self._count)
+        return self.result
+
+    def total(self) -> Optional[int]:
+        """Tổng số bước nếu đã chạy xong, None nếu chưa biết."""
+        return self._count if self.done else None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Mapping:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self.fetch(index)
+
+    def __bool__(self) -> bool:
+        # Luồng chưa chạy vẫn có thể còn bước => coi là khác rỗng
+        return not self.done or self._count > 0
+
+    def __repr__(self) -> str:
+        state = 'xong' if self.done else 'đang chạy'
+        return f'StepStream({self._count} bước, {state})'
@@ -0,0 +1,309 @@
+"""
+==============================================================================
+TASK EXECUTOR - CHẠY VIỆC NẶNG NGOÀI VÒNG LẶP TKINTER
+==============================================================================
+
+Mô tả bài toán:
+    Tkinter chỉ cho phép chạm vào widget từ luồng chính. Việc nặng (sinh
+    mê cung, đo so sánh, chạy lại A*) chạy thẳng trên luồng đó làm đứng
+    animation và phím bấm; còn mỗi lần bấm lại mở một Thread trần thì kết
+    quả CŨ có thể về sau và ghi đè kết quả MỚI.
+
+Thiết kế:
+    - Worker pool: ThreadPoolExecutor (việc cần dùng chung đối tượng) và
+      ProcessPoolExecutor (việc thuần CPU, kết quả pickle được) - tạo lười.
+      Tiến trình con luôn tạo bằng "spawn": fork từ tiến trình Tk đã có
+      luồng worker có thể chép cả khóa đang bị giữ và treo tiến trình con
+    - Hàng đợi kết quả: future xong thì đẩy request id của nó vào một
+      SimpleQueue; luồng Tk gọi poll() định kỳ bằng root.after và chạy
+      callback NGAY TRÊN luồng Tk
+    - Request id + kênh (channel): mỗi lần submit có một id tăng dần; gửi
+      yêu cầu mới vào cùng kênh thì các yêu cầu cũ của kênh bị hủy và kết
+      quả của chúng bị BỎ khi về tới (không bao giờ ghi đè kết quả mới)
+    - CancelToken: việc chạy bằng luồng nhận token làm tham số đầu; solver
+      (thuộc tính cancel_token) kiểm tra token mỗi CANCEL_CHECK_MASK + 1
+      node và ném TaskCancelled để dừng sớm. Việc chạy bằng tiến trình chỉ
+      hủy riêng được khi chưa bắt đầu; đã chạy thì kết quả bị bỏ khi về
+      (việc tự đặt giới hạn thời gian bên trong worker)
+    - Dừng tiến trình worker: pool nhận một Event dùng chung qua
+      initializer; shutdown() bật Event đó, mọi CancelToken trong tiến
+      trình worker coi như đã hủy nên việc đang chạy dừng ở lần check()
+      kế tiếp và đóng cửa sổ không phải chờ chúng chạy hết
+
+Độ phức tạp:
+    - submit / cancel: O(số yêu cầu đang chạy của kênh)
+    - poll: O(số kết quả đã về)
+==============================================================================
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Solver kiểm tra token khi (số node đã xử lý & CANCEL_CHECK_MASK) == 0
+CANCEL_CHECK_MASK = 1023
+
+# Chu kỳ poll mặc định (ms) - khoảng một khung hình 60 fps
+POLL_INTERVAL = 16
+
+# Trong tiến trình worker: Event dừng dùng chung của pool (None ở tiến trình chính)
+_process_stop = None
+
+
+def _init_process_worker(stop):
+    """Initializer của ProcessPoolExecutor: nhận Event dừng dùng chung."""
+    global _process_stop
+    _process_stop = stop
+
+
+class TaskCancelled(Exception):
+    """Việc nền bị hủy giữa chừng (do CancelToken.check())."""
+
+
+class CancelToken:
+    """
+    Cờ hủy dùng chung giữa luồng Tk và luồng worker.
+
+    Luồng Tk gọi cancel(); việc nền gọi check() (hoặc đọc cancelled) ở
+    các điểm dừng an toàn. Có timeout thì token tự hết hạn sau số giây đó
+    (vd bộ đo đặt giới hạn thời gian cho mỗi lần chạy). Trong tiến trình
+    worker của TaskExecutor, token cũng bị hủy khi executor shutdown().
+    """
+
+    __slots__ = ('_event', '_deadline')
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: Số giây tới khi token tự hủy (None = chỉ hủy bằng cancel())
+        """
+        self._event = threading.Event()
+        self._deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def cancel(self):
+        """Yêu cầu dừng việc đang chạy."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self._event.set()
+        if _process_stop is not None and _process_stop.is_set():
+            self._event.set()
+        return self._event.is_set()
+
+    def check(self):
+        """
+        Raises:
+            TaskCancelled: Nếu token đã bị hủy
+        """
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def __repr__(self) -> str:
+        return f'CancelToken({"đã hủy" if self.cancelled else "đang chạy"})'
+
+
+class TaskExecutor:
+    """
+    Bộ chạy việc nền cho một cửa sổ Tk.
+
+    Cách dùng:
+        executor = TaskExecutor()
+        executor.attach(root)                       # poll bằng root.after
+        executor.submit('generate', build, 21, 21, on_done=show)
+        # build(token, 21, 21) chạy trong luồng worker, show(result)
+        # chạy trên luồng Tk; bấm lại thì yêu cầu cũ bị hủy / bỏ
+
+    Attributes:
+        completed: Số kết quả đã giao cho callback
+        dropped: Số kết quả bị bỏ vì yêu cầu đã cũ / đã hủy
+        failed: Số việc kết thúc bằng lỗi
+    """
+
+    def __init__(self, threads: int = 2, processes: Optional[int] = None):
+        """
+        Args:
+            threads: Số luồng worker
+            processes: Số tiến trình worker (mặc định: số lõi - 1, chừa một
+                       lõi cho giao diện)
+        """
+        self.threads = threads
+        self.processes = processes or max(1, (os.cpu_count() or 2) - 1)
+        self._thread_pool = None
+        self._process_pool = None
+        # Event dừng dùng chung với các tiến trình worker (tạo cùng pool)
+        self._process_stop = None
+        self._results = queue.SimpleQueue()
+        self._next_id = 0
+        # request id -> (kênh, future, token, on_done, on_error)
+        self._requests = {}
+        # kênh -> tập request id còn hiệu lực
+        self._live = {}
+        self._root = None
+        self._interval = POLL_INTERVAL
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    # ===== GỬI / HỦY =====
+
+    def submit(self, channel: str, fn: Callable, *args, on_done: Callable = None,
+               on_error: Callable = None, process: bool = False, replace: bool = True) -> int:
+        """
+        Gửi một việc nền.
+
+        Args:
+            channel: Tên kênh (vd 'generate'); yêu cầu cùng kênh thay thế nhau
+            fn: Hàm cần chạy. Chạy bằng luồng: fn(token, *args);
+                chạy bằng tiến trình: fn(*args) (fn và args phải pickle được)
+            on_done: Gọi trên luồng Tk với kết quả
+            on_error: Gọi trên luồng Tk với exception (mặc định: ném lại khi poll)
+            process: True = chạy trong ProcessPoolExecutor
+            replace: True = hủy các yêu cầu đang chạy của kênh;
+                     False = chạy song song với chúng (một lô nhiều việc)
+
+        Returns:
+            Request id của việc vừa gửi
+        """
+        if replace:
+            self.cancel(channel)
+        self._next_id += 1
+        request_id = self._next_id
+        token = CancelToken()
+        if process:
+            future = self._get_process_pool().submit(fn, *args)
+        else:
+            future = self._get_thread_pool().submit(fn, token, *args)
+        self._requests[request_id] = (channel, future, token, on_done, on_error)
+        self._live.setdefault(channel, set()).add(request_id)
+        # Callback này chạy trên luồng worker: chỉ đẩy vào hàng đợi
+        future.add_done_callback(lambda done, rid=request_id: self._results.put(rid))
+        return request_id
+
+    def cancel(self, channel: str):
+        """Hủy mọi yêu cầu đang chạy của kênh; kết quả của chúng sẽ bị bỏ."""
+        for request_id in self._live.pop(channel, ()):
+            _, future, token, _, _ = self._requests[request_id]
+            token.cancel()
+            future.cancel()
+
+    def is_busy(self, channel: str) -> bool:
+        """True nếu kênh còn yêu cầu chưa có kết quả."""
+        return bool(self._live.get(channel))
+
+    def is_current(self, request_id: int) -> bool:
+        """True nếu yêu cầu chưa bị hủy / thay thế."""
+        request = self._requests.get(request_id)
+        return request is not None and request_id in self._live.get(request[0], ())
+
+    # ===== NHẬN KẾT QUẢ (LUỒNG TK) =====
+
+    def poll(self) -> int:
+        """
+        Giao các kết quả đã về cho callback (gọi trên luồng Tk).
+
+        Returns:
+            Số kết quả đã giao
+        """
+        delivered = 0
+        while True:
+            try:
+                request_id = self._results.get_nowait()
+            except queue.Empty:
+                return delivered
+            channel, future, token, on_done, on_error = self._requests.pop(request_id)
+            live = self._live.get(channel)
+            if live is None or request_id not in live or token.cancelled:
+                self.dropped += 1
+                continue
+            live.discard(request_id)
+            if not live:
+                del self._live[channel]
+
+            error = future.exception()
+            if isinstance(error, TaskCancelled):
+                self.dropped += 1
+            elif error is not None:
+                self.failed += 1
+                if on_error is None:
+                    raise error
+                on_error(error)
+            else:
+                self.completed += 1
+                delivered += 1
+                if on_done is not None:
+                    on_done(future.result())
+
+    def attach(self, root, interval: int = POLL_INTERVAL):
+        """Tự poll định kỳ bằng root.after (root là cửa sổ Tk)."""
+        self._root = root
+        self._interval = interval
+        root.after(interval, self._tick)
+
+    def _tick(self):
+        if self._root is None:
+            return
+        try:
+            self.poll()
+        finally:
+            self._root.after(self._interval, self._tick)
+
+    # ===== POOL =====
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.threads,
+                                                   thread_name_prefix='maze-task')
+        return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            context = multiprocessing.get_context('spawn')
+            self._process_stop = context.Event()
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=context,
+                                                     initializer=_init_process_worker,
+                                                     initargs=(self._process_stop,))
+        return self._process_pool
+
+    def shutdown(self):
+        """
+        Hủy mọi việc và đóng các pool (không chờ việc đang chạy).
+
+        Việc chạy bằng luồng dừng ở lần check() token kế tiếp. Việc đang
+        chạy trong tiến trình worker dừng ở lần check() kế tiếp nhờ Event
+        dừng dùng chung (interpreter chờ các worker khi thoát, nên việc
+        chạy bằng tiến trình phải kiểm tra CancelToken).
+        """
+        for channel in list(self._live):
+            self.cancel(channel)
+        # Việc chưa bắt đầu (cancel_futures của shutdown cần Python 3.9)
+        for _, future, token, _, _ in self._requests.values():
+            token.cancel()
+            future.cancel()
+        self._root = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+        if self._process_pool is not None:
+            self._process_stop.set()
+            self._process_pool.shutdown(wait=False)
+        self._thread_pool = self._process_pool = self._process_stop = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Bộ đếm để hiển thị / kiểm tra."""
+        return {
+            'pending': sum(len(live) for live in self._live.values()),
+            'completed': self.completed,
+            'dropped': self.dropped,
+            'failed': self.failed
+        }
+
+    def __repr__(self) -> str:
+        stats = self.stats
+        return (f'TaskExecutor({stats["pending"]} đang chạy, {stats["completed"]} xong, '
+                f'{stats["dropped"]} bỏ)')
@@ -0,0 +1,10 @@
+"""
+Module __init__ cho benchmarks package
+
+Bộ đo hiệu năng chạy không cần giao diện (không import tkinter / pygame):
+    python -m benchmarks --sizes 21,101,501 --json ket_qua.json
+"""
+
+from .pathfinding import DEFAULT_ALGORITHMS, DEFAULT_SIZES, GENERATOR, STREAM_GENERATOR, run_case, run_suite
+
+__all__ = ['DEFAULT_ALGORITHMS', 'DEFAULT_SIZES', 'GENERATOR', 'STREAM_GENERATOR', 'run_case', 'run_suite']
@@ -0,0 +1,10 @@
+"""
+Chạy bộ đo: python -m benchmarks [--sizes ...] [--json PATH]
+"""
+
+import sys
+
+from .pathfinding import main
+
+if __name__ == '__main__':
+    sys.exit(main())
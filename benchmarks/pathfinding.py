@@ -0,0 +1,343 @@
+"""
+==============================================================================
+BỘ ĐO HIỆU NĂNG TÌM ĐƯỜNG - CHẠY KHÔNG CẦN GIAO DIỆN
+==============================================================================
+
+Mô tả:
+    Sinh các mê cung có seed cố định ở nhiều kích thước (21 đến 1001) bằng
+    MazeGenerator, rồi đo BFS, Dijkstra, A* và chính MazeGenerator.generate
+    ở cả hai chế độ: có ghi trace (record_steps=True) và chế độ nhanh.
+    Mọi solver trong algorithms.registry đều chọn được bằng --algorithms,
+    cùng EllerGenerator (sinh theo từng hàng, chỉ đếm hàng rồi bỏ - bộ nhớ
+    O(width), không có chế độ trace).
+
+Mỗi trường hợp (thuật toán, kích thước, trace) báo:
+    - Thời gian: trung vị / p95 / độ lệch chuẩn của N lần đo
+      (perf_counter_ns, GC tạm tắt, có chạy khởi động - dùng summarize của
+      algorithms.comparison)
+    - Số node đã duyệt (stats['nodes_expanded']; với bộ sinh là số ô đường)
+    - Cấp phát (tracemalloc): bộ nhớ đỉnh và phần còn giữ lại sau một lần
+      chạy riêng, không tính giờ
+    - RSS đỉnh của tiến trình (resource.getrusage, không có trên Windows)
+
+Cô lập:
+    Mặc định mỗi trường hợp chạy trong một tiến trình con mới ("spawn")
+    để RSS đỉnh là của riêng trường hợp đó, không cộng dồn từ các trường
+    hợp trước. --no-isolate chạy tất cả trong tiến trình hiện tại.
+
+Giới hạn:
+    - Mỗi lần chạy có giới hạn thời gian (--timeout, qua CancelToken của
+      solver), để một solver chậm bất thường không chặn cả bộ đo.
+      Quá giờ thì không có số đo thời gian, nhưng vẫn báo cấp phát đỉnh của
+      lần chạy dở
+    - Trace dừng ở MAX_TRACE_STEPS bước để không ăn hết RAM
+
+Kết quả: bảng chữ ra stdout và JSON (--json PATH) để máy đọc.
+==============================================================================
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from models import Maze
+from algorithms import EllerGenerator, MazeGenerator
+from algorithms.comparison import summarize, trace_allocations
+from algorithms.registry import REGISTRY, get_solver
+from algorithms.task_executor import CancelToken, TaskCancelled
+
+# Kích thước mê cung mặc định (số lẻ)
+DEFAULT_SIZES = (21, 51, 101, 201, 501, 1001)
+DEFAULT_SEED = 2024
+DEFAULT_WARMUP = 1
+DEFAULT_REPEATS = 5
+
+# Tên trường hợp đo bộ sinh mê cung; các tên khác là solver trong registry
+GENERATOR = 'MazeGenerator'
+STREAM_GENERATOR = 'EllerGenerator'
+DEFAULT_ALGORITHMS = ('BFS', 'Dijkstra', 'A*', GENERATOR)
+
+# Giới hạn thời gian mỗi lần chạy (giây) và số bước trace tối đa
+DEFAULT_TIMEOUT = 120.0
+MAX_TRACE_STEPS = 500000
+
+
+class TraceLimitExceeded(Exception):
+    """Trace dài quá MAX_TRACE_STEPS bước."""
+
+
+def build_maze(size: int, seed: int) -> Maze:
+    """Sinh mê cung size x size theo seed; start (1, 1), exit góc dưới phải."""
+    grid, _ = MazeGenerator(size, size, seed=seed).generate(record_steps=False)
+    maze = Maze(size, size)
+    maze.set_grid(grid)
+    maze.set_start(1, 1)
+    maze.set_exit(size - 2, size - 2)
+    return maze
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """RSS đỉnh của tiến trình hiện tại (byte), None nếu hệ điều hành không hỗ trợ."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux báo KB, macOS báo byte
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _drain_limited(steps, token) -> None:
+    """Chạy hết iter_steps như drain(), dừng nếu trace vượt MAX_TRACE_STEPS."""
+    for count, _ in enumerate(steps, 1):
+        if count > MAX_TRACE_STEPS:
+            raise TraceLimitExceeded()
+        if token is not None and not count & 1023:
+            token.check()
+
+
+def _make_runner(algorithm: str, size: int, seed: int, record_steps: bool,
+                 timeout: Optional[float]):
+    """
+    Chuẩn bị một lần chạy cho trường hợp cần đo.
+
+    Returns:
+        (run, expanded): run() chạy một lần (ném TaskCancelled nếu quá
+                         timeout giây); expanded() đọc số node đã duyệt của
+                         lần chạy gần nhất
+    """
+    if algorithm == GENERATOR:
+        generated = {}
+
+        def run():
+            generator = MazeGenerator(size, size, seed=seed)
+            generator.cancel_token = CancelToken(timeout) if timeout else None
+            generated['grid'], _ = generator.generate(record_steps=record_steps)
+
+        # Bộ sinh mở mỗi ô đường đúng một lần
+        return run, lambda: generated['grid'].cells.count(0)
+
+    if algorithm == STREAM_GENERATOR:
+        generated = {}
+
+        def run():
+            generator = EllerGenerator(size, size, seed=seed)
+            generator.cancel_token = CancelToken(timeout) if timeout else None
+            # Nhận từng hàng như một consumer (ghi file, vẽ) rồi bỏ đi
+            generated['open'] = sum(row.count(0) for row in generator.iter_rows())
+
+        return run, lambda: generated['open']
+
+    maze = build_maze(size, seed)
+    solver = get_solver(algorithm).create(maze)
+    start, goal = maze.start_pos, maze.exit_pos
+
+    def run():
+        token = solver.cancel_token = CancelToken(timeout) if timeout else None
+        if record_steps:
+            _drain_limited(solver.iter_steps(start, goal), token)
+        else:
+            solver.find_path(start, goal, record_steps=False)
+
+    return run, lambda: solver.stats['nodes_expanded']
+
+
+def run_case(algorithm: str, size: int, record_steps: bool, seed: int = DEFAULT_SEED,
+             warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS,
+             timeout: Optional[float] = DEFAULT_TIMEOUT) -> Dict:
+    """
+    Đo một trường hợp trong tiến trình hiện tại.
+
+    Args:
+        algorithm: Tên solver trong registry, GENERATOR hoặc STREAM_GENERATOR
+        size: Kích thước mê cung (size x size)
+        record_steps: True = ghi trace từng bước
+        seed: Hạt giống sinh mê cung
+        warmup: Số lần chạy khởi động (dựng index CSR, làm nóng cache)
+        repeats: Số lần đo
+        timeout: Giới hạn thời gian mỗi lần chạy (giây, None = không giới hạn)
+
+    Returns:
+        Dict kết quả (xem các khóa trong hàm); 'skipped' khác None nếu bỏ qua,
+        'timed_out' = True nếu quá giờ (không có số đo thời gian)
+    """
+    result = {
+        'algorithm': algorithm,
+        'size': size,
+        'record_steps': record_steps,
+        'seed': seed,
+        'skipped': None,
+        'timed_out': False
+    }
+    if algorithm == STREAM_GENERATOR and record_steps:
+        result['skipped'] = 'Eller không ghi trace từng bước'
+        return result
+
+    run, expanded = _make_runner(algorithm, size, seed, record_steps, timeout)
+    try:
+        for _ in range(warmup):
+            run()
+
+        clock = time.perf_counter_ns
+        samples = []
+        gc_was_enabled = gc.isenabled()
+        try:
+            for _ in range(max(1, repeats)):
+                gc.collect()
+                gc.disable()
+                started = clock()
+                run()
+                samples.append(clock() - started)
+                if gc_was_enabled:
+                    gc.enable()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    except TraceLimitExceeded:
+        result['skipped'] = f'trace vượt {MAX_TRACE_STEPS} bước'
+        return result
+    except TaskCancelled:
+        result['timed_out'] = True
+        result.update(summarize([]))
+        result['nodes_expanded'] = None
+    else:
+        result.update(summarize(samples))
+        result['nodes_expanded'] = expanded()
+
+    # Cấp phát của một lần chạy (không tính giờ, tracemalloc làm chậm nhiều lần).
+    # Quá giờ thì vẫn lấy đỉnh của lần chạy dở (alloc_partial = True)
+    peak, retained, completed = trace_allocations(run, (TaskCancelled, TraceLimitExceeded))
+    result['alloc_partial'] = not completed
+    result['alloc_peak_bytes'] = peak
+    result['alloc_retained_bytes'] = retained
+    result['peak_rss_bytes'] = peak_rss_bytes()
+    return result
+
+
+def _run_case_args(args):
+    """Tác vụ cho Pool: giải nén tham số rồi gọi run_case."""
+    return run_case(*args)
+
+
+def run_suite(algorithms: Sequence[str] = DEFAULT_ALGORITHMS,
+              sizes: Sequence[int] = DEFAULT_SIZES, seed: int = DEFAULT_SEED,
+              warmup: int = DEFAULT_WARMUP, repeats: int = DEFAULT_REPEATS,
+              timeout: Optional[float] = DEFAULT_TIMEOUT, isolate: bool = True,
+              on_result=None) -> List[Dict]:
+    """
+    Đo mọi tổ hợp (kích thước, thuật toán, có / không trace).
+
+    Args:
+        isolate: True = mỗi trường hợp một tiến trình con mới (RSS riêng)
+        on_result: Gọi với từng kết quả ngay khi có (vd in một dòng bảng)
+
+    Returns:
+        Danh sách kết quả theo thứ tự kích thước, thuật toán, trace
+    """
+    cases = [(algorithm, size, record_steps, seed, warmup, repeats, timeout)
+             for size in sizes
+             for algorithm in algorithms
+             for record_steps in (False, True)]
+    results = []
+    if isolate:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes=1, maxtasksperchild=1) as pool:
+            for result in pool.imap(_run_case_args, cases):
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    else:
+        for case in cases:
+            result = run_case(*case)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+# ===== BẢNG KẾT QUẢ =====
+
+TABLE_HEADER = (f'{"Thuật toán":<20} {"Cỡ":>5} {"Trace":>5} {"Trung vị ms":>12} {"p95 ms":>10} '
+                f'{"Node duyệt":>11} {"Cấp phát KB":>12} {"RSS đỉnh MB":>12}')
+
+
+def format_row(result: Dict) -> str:
+    """Một dòng của bảng kết quả."""
+    head = f'{result["algorithm"]:<20} {result["size"]:>5} {"có" if result["record_steps"] else "-":>5}'
+    if result['skipped']:
+        return f'{head} bỏ qua: {result["skipped"]}'
+    rss = result['peak_rss_bytes']
+    rss_text = f'{rss / 2 ** 20:>12.1f}' if rss is not None else f'{"-":>12}'
+    # Lần chạy dở (quá giờ): cấp phát đỉnh là cận dưới
+    alloc_text = ('≥' if result['alloc_partial'] else '') + f'{result["alloc_peak_bytes"] / 1024:.1f}'
+    if result['timed_out']:
+        timing = f'{"quá giờ":>12} {"-":>10} {"-":>11}'
+    else:
+        timing = (f'{result["median_ms"]:>12.3f} {result["p95_ms"]:>10.3f} '
+                  f'{result["nodes_expanded"]:>11}')
+    return f'{head} {timing} {alloc_text:>12} {rss_text}'
+
+
+def _parse_list(text: str, convert=str) -> List:
+    return [convert(item.strip()) for item in text.split(',') if item.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Điểm vào dòng lệnh: in bảng, ghi JSON nếu có --json."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Đo hiệu năng tìm đường / sinh mê cung (không cần giao diện)')
+    parser.add_argument('--sizes', type=lambda text: _parse_list(text, int), default=list(DEFAULT_SIZES),
+                        help='Các kích thước, cách nhau dấu phẩy (mặc định: %(default)s)')
+    parser.add_argument('--algorithms', type=_parse_list, default=list(DEFAULT_ALGORITHMS),
+                        help='Các thuật toán (mặc định: %(default)s); có thể chọn: '
+                             + ', '.join([*REGISTRY, GENERATOR, STREAM_GENERATOR]))
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='Giới hạn giây cho mỗi lần chạy, 0 = không giới hạn (mặc định: %(default)s)')
+    parser.add_argument('--json', metavar='PATH', help='Ghi kết quả JSON ra file ("-" = stdout)')
+    parser.add_argument('--no-isolate', action='store_true',
+                        help='Chạy mọi trường hợp trong tiến trình hiện tại (RSS đỉnh cộng dồn)')
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.algorithms
+               if name not in (GENERATOR, STREAM_GENERATOR) and name not in REGISTRY]
+    if unknown:
+        parser.error(f'thuật toán không hỗ trợ: {", ".join(unknown)}')
+
+    # Khi JSON ra stdout thì bảng ra stderr để không lẫn
+    table = sys.stderr if args.json == '-' else sys.stdout
+    print(TABLE_HEADER, file=table)
+    print('-' * len(TABLE_HEADER), file=table)
+    results = run_suite(args.algorithms, args.sizes, args.seed, args.warmup, args.repeats,
+                        timeout=args.timeout or None, isolate=not args.no_isolate,
+                        on_result=lambda result: print(format_row(result), file=table, flush=True))
+
+    if args.json:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'warmup': args.warmup,
+            'repeats': args.repeats,
+            'timeout': args.timeout or None,
+            'max_trace_steps': MAX_TRACE_STEPS,
+            'isolated': not args.no_isolate,
+            'results': results
+        }
+        if args.json == '-':
+            json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            with open(args.json, 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+    return 0
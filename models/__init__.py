@@ -2,8 +2,15 @@
 Module __init__ cho models package
 """
 
-from .maze import Maze
+from .compact_grid import CompactGrid
+from .bit_grid import BitGrid
+from .adjacency import CSRAdjacency
+from .junction_graph import JunctionGraph
+from .tree_index import TreePathIndex
+from .landmarks import LandmarkTable
+from .cluster_graph import ClusterGraph
+from .maze import GridFingerprint, Maze
 from .player import Player
 from .enemy import Enemy
 
-__all__ = ['Maze', 'Player', 'Enemy']
+__all__ = ['CompactGrid', 'BitGrid', 'CSRAdjacency', 'JunctionGraph', 'TreePathIndex', 'LandmarkTable', 'ClusterGraph', 'GridFingerprint', 'Maze', 'Player', 'Enemy']
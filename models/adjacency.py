@@ -0,0 +1,106 @@
+"""
+==============================================================================
+CSR ADJACENCY - DANH SÁCH KỀ NÉN CỦA ĐỒ THỊ MÊ CUNG
+==============================================================================
+
+Mô tả:
+    Mỗi lần mở rộng một ô, các thuật toán đều phải xét lại 4 hướng và
+    tra tường. Vì cùng một mê cung được tìm đường rất nhiều lần (kẻ địch
+    đuổi, so sánh thuật toán, tìm đường), ta dựng sẵn danh sách kề MỘT LẦN
+    cho mỗi phiên bản lưới.
+
+Định dạng CSR (Compressed Sparse Row):
+    - neighbors: array('i') nối liền các ô kề của mọi node
+    - offsets:   array('i') độ dài size + 1
+    Các ô kề của node u là neighbors[offsets[u]:offsets[u + 1]],
+    theo thứ tự Lên, Phải, Xuống, Trái (giống thứ tự duyệt cũ).
+
+    Node id trùng với CompactGrid.node_id, nên ô tường và viền canh
+    đơn giản là có 0 ô kề.
+
+Độ phức tạp:
+    - Dựng: O(V) thời gian, O(V + E) bộ nhớ
+    - Lấy ô kề của một node: O(bậc) - không kiểm tra biên, không tra tường
+==============================================================================
+"""
+
+from array import array
+
+from .compact_grid import CompactGrid, PATH
+
+
+class CSRAdjacency:
+    """
+    Danh sách kề dạng CSR của một CompactGrid tại một version cố định.
+
+    Attributes:
+        offsets: offsets[u]..offsets[u + 1] là đoạn ô kề của u trong neighbors
+        neighbors: Node id các ô kề, nối liền nhau
+        version: Version của lưới lúc dựng (để kiểm tra còn hợp lệ)
+        edge_count: Số cạnh có hướng (mỗi cạnh vô hướng tính 2 lần)
+    """
+
+    __slots__ = ('offsets', 'neighbors', 'version', 'edge_count')
+
+    def __init__(self, grid: CompactGrid):
+        """
+        Dựng danh sách kề từ lưới.
+
+        Args:
+            grid: CompactGrid nguồn
+        """
+        cells = grid.cells
+        directions = grid.neighbor_offsets
+        offsets = array('i', [0]) * (grid.size + 1)
+        neighbors = array('i')
+        append = neighbors.append
+        stride = grid.stride
+
+        # Chỉ ô bên trong mới có thể là đường đi; các ô viền giữ bậc 0
+        count = 0
+        for node in range(stride + 1, grid.size - stride - 1):
+            offsets[node] = count
+            if cells[node] == PATH:
+                for offset in directions:
+                    if cells[node + offset] == PATH:
+                        append(node + offset)
+                        count += 1
+        for node in range(grid.size - stride - 1, grid.size + 1):
+            offsets[node] = count
+
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.version = grid.version
+        self.edge_count = count
+
+    @classmethod
+    def of(cls, maze, cached: 'CSRAdjacency' = None) -> 'CSRAdjacency':
+        """
+        Lấy danh sách kề của một mê cung.
+
+        Maze tự cache theo version lưới nên dùng lại được giữa các lần
+        tìm đường; với CompactGrid, bản `cached` được dùng lại nếu vẫn
+        cùng version, ngược lại dựng mới.
+
+        Args:
+            maze: Maze, CompactGrid hoặc ma trận list các list
+            cached: Bản dựng trước đó cho CHÍNH lưới này (tùy chọn)
+        """
+        get_adjacency = getattr(maze, 'get_adjacency', None)
+        if get_adjacency is not None:
+            return get_adjacency()
+        grid = CompactGrid.coerce(maze)
+        if cached is not None and cached.version == grid.version:
+            return cached
+        return cls(grid)
+
+    def degree(self, node: int) -> int:
+        """Số ô kề của node."""
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def neighbors_of(self, node: int) -> array:
+        """Các ô kề của node (bản sao nhỏ, dùng ngoài vòng lặp nóng)."""
+        return self.neighbors[self.offsets[node]:self.offsets[node + 1]]
+
+    def __repr__(self) -> str:
+        return f'CSRAdjacency({len(self.offsets) - 1} node, {self.edge_count} cạnh, version={self.version})'
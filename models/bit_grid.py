@@ -0,0 +1,188 @@
+"""
+==============================================================================
+BIT GRID - LƯỚI MÊ CUNG 1 BIT/Ô TRÊN FILE (MMAP)
+==============================================================================
+
+Mô tả:
+    Mê cung rất lớn (10k x 10k = 100 triệu ô) không vừa trong list hay
+    thậm chí CompactGrid (1 byte/ô, 100 MB). BitGrid lưu mỗi ô bằng 1 bit
+    trong một file, mở bằng mmap: hệ điều hành chỉ nạp các trang cần đọc,
+    bộ nhớ của tiến trình không phụ thuộc kích thước mê cung.
+
+Định dạng file:
+    - Header 12 byte: b'MZB1', width, height (uint32 little-endian)
+    - Sau đó là height hàng, mỗi hàng ceil(width / 8) byte
+    - Bit 1 = tường, 0 = đường; bit cao nhất của byte đầu là cột 0
+
+Hàng dạng byte:
+    Các hàm nhận / trả hàng dưới dạng bytes dài width, mỗi byte 0 / 1
+    (giống một hàng của CompactGrid), nên hàng sinh ra có thể ghi thẳng
+    vào file, hoặc chép vào CompactGrid để giải.
+==============================================================================
+"""
+
+import mmap
+import struct
+from typing import Iterator
+
+from .compact_grid import CompactGrid
+
+MAGIC = b'MZB1'
+HEADER = struct.Struct('<4sII')
+
+# bytes 0/1 <-> chữ số '0' / '1' để int() / format() đóng gói bit trong C
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def row_bytes(width: int) -> int:
+    """Số byte của một hàng đã đóng gói."""
+    return (width + 7) >> 3
+
+
+def pack_row(row: bytes) -> bytes:
+    """
+    Đóng gói một hàng 0/1 (1 byte/ô) thành bit.
+
+    Args:
+        row: bytes / bytearray dài width, mỗi byte 0 (đường) hoặc 1 (tường)
+
+    Returns:
+        ceil(width / 8) byte, bit cao trước
+    """
+    width = len(row)
+    if not width:
+        return b''
+    packed = row_bytes(width)
+    value = int(bytes(row).translate(_TO_DIGITS), 2) << (8 * packed - width)
+    return value.to_bytes(packed, 'big')
+
+
+def unpack_row(data: bytes, width: int) -> bytes:
+    """Ngược với pack_row: bit -> bytes 0/1 dài width."""
+    if not width:
+        return b''
+    digits = format(int.from_bytes(data, 'big'), f'0{8 * len(data)}b')
+    return digits[:width].encode('ascii').translate(_FROM_DIGITS)
+
+
+class BitGrid:
+    """
+    Mê cung 1 bit/ô trên file, đọc qua mmap.
+
+    Cách dùng:
+        with BitGrid.open('maze.bits') as bits:
+            bits.is_open(x, y), bits.row(y), bits.to_compact()
+
+    Attributes:
+        width, height: Kích thước mê cung
+        stride: Số byte mỗi hàng (ceil(width / 8))
+    """
+
+    __slots__ = ('width', 'height', 'stride', '_file', '_map')
+
+    def __init__(self, file, buffer, width: int, height: int):
+        """Dùng BitGrid.open(); hàm này chỉ gắn buffer đã mở."""
+        self.width = width
+        self.height = height
+        self.stride = row_bytes(width)
+        self._file = file
+        self._map = buffer
+
+    # ===== GHI / MỞ FILE =====
+
+    @staticmethod
+    def write(path: str, width: int, height: int, rows: Iterator[bytes]) -> int:
+        """
+        Ghi từng hàng vào file ngay khi nhận được (bộ nhớ O(width)).
+
+        Args:
+            path: Đường dẫn file
+            width, height: Kích thước mê cung
+            rows: Các hàng 0/1 theo thứ tự từ trên xuống (vd EllerGenerator.iter_rows())
+
+        Returns:
+            Số byte đã ghi
+
+        Raises:
+            ValueError: Nếu số hàng hoặc độ dài hàng không khớp kích thước
+        """
+        written = 0
+        with open(path, 'wb') as file:
+            written += file.write(HEADER.pack(MAGIC, width, height))
+            count = 0
+            for row in rows:
+                if len(row) != width:
+                    raise ValueError(f'Hàng {count} dài {len(row)}, cần {width}')
+                written += file.write(pack_row(row))
+                count += 1
+            if count != height:
+                raise ValueError(f'Nhận {count} hàng, cần {height}')
+        return written
+
+    @classmethod
+    def open(cls, path: str) -> 'BitGrid':
+        """
+        Mở file bit grid (chỉ đọc) bằng mmap.
+
+        Raises:
+            ValueError: Nếu file không đúng định dạng
+        """
+        file = open(path, 'rb')
+        try:
+            magic, width, height = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f'{path} không phải file bit grid')
+            expected = HEADER.size + row_bytes(width) * height
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(buffer) != expected:
+                buffer.close()
+                raise ValueError(f'{path} dài {len(buffer)} byte, cần {expected}')
+        except (struct.error, ValueError):
+            file.close()
+            raise
+        return cls(file, buffer, width, height)
+
+    def close(self):
+        """Đóng mmap và file."""
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def __enter__(self) -> 'BitGrid':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ===== TRUY XUẤT =====
+
+    def is_open(self, x: int, y: int) -> bool:
+        """Ô (x, y) là đường đi? (ngoài lưới coi như tường)"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        byte = self._map[HEADER.size + y * self.stride + (x >> 3)]
+        return not (byte >> (7 - (x & 7))) & 1
+
+    def row(self, y: int) -> bytes:
+        """Hàng y dạng bytes 0/1 dài width."""
+        start = HEADER.size + y * self.stride
+        return unpack_row(self._map[start:start + self.stride], self.width)
+
+    def rows(self) -> Iterator[bytes]:
+        """Duyệt các hàng từ trên xuống (mỗi lần một hàng)."""
+        for y in range(self.height):
+            yield self.row(y)
+
+    def to_compact(self) -> CompactGrid:
+        """Nạp toàn bộ vào CompactGrid (1 byte/ô) để chạy các solver."""
+        grid = CompactGrid(self.width, self.height)
+        stride, width = grid.stride, self.width
+        for y, row in enumerate(self.rows()):
+            start = (y + 1) * stride + 1
+            grid.cells[start:start + width] = row
+        return grid
+
+    def __repr__(self) -> str:
+        return f'BitGrid({self.width}x{self.height})'
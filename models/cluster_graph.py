@@ -0,0 +1,437 @@
+"""
+==============================================================================
+CLUSTER GRAPH - ĐỒ THỊ TRỪU TƯỢNG CHO HPA* (CHIA MÊ CUNG THÀNH CỤM)
+==============================================================================
+
+Mô tả:
+    Trên mê cung rất lớn (1000x1000), A* phẳng phải mở rộng hàng trăm
+    nghìn ô. HPA* (Hierarchical Pathfinding A*) chia lưới thành các cụm
+    vuông cluster_size x cluster_size và dựng một đồ thị NHỎ:
+    - Lối vào (entrance): trên biên chung của hai cụm kề nhau, mỗi đoạn
+      liên tiếp các cặp ô đi xuyên biên được đại diện bởi 1 cặp ô
+      (đoạn dài >= ENTRANCE_SPLIT thì 2 cặp ở hai đầu)
+    - Nút trừu tượng: ô của lối vào (mỗi ô một nút, dùng chung giữa các biên)
+    - Cạnh liên cụm: giữa hai ô của một lối vào, chi phí = chi phí bước vào
+    - Cạnh nội cụm: khoảng cách ngắn nhất giữa hai nút cùng cụm khi CHỈ
+      đi bên trong cụm (BFS, hoặc Dijkstra nếu có địa hình)
+
+Cập nhật cục bộ:
+    Đồ thị giữ một bản chụp ô / chi phí của lưới. refresh() so sánh bản
+    chụp với lưới hiện tại (so từng hàng bằng memcmp), tìm các cụm có ô
+    đổi, rồi chỉ dựng lại 4 biên và cạnh nội cụm của các cụm đó (cộng
+    cụm hàng xóm nếu tập nút của nó đổi) - không dựng lại toàn bộ.
+
+Lưu trữ:
+    - cell_cluster: array('i') node id ô -> cụm
+    - node_cell, node_cluster: nút trừu tượng -> ô / cụm (-1 = chỗ trống)
+    - edges[u]: dict {v: chi phí u -> v} (cần sửa được khi cập nhật cục bộ)
+
+Độ phức tạp:
+    - Dựng: O(V * số lối vào mỗi cụm)
+    - Cập nhật một cụm: O(cluster_size² * số lối vào của cụm)
+==============================================================================
+"""
+
+import heapq
+import time
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from .compact_grid import CompactGrid, PATH
+
+# Kích thước cụm mặc định (ô)
+DEFAULT_CLUSTER_SIZE = 16
+# Đoạn lối vào dài từ ngưỡng này được đại diện bởi 2 cặp ô ở hai đầu
+ENTRANCE_SPLIT = 6
+
+# Hướng của biên: giữa cụm và cụm bên phải / bên dưới
+_RIGHT = 0
+_DOWN = 1
+
+
+class ClusterGraph:
+    """
+    Đồ thị trừu tượng (cụm + lối vào) của một CompactGrid, cập nhật cục bộ.
+
+    Attributes:
+        cluster_size: Cạnh của mỗi cụm (ô)
+        cluster_cols, cluster_rows: Số cụm theo chiều ngang / dọc
+        cell_cluster: Node id ô -> chỉ số cụm (-1 với viền canh)
+        node_cell, node_cluster: Nút trừu tượng -> node id ô / cụm (-1 = trống)
+        cell_node: Node id ô -> nút trừu tượng
+        cluster_nodes: Cụm -> danh sách nút trừu tượng
+        edges: edges[u] = {v: chi phí đi từ ô của u đến ô của v}
+        build_time: Thời gian dựng ban đầu (giây)
+        version: Version lưới đã đồng bộ
+    """
+
+    def __init__(self, grid: CompactGrid, cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        """
+        Dựng toàn bộ đồ thị trừu tượng.
+
+        Args:
+            grid: CompactGrid nguồn
+            cluster_size: Cạnh của mỗi cụm (ô)
+        """
+        started = time.perf_counter()
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.cluster_cols = -(-grid.width // cluster_size)
+        self.cluster_rows = -(-grid.height // cluster_size)
+
+        stride = grid.stride
+        self.cell_cluster = array('i', [-1]) * grid.size
+        for y in range(grid.height):
+            row = (y + 1) * stride + 1
+            base = (y // cluster_size) * self.cluster_cols
+            for x in range(grid.width):
+                self.cell_cluster[row + x] = base + x // cluster_size
+
+        self.node_cell = []
+        self.node_cluster = []
+        self.edges = []
+        self._refs = []
+        self._free = []
+        self.cell_node = {}
+        self.cluster_nodes = [[] for _ in range(self.cluster_cols * self.cluster_rows)]
+        # (cụm, hướng) -> các cặp nút (phía cụm, phía hàng xóm) của biên đó
+        self._borders = {}
+        # Tổng số ô đã mở rộng bởi các lần tìm trong cụm
+        self.local_expanded = 0
+
+        for cluster in range(len(self.cluster_nodes)):
+            self._set_border(cluster, _RIGHT)
+            self._set_border(cluster, _DOWN)
+        for cluster in range(len(self.cluster_nodes)):
+            self._compute_intra(cluster)
+
+        self._snapshot()
+        self.build_time = time.perf_counter() - started
+        self.updates = 0
+        self.last_update = {'cells_changed': 0, 'clusters_rebuilt': 0, 'time': 0.0}
+
+    # ===== LỐI VÀO =====
+
+    def _neighbor_cluster(self, cluster: int, direction: int) -> int:
+        """Cụm bên phải / bên dưới, -1 nếu ở mép lưới."""
+        col, row = cluster % self.cluster_cols, cluster // self.cluster_cols
+        if direction == _RIGHT:
+            return cluster + 1 if col + 1 < self.cluster_cols else -1
+        return cluster + self.cluster_cols if row + 1 < self.cluster_rows else -1
+
+    def _border_pairs(self, cluster: int, direction: int) -> List[Tuple[int, int]]:
+        """Các cặp ô (trong cụm, bên kia biên) đi xuyên biên được, theo thứ tự dọc biên."""
+        grid, size = self.grid, self.cluster_size
+        col, row = cluster % self.cluster_cols, cluster // self.cluster_cols
+        cells, stride = grid.cells, grid.stride
+        if direction == _RIGHT:
+            x = (col + 1) * size - 1
+            first = (row * size + 1) * stride + x + 1
+            count = min(size, grid.height - row * size)
+            step, across = stride, 1
+        else:
+            y = (row + 1) * size - 1
+            first = (y + 1) * stride + col * size + 1
+            count = min(size, grid.width - col * size)
+            step, across = 1, stride
+
+        pairs = []
+        for i in range(count):
+            inside = first + i * step
+            if cells[inside] == PATH and cells[inside + across] == PATH:
+                pairs.append((inside, inside + across))
+            else:
+                pairs.append(None)
+        return pairs
+
+    def _set_border(self, cluster: int, direction: int) -> Set[int]:
+        """
+        Dựng lại các lối vào trên một biên.
+
+        Returns:
+            Các cụm có tập nút trừu tượng thay đổi
+        """
+        changed = set()
+        for a, b in self._borders.pop((cluster, direction), ()):
+            self.edges[a].pop(b, None)
+            self.edges[b].pop(a, None)
+            for node in (a, b):
+                if self._release(node):
+                    changed.add(self.node_cluster[node])
+        if self._neighbor_cluster(cluster, direction) < 0:
+            return changed
+
+        # Gom các cặp liên tiếp thành đoạn, chọn ô đại diện cho mỗi đoạn
+        chosen, run = [], []
+        for pair in self._border_pairs(cluster, direction) + [None]:
+            if pair is not None:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) >= ENTRANCE_SPLIT:
+                    chosen.extend((run[0], run[-1]))
+                else:
+                    chosen.append(run[len(run) // 2])
+                run = []
+
+        costs = self.grid.edge_costs()
+        entrances = []
+        for inside, outside in chosen:
+            a, created_a = self._acquire(inside)
+            b, created_b = self._acquire(outside)
+            if created_a:
+                changed.add(self.node_cluster[a])
+            if created_b:
+                changed.add(self.node_cluster[b])
+            self.edges[a][b] = costs[outside]
+            self.edges[b][a] = costs[inside]
+            entrances.append((a, b))
+        if entrances:
+            self._borders[(cluster, direction)] = entrances
+        return changed
+
+    def _acquire(self, cell: int) -> Tuple[int, bool]:
+        """Nút trừu tượng của ô (tạo mới nếu chưa có), kèm cờ 'vừa tạo'."""
+        node = self.cell_node.get(cell)
+        if node is not None:
+            self._refs[node] += 1
+            return node, False
+        cluster = self.cell_cluster[cell]
+        if self._free:
+            node = self._free.pop()
+            self.node_cell[node] = cell
+            self.node_cluster[node] = cluster
+            self.edges[node] = {}
+            self._refs[node] = 1
+        else:
+            node = len(self.node_cell)
+            self.node_cell.append(cell)
+            self.node_cluster.append(cluster)
+            self.edges.append({})
+            self._refs.append(1)
+        self.cell_node[cell] = node
+        self.cluster_nodes[cluster].append(node)
+        return node, True
+
+    def _release(self, node: int) -> bool:
+        """Bỏ một lần dùng của nút; xóa nút khi không còn biên nào dùng. True nếu đã xóa."""
+        self._refs[node] -= 1
+        if self._refs[node] > 0:
+            return False
+        for other in self.edges[node]:
+            self.edges[other].pop(node, None)
+        cluster = self.node_cluster[node]
+        self.cluster_nodes[cluster].remove(node)
+        del self.cell_node[self.node_cell[node]]
+        self.edges[node] = {}
+        self.node_cell[node] = -1
+        self._free.append(node)
+        return True
+
+    # ===== CẠNH NỘI CỤM =====
+
+    def _compute_intra(self, cluster: int):
+        """Tính lại khoảng cách giữa mọi cặp nút trừu tượng của cụm."""
+        nodes = self.cluster_nodes[cluster]
+        node_cluster = self.node_cluster
+        for node in nodes:
+            edges = self.edges[node]
+            for other in [other for other in edges if node_cluster[other] == cluster]:
+                del edges[other]
+        if len(nodes) < 2:
+            return
+        cell_node = self.cell_node
+        for node in nodes:
+            distances, _ = self.search(self.node_cell[node], cluster)
+            edges = self.edges[node]
+            for cell, distance in distances.items():
+                other = cell_node.get(cell)
+                if other is not None and other != node and node_cluster[other] == cluster:
+                    edges[other] = distance
+
+    def search(self, source: int, cluster: int, target: int = -1, reverse: bool = False,
+               order: Optional[List[int]] = None) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Tìm đường ngắn nhất CHỈ trong một cụm (BFS, hoặc Dijkstra nếu có địa hình).
+
+        Args:
+            source: Node id ô xuất phát (nằm trong cụm)
+            cluster: Chỉ số cụm
+            target: Dừng sớm khi chốt được ô này (-1 = duyệt hết cụm)
+            reverse: True = khoảng cách TỪ mỗi ô ĐẾN source (chi phí bước vào
+                     tính theo chiều ngược lại)
+            order: Nếu có, nối thêm các ô theo thứ tự được chốt (để ghi trace)
+
+        Returns:
+            (distances, previous): dict node id -> khoảng cách, và ô liền trước
+            trên cây tìm kiếm (theo chiều tìm kiếm)
+        """
+        grid = self.grid
+        cells, cell_cluster = grid.cells, self.cell_cluster
+        offsets = grid.neighbor_offsets
+        costs = grid.edge_costs()
+        distances = {source: 0}
+        previous = {}
+        expanded = 0
+
+        if not grid.weighted:
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                expanded += 1
+                if order is not None:
+                    order.append(current)
+                if current == target:
+                    break
+                next_dist = distances[current] + 1
+                for offset in offsets:
+                    neighbor = current + offset
+                    if (cells[neighbor] == PATH and cell_cluster[neighbor] == cluster
+                            and neighbor not in distances):
+                        distances[neighbor] = next_dist
+                        previous[neighbor] = current
+                        queue.append(neighbor)
+            self.local_expanded += expanded
+            return distances, previous
+
+        heap = [(0, source)]
+        done = set()
+        while heap:
+            current_dist, current = heapq.heappop(heap)
+            if current in done:
+                continue
+            done.add(current)
+            expanded += 1
+            if order is not None:
+                order.append(current)
+            if current == target:
+                break
+            for offset in offsets:
+                neighbor = current + offset
+                if cells[neighbor] != PATH or cell_cluster[neighbor] != cluster or neighbor in done:
+                    continue
+                tentative = current_dist + (costs[current] if reverse else costs[neighbor])
+                old = distances.get(neighbor)
+                if old is None or tentative < old:
+                    distances[neighbor] = tentative
+                    previous[neighbor] = current
+                    heapq.heappush(heap, (tentative, neighbor))
+        # Chỉ giữ các ô đã chốt (khoảng cách chắc chắn ngắn nhất)
+        self.local_expanded += expanded
+        return {cell: distances[cell] for cell in done}, previous
+
+    # ===== CẬP NHẬT CỤC BỘ =====
+
+    def _snapshot(self):
+        """Chụp lại ô và chi phí của lưới để refresh() tìm phần đã đổi."""
+        grid = self.grid
+        self._cells = bytes(grid.cells)
+        self._costs = bytes(grid.edge_costs())
+        self.version = grid.version
+
+    def _changed_cells(self) -> List[int]:
+        """Node id các ô có giá trị hoặc chi phí khác bản chụp (so theo hàng)."""
+        grid = self.grid
+        stride = grid.stride
+        cells, costs = grid.cells, grid.edge_costs()
+        old_cells, old_costs = self._cells, self._costs
+        changed = []
+        for row in range(0, grid.size, stride):
+            end = row + stride
+            if cells[row:end] != old_cells[row:end] or costs[row:end] != old_costs[row:end]:
+                changed.extend(node for node in range(row, end)
+                               if cells[node] != old_cells[node] or costs[node] != old_costs[node])
+        return changed
+
+    def refresh(self) -> bool:
+        """
+        Đồng bộ với lưới sau khi ô / chi phí bị sửa, chỉ dựng lại các cụm bị ảnh hưởng.
+
+        Returns:
+            True nếu có cụm được dựng lại
+        """
+        grid = self.grid
+        if self.version == grid.version:
+            return False
+        started = time.perf_counter()
+        changed = self._changed_cells()
+        dirty = {self.cell_cluster[node] for node in changed if self.cell_cluster[node] >= 0}
+
+        rebuild = set(dirty)
+        cols = self.cluster_cols
+        for cluster in dirty:
+            # 4 biên của cụm: phải / dưới của nó, phải của cụm trái, dưới của cụm trên
+            rebuild |= self._set_border(cluster, _RIGHT)
+            rebuild |= self._set_border(cluster, _DOWN)
+            if cluster % cols:
+                rebuild |= self._set_border(cluster - 1, _RIGHT)
+            if cluster >= cols:
+                rebuild |= self._set_border(cluster - cols, _DOWN)
+        for cluster in rebuild:
+            self._compute_intra(cluster)
+
+        self._snapshot()
+        self.updates += 1
+        self.last_update = {
+            'cells_changed': len(changed),
+            'clusters_rebuilt': len(rebuild),
+            'time': time.perf_counter() - started
+        }
+        return bool(rebuild)
+
+    @classmethod
+    def of(cls, maze, cluster_size: int = DEFAULT_CLUSTER_SIZE,
+           cached: 'ClusterGraph' = None) -> 'ClusterGraph':
+        """
+        Lấy đồ thị cụm của một mê cung.
+
+        Maze tự cache và cập nhật cục bộ; với CompactGrid, bản `cached`
+        của CHÍNH lưới đó được refresh() thay vì dựng mới.
+
+        Args:
+            maze: Maze, CompactGrid hoặc ma trận list các list
+            cluster_size: Cạnh của mỗi cụm
+            cached: Bản dựng trước đó (tùy chọn)
+        """
+        get_cluster_graph = getattr(maze, 'get_cluster_graph', None)
+        if get_cluster_graph is not None:
+            return get_cluster_graph(cluster_size)
+        grid = CompactGrid.coerce(maze)
+        if cached is not None and cached.grid is grid and cached.cluster_size == cluster_size:
+            cached.refresh()
+            return cached
+        return cls(grid, cluster_size)
+
+    # ===== TRA CỨU =====
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_cell) - len(self._free)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self.edges)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Số cụm / nút / cạnh, thời gian dựng và lần cập nhật cục bộ gần nhất."""
+        return {
+            'clusters': len(self.cluster_nodes),
+            'cluster_size': self.cluster_size,
+            'abstract_nodes': self.node_count,
+            'abstract_edges': self.edge_count,
+            'cluster_build_time': self.build_time,
+            'cluster_updates': self.updates,
+            'clusters_rebuilt': self.last_update['clusters_rebuilt'],
+            'cluster_update_time': self.last_update['time']
+        }
+
+    def cluster_of(self, cell: int) -> Optional[int]:
+        """Cụm chứa ô (None với viền canh)."""
+        cluster = self.cell_cluster[cell]
+        return cluster if cluster >= 0 else None
+
+    def __repr__(self) -> str:
+        return (f'ClusterGraph({len(self.cluster_nodes)} cụm, {self.node_count} nút, '
+                f'{self.build_time * 1000:.1f} ms, version={self.version})')
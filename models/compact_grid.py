@@ -0,0 +1,280 @@
+"""
+==============================================================================
+COMPACT GRID - LƯỚI MÊ CUNG DẠNG MẢNG PHẲNG
+==============================================================================
+
+Mô tả:
+    Biểu diễn mê cung bằng MỘT bytearray phẳng theo thứ tự hàng
+    (row-major) thay cho list các list số nguyên Python.
+    - 0: Đường đi
+    - 1: Tường
+
+Viền canh (sentinel border):
+    Lưới được bọc thêm 1 ô tường ở cả 4 phía. Nhờ vậy khi duyệt 4 ô kề
+    KHÔNG cần kiểm tra biên: ô ngoài mê cung luôn là tường.
+
+        stride = width + 2
+        node_id(x, y) = (y + 1) * stride + (x + 1)
+
+    4 ô kề của node u: u - stride (lên), u + 1 (phải),
+                       u + stride (xuống), u - 1 (trái)
+
+Lợi ích:
+    - 1 byte/ô thay vì ~8 byte con trỏ + list mỗi hàng
+    - Các thuật toán làm việc trên số nguyên (node id) và mảng
+      array('i') cho distances/previous thay vì dict khóa tuple
+
+Địa hình (chi phí ô):
+    costs: bytearray SONG SONG với cells (cùng node id), costs[v] = chi phí
+    bước VÀO ô v (1 = đường thường, lớn hơn = bùn, nước...). Chỉ được cấp
+    phát ở lần set_cost() đầu tiên; mê cung chưa có địa hình giữ costs = None
+    và edge_costs() trả về một bảng toàn 1 dùng chung.
+
+Tương thích:
+    grid[y][x], len(grid), len(grid[0]) và duyệt từng hàng vẫn dùng được
+    (mỗi hàng là memoryview CHỈ ĐỌC). Muốn sửa ô phải gọi set(), để
+    version luôn tăng khi lưới thay đổi.
+==============================================================================
+"""
+
+import hashlib
+from typing import Iterator, List, Sequence, Tuple
+
+WALL = 1
+PATH = 0
+
+# Chi phí bước vào một ô: mặc định 1, tối đa 255 (vừa một byte)
+DEFAULT_COST = 1
+MAX_COST = 255
+
+
+class CompactGrid:
+    """
+    Lưới mê cung bytearray có viền canh và node id số nguyên.
+
+    Attributes:
+        width, height: Kích thước mê cung (không tính viền)
+        stride: Số byte mỗi hàng (width + 2)
+        size: Tổng số ô kể cả viền (dùng làm kích thước mảng phụ)
+        cells: bytearray lưu giá trị từng ô (0 = đường, 1 = tường)
+        version: Tăng mỗi khi có ô bị sửa (kể cả đổi chi phí)
+        costs: bytearray chi phí theo node id, hoặc None nếu mọi ô chi phí 1
+    """
+
+    __slots__ = ('width', 'height', 'stride', 'size', 'cells', 'version', 'neighbor_offsets',
+                 'costs', '_unit_costs', '_cost_range')
+
+    def __init__(self, width: int, height: int, fill: int = WALL):
+        """
+        Tạo lưới kích thước width x height.
+
+        Args:
+            width: Số cột
+            height: Số hàng
+            fill: Giá trị khởi tạo các ô bên trong (mặc định tường)
+        """
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.size = self.stride * (height + 2)
+        self.cells = bytearray([WALL]) * self.size
+        if fill != WALL:
+            interior = bytes([fill]) * width
+            for y in range(height):
+                start = (y + 1) * self.stride + 1
+                self.cells[start:start + width] = interior
+        self.version = 0
+        self.costs = None
+        self._unit_costs = None
+        self._cost_range = None
+        # Độ lệch id của 4 ô kề: Lên, Phải, Xuống, Trái
+        self.neighbor_offsets = (-self.stride, 1, self.stride, -1)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> 'CompactGrid':
+        """Tạo lưới từ ma trận list các list (0 = đường, 1 = tường)."""
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        grid = cls(width, height)
+        stride = grid.stride
+        for y, row in enumerate(rows):
+            start = (y + 1) * stride + 1
+            grid.cells[start:start + width] = bytes(row)
+        return grid
+
+    @classmethod
+    def coerce(cls, maze) -> 'CompactGrid':
+        """
+        Chuyển mọi dạng mê cung về CompactGrid (không sao chép nếu đã là).
+
+        Args:
+            maze: CompactGrid, đối tượng có thuộc tính grid (Maze)
+                  hoặc ma trận list các list
+        """
+        if isinstance(maze, cls):
+            return maze
+        grid = getattr(maze, 'grid', None)
+        if isinstance(grid, cls):
+            return grid
+        return cls.from_rows(maze)
+
+    # ===== NODE ID =====
+
+    def node_id(self, x: int, y: int) -> int:
+        """Tọa độ (x, y) -> node id trong mảng phẳng."""
+        return (y + 1) * self.stride + x + 1
+
+    def coords(self, node: int) -> Tuple[int, int]:
+        """Node id -> tọa độ (x, y)."""
+        y, x = divmod(node, self.stride)
+        return (x - 1, y - 1)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Kiểm tra (x, y) nằm trong mê cung (không tính viền)."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    # ===== TRUY CẬP Ô =====
+
+    def get(self, x: int, y: int) -> int:
+        """Giá trị ô (x, y); ngoài biên được coi là tường."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[(y + 1) * self.stride + x + 1]
+        return WALL
+
+    def is_open(self, x: int, y: int) -> bool:
+        """True nếu (x, y) trong biên và là đường đi."""
+        return (0 <= x < self.width and 0 <= y < self.height and
+                self.cells[(y + 1) * self.stride + x + 1] == PATH)
+
+    def set(self, x: int, y: int, value: int):
+        """
+        Sửa giá trị một ô và tăng version.
+
+        Raises:
+            IndexError: Nếu (x, y) nằm ngoài mê cung
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f'Ô ({x}, {y}) nằm ngoài mê cung {self.width}x{self.height}')
+        node = (y + 1) * self.stride + x + 1
+        if self.cells[node] != value:
+            self.cells[node] = value
+            self.version += 1
+
+    # ===== ĐỊA HÌNH =====
+
+    def set_cost(self, x: int, y: int, cost: int):
+        """
+        Đặt chi phí bước vào ô (x, y) và tăng version.
+
+        Raises:
+            IndexError: Nếu (x, y) nằm ngoài mê cung
+            ValueError: Nếu cost không nằm trong [1, MAX_COST]
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f'Ô ({x}, {y}) nằm ngoài mê cung {self.width}x{self.height}')
+        if not DEFAULT_COST <= cost <= MAX_COST:
+            raise ValueError(f'Chi phí ô phải trong [{DEFAULT_COST}, {MAX_COST}], nhận {cost}')
+        if self.costs is None:
+            if cost == DEFAULT_COST:
+                return
+            self.costs = bytearray([DEFAULT_COST]) * self.size
+        node = (y + 1) * self.stride + x + 1
+        if self.costs[node] != cost:
+            self.costs[node] = cost
+            self.version += 1
+
+    def get_cost(self, x: int, y: int) -> int:
+        """Chi phí bước vào ô (x, y)."""
+        if self.costs is None:
+            return DEFAULT_COST
+        return self.costs[(y + 1) * self.stride + x + 1]
+
+    @property
+    def weighted(self) -> bool:
+        """Mê cung có ô chi phí khác 1 (không còn là đồ thị trọng số đều)."""
+        return self.cost_range()[1] > DEFAULT_COST
+
+    def edge_costs(self) -> bytearray:
+        """
+        Bảng chi phí theo node id cho vòng lặp của thuật toán.
+
+        Trọng số cạnh u -> v là edge_costs()[v]. Chưa có địa hình thì trả về
+        bảng toàn 1 (cấp phát một lần cho mỗi lưới).
+        """
+        if self.costs is not None:
+            return self.costs
+        if self._unit_costs is None:
+            self._unit_costs = bytearray([DEFAULT_COST]) * self.size
+        return self._unit_costs
+
+    def cost_range(self) -> Tuple[int, int]:
+        """
+        (chi phí nhỏ nhất, lớn nhất) trên các ô đường đi, cache theo version.
+
+        Chi phí nhỏ nhất dùng để nhân heuristic (vẫn admissible), chi phí
+        lớn nhất quyết định số bucket của hàng đợi Dial.
+        """
+        if self.costs is None:
+            return (DEFAULT_COST, DEFAULT_COST)
+        cached = self._cost_range
+        if cached is None or cached[0] != self.version:
+            open_costs = [cost for cell, cost in zip(self.cells, self.costs) if cell == PATH]
+            bounds = (min(open_costs), max(open_costs)) if open_costs else (DEFAULT_COST, DEFAULT_COST)
+            cached = self._cost_range = (self.version, bounds)
+        return cached[1]
+
+    def path_cost(self, path: Sequence[Tuple[int, int]]) -> int:
+        """Tổng chi phí đi theo path (không tính ô xuất phát)."""
+        if self.costs is None:
+            return max(0, len(path) - 1)
+        return sum(self.get_cost(x, y) for x, y in path[1:])
+
+    def digest(self) -> str:
+        """
+        Băm nội dung lưới (kích thước + toàn bộ ô + địa hình), dùng làm khóa cache.
+
+        Hai lưới cùng nội dung cho cùng digest dù là hai đối tượng khác nhau.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f'{self.width}x{self.height}:'.encode())
+        hasher.update(self.cells)
+        if self.weighted:
+            hasher.update(self.costs)
+        return hasher.hexdigest()
+
+    def open_count(self) -> int:
+        """Số ô đường đi (viền luôn là tường nên không ảnh hưởng)."""
+        return self.cells.count(PATH)
+
+    # ===== TƯƠNG THÍCH VỚI MA TRẬN 2D =====
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        """Hàng y dưới dạng memoryview chỉ đọc, để dùng grid[y][x]."""
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError(y)
+        start = (y + 1) * self.stride + 1
+        return memoryview(self.cells)[start:start + self.width].toreadonly()
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for y in range(self.height):
+            yield self[y]
+
+    def to_list(self) -> List[List[int]]:
+        """Xuất ra ma trận list các list (để lưu JSON)."""
+        return [list(row) for row in self]
+
+    def copy(self) -> 'CompactGrid':
+        """Bản sao độc lập (chung kích thước, version bắt đầu lại từ 0)."""
+        grid = CompactGrid(self.width, self.height)
+        grid.cells[:] = self.cells
+        if self.costs is not None:
+            grid.costs = bytearray(self.costs)
+        return grid
+
+    def __repr__(self) -> str:
+        return f'CompactGrid({self.width}x{self.height}, version={self.version})'
@@ -9,6 +9,9 @@ Mô tả:
 
 Tích hợp thuật toán:
     - BFS (Breadth-First Search): Tìm đường ngắn nhất đến người chơi
+    - TreePathIndex: Mê cung không có chu trình thì tra bước đi bằng LCA
+      trong O(log V); mê cung có vòng thì đi theo FlowField (bản đồ khoảng
+      cách BFS gốc tại người chơi, tra bước xuống dốc O(1))
     - Được gọi mỗi khi kẻ địch cần di chuyển
 
 Đặc điểm AI:
@@ -105,24 +108,31 @@ class Enemy:
             return self.current_path[1]
         return None
     
-    def update_ai(self, player_pos: Tuple[int, int], pathfinder) -> bool:
+    def update_ai(self, player_pos: Tuple[int, int], pathfinder, tree_index=None) -> bool:
         """
         Cập nhật AI và di chuyển về phía người chơi.
         
         Quy trình:
-            1. Gọi pathfinder (BFS) để tìm đường đến người chơi
+            1. Tra bước đi trên TreePathIndex (nếu mê cung không có chu trình),
+               ngược lại gọi pathfinder (BFS) để tìm đường đến người chơi
             2. Lấy bước đi tiếp theo
             3. Thực hiện di chuyển
         
         Args:
             player_pos: Vị trí hiện tại của người chơi (x, y)
-            pathfinder: Thuật toán tìm đường (BFS)
+            pathfinder: Thuật toán tìm đường có get_next_move (FlowField, BFS)
+            tree_index: TreePathIndex của mê cung (Maze.get_tree_index()),
+                None nếu mê cung có chu trình
             
         Returns:
             True nếu di chuyển thành công
         """
-        # Gọi BFS để tìm đường ngắn nhất đến người chơi
-        next_move = pathfinder.get_next_move(self.get_position(), player_pos)
+        if tree_index is not None:
+            # Mê cung là cây: đường đi duy nhất, tra bằng LCA
+            next_move = tree_index.next_step(self.get_position(), player_pos)
+        else:
+            # Hỏi pathfinder (FlowField / BFS) bước đi ngắn nhất đến người chơi
+            next_move = pathfinder.get_next_move(self.get_position(), player_pos)
         
         if next_move:
             # Di chuyển đến vị trí tiếp theo
@@ -0,0 +1,255 @@
+"""
+==============================================================================
+JUNCTION GRAPH - ĐỒ THỊ NÚT GIAO (THU GỌN HÀNH LANG)
+==============================================================================
+
+Mô tả:
+    Mê cung sinh bởi Backtracking chủ yếu là các hành lang rộng 1 ô.
+    Ô có đúng 2 ô kề thì không có lựa chọn nào: đi vào từ một phía
+    là phải ra phía kia. Vì vậy ta thu gọn mỗi hành lang thành MỘT
+    CẠNH có trọng số nối hai "nút":
+    - Nút: ô đường đi có số ô kề khác 2 (ngã ba, ngã tư, ngõ cụt)
+    - Cạnh: chuỗi ô bậc 2 giữa hai nút, trọng số = số bước đi
+
+    Vòng kín toàn ô bậc 2 (không có ngã rẽ) được gắn một nút đại diện
+    để mọi ô đường đi đều thuộc về một nút hoặc một cạnh.
+
+Bảng tra ô -> cạnh:
+    - cell_junction[v]: chỉ số nút của ô v (-1 nếu v nằm giữa hành lang)
+    - cell_edge[v], cell_pos[v]: cạnh chứa ô v và vị trí của v trong
+      danh sách ô của cạnh (tính từ đầu edge_u)
+    => Một ô bất kỳ được "neo" vào 1 nút hoặc 2 đầu của 1 cạnh trong O(1)
+
+Lưu trữ:
+    Toàn bộ dùng array('i') phẳng; danh sách kề của đồ thị nút dạng CSR
+    (junction_offsets, junction_targets, junction_edges).
+
+Độ phức tạp:
+    - Dựng: O(V) - mỗi ô hành lang được đi qua đúng một lần
+    - Bộ nhớ: O(V) cho bảng tra, O(J + E) cho đồ thị nút
+==============================================================================
+"""
+
+from array import array
+from typing import List, Tuple
+
+from .adjacency import CSRAdjacency
+from .compact_grid import CompactGrid, PATH
+
+
+class JunctionGraph:
+    """
+    Đồ thị nút giao của một CompactGrid tại một version cố định.
+
+    Attributes:
+        junction_count: Số nút
+        junction_cells: junction -> node id ô lưới
+        edge_u, edge_v: Hai đầu (chỉ số nút) của mỗi cạnh
+        edge_weight: Số bước đi từ edge_u đến edge_v
+        edge_offsets, edge_cells: Các ô giữa của cạnh e (theo thứ tự từ edge_u)
+            là edge_cells[edge_offsets[e]:edge_offsets[e + 1]]
+        cell_junction, cell_edge, cell_pos: Bảng tra theo node id ô lưới
+        junction_offsets, junction_targets, junction_edges: CSR của đồ thị nút
+        version: Version lưới lúc dựng
+    """
+
+    def __init__(self, grid: CompactGrid, adjacency: CSRAdjacency = None):
+        """
+        Dựng đồ thị nút từ lưới.
+
+        Args:
+            grid: CompactGrid nguồn
+            adjacency: Danh sách kề CSR của grid (dựng mới nếu không truyền)
+        """
+        if adjacency is None or adjacency.version != grid.version:
+            adjacency = CSRAdjacency(grid)
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        cells = grid.cells
+        size = grid.size
+
+        # ===== BƯỚC 1: CHỌN NÚT (ô đường đi có bậc khác 2) =====
+        cell_junction = array('i', [-1]) * size
+        junction_cells = array('i')
+        for node in range(size):
+            if cells[node] == PATH and offsets[node + 1] - offsets[node] != 2:
+                cell_junction[node] = len(junction_cells)
+                junction_cells.append(node)
+
+        # ===== BƯỚC 2: ĐI DỌC HÀNH LANG TỪ MỖI NÚT =====
+        self.cell_edge = array('i', [-1]) * size
+        self.cell_pos = array('i', [-1]) * size
+        self.cell_junction = cell_junction
+        self.junction_cells = junction_cells
+        self.edge_u = array('i')
+        self.edge_v = array('i')
+        self.edge_weight = array('i')
+        self.edge_offsets = array('i', [0])
+        self.edge_cells = array('i')
+        self._offsets, self._neighbors = offsets, neighbors
+
+        for junction in range(len(junction_cells)):
+            self._walk_corridors(junction)
+
+        # ===== BƯỚC 3: VÒNG KÍN KHÔNG CÓ NÚT =====
+        # Các ô bậc 2 chưa thuộc cạnh nào nằm trên một vòng kín:
+        # chọn ô đầu tiên làm nút đại diện rồi đi hết vòng
+        for node in range(size):
+            if cells[node] == PATH and cell_junction[node] < 0 and self.cell_edge[node] < 0:
+                cell_junction[node] = len(junction_cells)
+                junction_cells.append(node)
+                self._walk_corridors(cell_junction[node])
+        del self._offsets, self._neighbors
+
+        # ===== BƯỚC 4: CSR CỦA ĐỒ THỊ NÚT =====
+        self.junction_count = len(junction_cells)
+        self._build_junction_csr()
+        self.version = grid.version
+        self.stride = grid.stride
+
+    def _walk_corridors(self, junction: int):
+        """Đi từ nút theo từng hướng đến nút kế tiếp, ghi lại các cạnh mới."""
+        offsets, neighbors = self._offsets, self._neighbors
+        cell_junction, cell_edge, cell_pos = self.cell_junction, self.cell_edge, self.cell_pos
+        start = self.junction_cells[junction]
+
+        for first in neighbors[offsets[start]:offsets[start + 1]]:
+            if cell_junction[first] >= 0:
+                # Hai nút kề nhau: cạnh độ dài 1, chỉ ghi một lần (từ nút có chỉ số nhỏ)
+                if junction < cell_junction[first]:
+                    self._add_edge(junction, cell_junction[first], [])
+                continue
+            if cell_edge[first] >= 0:
+                continue  # Hành lang này đã được đi từ đầu bên kia
+
+            corridor = []
+            previous, current = start, first
+            while cell_junction[current] < 0:
+                corridor.append(current)
+                a, b = neighbors[offsets[current]:offsets[current + 1]]
+                previous, current = current, (b if a == previous else a)
+            edge = self._add_edge(junction, cell_junction[current], corridor)
+            for position, cell in enumerate(corridor):
+                cell_edge[cell] = edge
+                cell_pos[cell] = position
+
+    def _add_edge(self, u: int, v: int, corridor: List[int]) -> int:
+        """Thêm cạnh u -> v với các ô giữa `corridor`, trả về chỉ số cạnh."""
+        edge = len(self.edge_u)
+        self.edge_u.append(u)
+        self.edge_v.append(v)
+        self.edge_weight.append(len(corridor) + 1)
+        self.edge_cells.extend(corridor)
+        self.edge_offsets.append(len(self.edge_cells))
+        return edge
+
+    def _build_junction_csr(self):
+        """Dựng danh sách kề CSR (hai chiều) của đồ thị nút, bỏ cạnh tự vòng."""
+        count = self.junction_count
+        degree = array('i', [0]) * (count + 1)
+        for u, v in zip(self.edge_u, self.edge_v):
+            if u != v:
+                degree[u] += 1
+                degree[v] += 1
+
+        offsets = array('i', [0]) * (count + 1)
+        total = 0
+        for junction in range(count):
+            offsets[junction] = total
+            total += degree[junction]
+        offsets[count] = total
+
+        targets = array('i', [0]) * total
+        edges = array('i', [0]) * total
+        fill = array('i', offsets)
+        for edge, (u, v) in enumerate(zip(self.edge_u, self.edge_v)):
+            if u == v:
+                continue
+            targets[fill[u]], edges[fill[u]] = v, edge
+            fill[u] += 1
+            targets[fill[v]], edges[fill[v]] = u, edge
+            fill[v] += 1
+
+        self.junction_offsets = offsets
+        self.junction_targets = targets
+        self.junction_edges = edges
+
+    @classmethod
+    def of(cls, maze, cached: 'JunctionGraph' = None) -> 'JunctionGraph':
+        """
+        Lấy đồ thị nút của một mê cung.
+
+        Maze tự cache theo version lưới; với CompactGrid, bản `cached`
+        được dùng lại nếu vẫn cùng version, ngược lại dựng mới.
+
+        Args:
+            maze: Maze, CompactGrid hoặc ma trận list các list
+            cached: Bản dựng trước đó cho CHÍNH lưới này (tùy chọn)
+        """
+        get_junction_graph = getattr(maze, 'get_junction_graph', None)
+        if get_junction_graph is not None:
+            return get_junction_graph()
+        grid = CompactGrid.coerce(maze)
+        if cached is not None and cached.version == grid.version:
+            return cached
+        return cls(grid)
+
+    # ===== TRA CỨU =====
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_u)
+
+    def anchors(self, cell: int) -> List[Tuple[int, int]]:
+        """
+        Các nút mà ô `cell` có thể đi tới trực tiếp, kèm số bước.
+
+        - Ô là nút: [(nút, 0)]
+        - Ô giữa hành lang e: [(edge_u, pos + 1), (edge_v, weight - pos - 1)]
+          (hành lang tự vòng về cùng một nút: chỉ giữ phía gần hơn)
+        - Ô tường: []
+        """
+        junction = self.cell_junction[cell]
+        if junction >= 0:
+            return [(junction, 0)]
+        edge = self.cell_edge[cell]
+        if edge < 0:
+            return []
+        back = self.cell_pos[cell] + 1
+        ahead = self.edge_weight[edge] - back
+        if self.edge_u[edge] == self.edge_v[edge]:
+            return [(self.edge_u[edge], min(back, ahead))]
+        return [(self.edge_u[edge], back), (self.edge_v[edge], ahead)]
+
+    def corridor(self, edge: int, from_junction: int) -> List[int]:
+        """Các ô giữa của cạnh, theo chiều đi ra từ from_junction."""
+        cells = list(self.edge_cells[self.edge_offsets[edge]:self.edge_offsets[edge + 1]])
+        if from_junction != self.edge_u[edge]:
+            cells.reverse()
+        return cells
+
+    def walk_to_junction(self, cell: int, junction: int) -> List[int]:
+        """
+        Các ô từ `cell` (không tính) đi dọc hành lang đến nút `junction` (có tính).
+
+        Nếu cell là chính nút đó thì trả về []. Với hành lang tự vòng,
+        đi theo phía ngắn hơn (khớp với anchors()).
+        """
+        if self.cell_junction[cell] == junction:
+            return []
+        edge = self.cell_edge[cell]
+        first, last = self.edge_offsets[edge], self.edge_offsets[edge + 1]
+        position = self.cell_pos[cell]
+        if self.edge_u[edge] == self.edge_v[edge]:
+            backward = position + 1 <= self.edge_weight[edge] - position - 1
+        else:
+            backward = junction == self.edge_u[edge]
+        if backward:
+            cells = list(self.edge_cells[first:first + position])
+            cells.reverse()
+        else:
+            cells = list(self.edge_cells[first + position + 1:last])
+        cells.append(self.junction_cells[junction])
+        return cells
+
+    def __repr__(self) -> str:
+        return f'JunctionGraph({self.junction_count} nút, {self.edge_count} cạnh, version={self.version})'
@@ -0,0 +1,250 @@
+"""
+==============================================================================
+LANDMARK TABLE - BẢNG KHOẢNG CÁCH TỪ CÁC MỐC CHO HEURISTIC ALT
+==============================================================================
+
+Mô tả:
+    Trong mê cung, Manhattan là heuristic rất yếu: tường bắt đi vòng xa,
+    nên A* duyệt gần bằng Dijkstra. ALT (A*, Landmarks, Triangle
+    inequality) chọn trước k ô "mốc" L và tính sẵn d(L, v) cho mọi ô v.
+    Theo bất đẳng thức tam giác:
+
+        d(n, goal) >= d(L, goal) - d(L, n)
+        d(n, goal) >= d(n, L) - d(goal, L)
+
+    => h(n) = max theo L của hai cận trên - admissible và consistent.
+
+Chi phí địa hình:
+    Trọng số là chi phí BƯỚC VÀO ô nên d(n, L) = d(L, n) + c(L) - c(n)
+    (đi ngược cùng đường: tính ô n thay cho ô L). Chỉ cần MỘT bảng d(L, .)
+    cho mỗi mốc; cận thứ hai thành d(L, n) - d(L, goal) + c(goal) - c(n).
+    Không có địa hình thì h(n) = max |d(L, goal) - d(L, n)|.
+
+Chọn mốc (farthest-point):
+    - Mốc đầu: ô xa nhất tính từ một ô đường đi bất kỳ
+    - Mốc tiếp theo: ô có khoảng cách nhỏ nhất tới các mốc đã chọn là
+      LỚN NHẤT; ô chưa tới được từ mốc nào (vùng liên thông khác) được
+      ưu tiên trước
+    Mốc nằm ở "rìa" mê cung nên cận tam giác sát với khoảng cách thật.
+
+Lưu trữ:
+    Mỗi mốc một array('i') theo node id (-1 = không tới được), tức
+    4 * k * V byte. Thời gian chọn mốc và dựng bảng được ghi lại để
+    chia đều cho số truy vấn dùng bảng.
+
+Độ phức tạp:
+    - Dựng: k lần BFS (Dijkstra nếu có địa hình) - O(k (V + E))
+    - Heuristic mỗi ô: O(k)
+==============================================================================
+"""
+
+import heapq
+import time
+from array import array
+from collections import deque
+from typing import Callable, Dict, List
+
+from .adjacency import CSRAdjacency
+from .compact_grid import CompactGrid, PATH
+
+# Số mốc mặc định: đủ để cận sát trên mê cung vừa, bảng vẫn nhỏ
+DEFAULT_LANDMARKS = 8
+
+# Khoảng cách "chưa tới được" khi chọn mốc (lớn hơn mọi khoảng cách thật)
+_UNREACHED = 2 ** 31 - 1
+
+
+class LandmarkTable:
+    """
+    Bảng khoảng cách từ k mốc của một CompactGrid tại một version cố định.
+
+    Attributes:
+        landmarks: Node id của các mốc (theo thứ tự chọn)
+        tables: tables[i][v] = d(landmarks[i], v), -1 nếu không tới được
+        select_time: Thời gian chọn mốc (giây)
+        build_time: Thời gian dựng bảng khoảng cách (giây)
+        queries: Số truy vấn đã dùng bảng (để chia đều chi phí dựng)
+        version: Version lưới lúc dựng
+    """
+
+    def __init__(self, grid: CompactGrid, count: int = DEFAULT_LANDMARKS,
+                 adjacency: CSRAdjacency = None):
+        """
+        Chọn mốc và dựng bảng khoảng cách.
+
+        Args:
+            grid: CompactGrid nguồn
+            count: Số mốc cần chọn (ít hơn nếu mê cung có ít ô đường đi)
+            adjacency: Danh sách kề CSR của grid (dựng mới nếu không truyền)
+        """
+        if adjacency is None or adjacency.version != grid.version:
+            adjacency = CSRAdjacency(grid)
+        self.grid = grid
+        self.count = count
+        self.version = grid.version
+        self.landmarks = array('i')
+        self.tables = []
+        self.select_time = 0.0
+        self.build_time = 0.0
+        self.queries = 0
+        self._offsets, self._neighbors = adjacency.offsets, adjacency.neighbors
+        self._costs = grid.edge_costs()
+        self._weighted = grid.weighted
+
+        open_nodes = [node for node, cell in enumerate(grid.cells) if cell == PATH]
+        if open_nodes and count > 0:
+            self._select(open_nodes, count)
+        del self._offsets, self._neighbors
+
+    def _select(self, open_nodes: List[int], count: int):
+        """Chọn mốc kiểu farthest-point, dựng bảng của từng mốc ngay khi chọn."""
+        clock = time.perf_counter
+        started = clock()
+        # Mốc đầu: ô xa nhất tính từ ô đường đi đầu tiên
+        seed = self._distances(open_nodes[0])
+        candidate = max(open_nodes, key=seed.__getitem__)
+        # nearest[v]: khoảng cách tới mốc gần nhất; ô chưa mốc nào tới được
+        # (vùng liên thông khác) giữ giá trị lớn nhất nên được chọn trước
+        nearest = array('i', [_UNREACHED]) * self.grid.size
+
+        for _ in range(count):
+            build_started = clock()
+            table = self._distances(candidate)
+            self.build_time += clock() - build_started
+            self.landmarks.append(candidate)
+            self.tables.append(table)
+
+            for node in open_nodes:
+                distance = table[node]
+                if 0 <= distance < nearest[node]:
+                    nearest[node] = distance
+            candidate = max(open_nodes, key=nearest.__getitem__)
+            if nearest[candidate] == 0:
+                break  # Mọi ô đã là mốc
+
+        self.select_time = clock() - started - self.build_time
+
+    def _distances(self, source: int) -> array:
+        """Khoảng cách từ source tới mọi ô: BFS, hoặc Dijkstra nếu có địa hình."""
+        offsets, neighbors, costs = self._offsets, self._neighbors, self._costs
+        distance = array('i', [-1]) * self.grid.size
+        distance[source] = 0
+
+        if not self._weighted:
+            queue = deque([source])
+            popleft, append = queue.popleft, queue.append
+            while queue:
+                current = popleft()
+                next_dist = distance[current] + 1
+                for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                    if distance[neighbor] < 0:
+                        distance[neighbor] = next_dist
+                        append(neighbor)
+            return distance
+
+        heap = [(0, source)]
+        done = bytearray(self.grid.size)
+        while heap:
+            current_dist, current = heapq.heappop(heap)
+            if done[current]:
+                continue
+            done[current] = 1
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                tentative = current_dist + costs[neighbor]
+                if not done[neighbor] and (distance[neighbor] < 0 or tentative < distance[neighbor]):
+                    distance[neighbor] = tentative
+                    heapq.heappush(heap, (tentative, neighbor))
+        return distance
+
+    @classmethod
+    def of(cls, maze, count: int = DEFAULT_LANDMARKS,
+           cached: 'LandmarkTable' = None) -> 'LandmarkTable':
+        """
+        Lấy bảng mốc của một mê cung.
+
+        Maze tự cache theo version lưới; với CompactGrid, bản `cached`
+        được dùng lại nếu vẫn cùng version và số mốc, ngược lại dựng mới.
+
+        Args:
+            maze: Maze, CompactGrid hoặc ma trận list các list
+            count: Số mốc
+            cached: Bản dựng trước đó cho CHÍNH lưới này (tùy chọn)
+        """
+        get_landmarks = getattr(maze, 'get_landmarks', None)
+        if get_landmarks is not None:
+            return get_landmarks(count)
+        grid = CompactGrid.coerce(maze)
+        if cached is not None and cached.version == grid.version and cached.count == count:
+            return cached
+        return cls(grid, count)
+
+    # ===== HEURISTIC =====
+
+    def estimator(self, goal: int) -> Callable[[int], int]:
+        """
+        Hàm h(node) ước lượng chi phí từ node đến goal (cận ALT).
+
+        Tính sẵn d(L, goal) một lần cho mỗi truy vấn; mốc không tới được
+        goal bị bỏ qua. Mỗi lần gọi estimator() được tính là một truy vấn.
+
+        Args:
+            goal: Node id của đích
+
+        Returns:
+            Hàm nhận node id, trả về cận dưới (số nguyên >= 0)
+        """
+        self.queries += 1
+        costs = self.grid.edge_costs()
+        goal_cost = costs[goal]
+        pairs = [(table, table[goal]) for table in self.tables if table[goal] >= 0]
+
+        if not self.grid.weighted:
+            def estimate(node: int) -> int:
+                best = 0
+                for table, goal_dist in pairs:
+                    distance = table[node]
+                    if distance >= 0:
+                        bound = abs(goal_dist - distance)
+                        if bound > best:
+                            best = bound
+                return best
+
+            return estimate
+
+        def estimate(node: int) -> int:
+            shift = goal_cost - costs[node]
+            best = 0
+            for table, goal_dist in pairs:
+                distance = table[node]
+                if distance < 0:
+                    continue
+                ahead = goal_dist - distance
+                behind = shift - ahead
+                bound = ahead if ahead > behind else behind
+                if bound > best:
+                    best = bound
+            return best
+
+        return estimate
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Số mốc, thời gian tiền xử lý, số truy vấn và bộ nhớ của bảng."""
+        preprocess = self.select_time + self.build_time
+        return {
+            'landmarks': len(self.landmarks),
+            'landmark_select_time': self.select_time,
+            'landmark_build_time': self.build_time,
+            'landmark_queries': self.queries,
+            # Chi phí tiền xử lý chia đều cho các truy vấn đã chạy
+            'landmark_amortized_time': preprocess / max(1, self.queries),
+            'landmark_bytes': sum(table.itemsize * len(table) for table in self.tables)
+        }
+
+    def coords(self) -> List[tuple]:
+        """Tọa độ (x, y) các mốc (để vẽ lên mê cung)."""
+        return [self.grid.coords(node) for node in self.landmarks]
+
+    def __repr__(self) -> str:
+        return (f'LandmarkTable({len(self.landmarks)} mốc, '
+                f'{(self.select_time + self.build_time) * 1000:.1f} ms, version={self.version})')
@@ -10,8 +10,16 @@ Mô tả:
     - 1: Tường (không thể di chuyển)
 
 Cấu trúc dữ liệu:
-    - grid: List[List[int]] - Ma trận 2D lưu trạng thái các ô
-    - Truy cập: grid[y][x] (hàng trước, cột sau)
+    - grid: CompactGrid - bytearray phẳng có viền tường canh quanh
+    - Truy cập: grid[y][x] (hàng trước, cột sau) hoặc node id số nguyên
+    - Sửa ô: set_cell(x, y, value) (hàng của grid là chỉ đọc)
+    - Địa hình: set_cost(x, y, cost) - chi phí bước vào ô, mặc định 1
+    - Danh sách kề CSR: get_adjacency(), cache theo version của grid
+    - Đồ thị nút giao: get_junction_graph(), cache theo version của grid
+    - Chỉ mục đường đi trên cây: get_tree_index(), None nếu mê cung có chu trình
+    - Bảng mốc cho heuristic ALT: get_landmarks(k), cache theo version và k
+    - Đồ thị cụm cho HPA*: get_cluster_graph(), lưới đổi thì cập nhật cục bộ
+    - Dấu vân tay: fingerprint() = (digest nội dung, version), khóa của PathCache
 
 Tọa độ:
     - (0, 0): Góc trên bên trái
@@ -24,7 +32,26 @@ Sử dụng với các thuật toán:
 ==============================================================================
 """
 
-from typing import List, Tuple
+from typing import List, NamedTuple, Optional, Tuple
+
+from .adjacency import CSRAdjacency
+from .compact_grid import CompactGrid
+from .cluster_graph import DEFAULT_CLUSTER_SIZE, ClusterGraph
+from .junction_graph import JunctionGraph
+from .landmarks import DEFAULT_LANDMARKS, LandmarkTable
+from .tree_index import TreePathIndex
+
+
+class GridFingerprint(NamedTuple):
+    """
+    Dấu vân tay của lưới mê cung.
+
+    Attributes:
+        digest: Băm nội dung lưới (CompactGrid.digest) - cùng nội dung thì trùng
+        version: Bộ đếm của Maze, tăng mỗi lần set_grid() hoặc sửa ô
+    """
+    digest: str
+    version: int
 
 
 class Maze:
@@ -34,7 +61,14 @@ class Maze:
     Attributes:
         width: Chiều rộng mê cung (số cột)
         height: Chiều cao mê cung (số hàng)
-        grid: Ma trận 2D lưu trữ mê cung
+        grid: CompactGrid lưu trữ mê cung
+        _adjacency: CSRAdjacency đã dựng cho grid hiện tại (hoặc None)
+        _junction_graph: JunctionGraph đã dựng cho grid hiện tại (hoặc None)
+        _tree_index: TreePathIndex đã dựng (None nếu chưa dựng hoặc có chu trình)
+        _tree_index_version: Version lưới của lần dựng _tree_index gần nhất
+        _landmarks: LandmarkTable đã dựng (hoặc None)
+        _cluster_graph: ClusterGraph của grid hiện tại (hoặc None)
+        version: Tăng mỗi lần set_grid() hoặc set_cell() làm đổi lưới
         start_pos: Vị trí bắt đầu
         exit_pos: Vị trí đích (lối thoát)
     """
@@ -55,7 +89,16 @@ class Maze:
         self.width = width
         self.height = height
         # Khởi tạo tất cả là tường (1)
-        self.grid = [[1 for _ in range(width)] for _ in range(height)]
+        self.grid = CompactGrid(width, height)
+        self._adjacency = None
+        self._junction_graph = None
+        self._tree_index = None
+        self._tree_index_version = None
+        self._landmarks = None
+        self._cluster_graph = None
+        self.version = 0
+        self._fingerprint = None
+        self._fingerprint_key = None
         # Vị trí mặc định: start ở góc trên trái, exit ở góc dưới phải
         self.start_pos = (1, 1)
         self.exit_pos = (width - 2, height - 2)
@@ -67,11 +110,158 @@ class Maze:
         Được gọi sau khi thuật toán Backtracking sinh mê cung.
         
         Args:
-            grid: Ma trận mê cung (0 = đường, 1 = tường)
+            grid: CompactGrid hoặc ma trận list các list (0 = đường, 1 = tường)
+        """
+        self.grid = CompactGrid.coerce(grid)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        # Lưới mới => danh sách kề, đồ thị nút và index cây cũ không còn đúng
+        self._adjacency = None
+        self._junction_graph = None
+        self._tree_index = None
+        self._tree_index_version = None
+        self._landmarks = None
+        self._cluster_graph = None
+        self.version += 1
+    
+    def set_cell(self, x: int, y: int, value: int):
+        """
+        Sửa một ô của mê cung (0 = đường, 1 = tường).
+        
+        Args:
+            x, y: Tọa độ ô
+            value: Giá trị mới
+        """
+        grid_version = self.grid.version
+        self.grid.set(x, y, value)
+        if self.grid.version != grid_version:
+            self.version += 1
+
+    def set_cost(self, x: int, y: int, cost: int):
+        """
+        Đặt địa hình cho một ô: chi phí bước vào ô (1 = đường thường).
+
+        Args:
+            x, y: Tọa độ ô
+            cost: Chi phí nguyên trong [1, 255] (vd bùn 3, nước 5)
+        """
+        grid_version = self.grid.version
+        self.grid.set_cost(x, y, cost)
+        if self.grid.version != grid_version:
+            self.version += 1
+
+    def get_cost(self, x: int, y: int) -> int:
+        """Chi phí bước vào ô (x, y) (1 nếu chưa đặt địa hình)."""
+        return self.grid.get_cost(x, y)
+
+    def path_cost(self, path: List[Tuple[int, int]]) -> int:
+        """Tổng chi phí đi theo path (không tính ô xuất phát)."""
+        return self.grid.path_cost(path)
+
+    def fingerprint(self) -> GridFingerprint:
+        """
+        Dấu vân tay (digest nội dung, version) của lưới hiện tại.
+
+        Digest tốn O(V) nên chỉ được tính lại khi version của Maze hoặc
+        của lưới (sửa thẳng qua CompactGrid.set) đã đổi.
+
+        Returns:
+            GridFingerprint của grid hiện tại
+        """
+        key = (self.version, self.grid.version)
+        if self._fingerprint_key != key:
+            if self._fingerprint_key is not None and self._fingerprint_key[0] == self.version:
+                # Lưới bị sửa thẳng (không qua set_cell): vẫn phải tăng version
+                self.version += 1
+                key = (self.version, self.grid.version)
+            self._fingerprint = GridFingerprint(self.grid.digest(), self.version)
+            self._fingerprint_key = key
+        return self._fingerprint
+
+    def get_adjacency(self) -> CSRAdjacency:
+        """
+        Lấy danh sách kề CSR của mê cung, dựng lại khi cần.
+
+        Cache bị bỏ khi set_grid() thay lưới hoặc khi version của lưới
+        tăng (set_cell, CompactGrid.set), nên các thuật toán tìm đường
+        chạy lặp lại trên cùng mê cung không phải dựng lại.
+
+        Returns:
+            CSRAdjacency ứng với grid hiện tại
+        """
+        adjacency = self._adjacency
+        if adjacency is None or adjacency.version != self.grid.version:
+            adjacency = self._adjacency = CSRAdjacency(self.grid)
+        return adjacency
+
+    def get_junction_graph(self) -> JunctionGraph:
+        """
+        Lấy đồ thị nút giao (hành lang đã thu gọn) của mê cung, dựng lại khi cần.
+
+        Dùng chung danh sách kề CSR đã cache; bị bỏ cùng lúc với nó
+        khi lưới đổi.
+
+        Returns:
+            JunctionGraph ứng với grid hiện tại
+        """
+        graph = self._junction_graph
+        if graph is None or graph.version != self.grid.version:
+            graph = self._junction_graph = JunctionGraph(self.grid, self.get_adjacency())
+        return graph
+
+    def get_tree_index(self) -> Optional[TreePathIndex]:
+        """
+        Lấy chỉ mục đường đi trên cây (LCA) của mê cung, dựng lại khi cần.
+
+        Chỉ dùng được khi mê cung không có chu trình (mê cung hoàn hảo
+        từ Backtracking). Kết quả "có chu trình" cũng được cache, nên mê
+        cung đã sửa tường chỉ bị kiểm tra lại một lần cho mỗi version.
+
+        Returns:
+            TreePathIndex, hoặc None nếu mê cung có chu trình
+        """
+        if self._tree_index_version != self.grid.version:
+            self._tree_index = TreePathIndex.build(self.grid, self.get_adjacency())
+            self._tree_index_version = self.grid.version
+        return self._tree_index
+
+    def get_landmarks(self, count: int = DEFAULT_LANDMARKS) -> LandmarkTable:
+        """
+        Lấy bảng khoảng cách từ các mốc (heuristic ALT), dựng lại khi cần.
+
+        Bảng được giữ qua nhiều lần tìm đường trên cùng lưới, nên chi phí
+        chọn mốc và dựng bảng chỉ trả một lần cho mỗi version.
+
+        Args:
+            count: Số mốc
+
+        Returns:
+            LandmarkTable ứng với grid hiện tại
+        """
+        table = self._landmarks
+        if table is None or table.version != self.grid.version or table.count != count:
+            table = self._landmarks = LandmarkTable(self.grid, count, self.get_adjacency())
+        return table
+
+    def get_cluster_graph(self, cluster_size: int = DEFAULT_CLUSTER_SIZE) -> ClusterGraph:
         """
-        self.grid = grid
-        self.height = len(grid)
-        self.width = len(grid[0])
+        Lấy đồ thị cụm (HPA*) của mê cung.
+
+        Khác các index khác, đồ thị cụm KHÔNG bị dựng lại khi sửa ô: chỉ
+        các cụm có ô đổi (và biên của chúng) được cập nhật qua refresh().
+
+        Args:
+            cluster_size: Cạnh của mỗi cụm (ô)
+
+        Returns:
+            ClusterGraph đồng bộ với grid hiện tại
+        """
+        graph = self._cluster_graph
+        if graph is None or graph.cluster_size != cluster_size:
+            graph = self._cluster_graph = ClusterGraph(self.grid, cluster_size)
+        else:
+            graph.refresh()
+        return graph
         
     def is_valid_position(self, x: int, y: int) -> bool:
         """
@@ -88,9 +278,7 @@ class Maze:
         Returns:
             True nếu có thể di chuyển đến vị trí này
         """
-        return (0 <= x < self.width and 
-                0 <= y < self.height and 
-                self.grid[y][x] == 0)
+        return self.grid.is_open(x, y)
     
     def is_wall(self, x: int, y: int) -> bool:
         """
@@ -105,9 +293,8 @@ class Maze:
         Returns:
             True nếu là tường hoặc ngoài biên
         """
-        if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x] == 1
-        return True  # Ngoài biên = tường
+        # Ngoài biên = tường (CompactGrid.get trả về 1)
+        return self.grid.get(x, y) == 1
     
     def get_cell(self, x: int, y: int) -> int:
         """
@@ -121,9 +308,8 @@ class Maze:
             0 nếu là đường đi
             1 nếu là tường hoặc ngoài biên
         """
-        if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x]
-        return 1  # Ngoài biên = tường
+        # Ngoài biên = tường
+        return self.grid.get(x, y)
     
     def set_start(self, x: int, y: int):
         """
@@ -159,14 +345,10 @@ class Maze:
             Danh sách các ô kề có thể di chuyển đến
             Thứ tự: Lên, Phải, Xuống, Trái
         """
-        neighbors = []
-        # 4 hướng di chuyển: Lên (0,-1), Phải (1,0), Xuống (0,1), Trái (-1,0)
-        directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-        
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-            # Chỉ thêm vào nếu là đường đi hợp lệ
-            if self.is_valid_position(new_x, new_y):
-                neighbors.append((new_x, new_y))
+        grid = self.grid
+        if not grid.in_bounds(x, y):
+            return []
         
-        return neighbors
+        # Đọc thẳng từ danh sách kề CSR đã cache (thứ tự Lên, Phải, Xuống, Trái)
+        adjacency = self.get_adjacency()
+        return [grid.coords(node) for node in adjacency.neighbors_of(grid.node_id(x, y))]
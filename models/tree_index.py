@@ -0,0 +1,245 @@
+"""
+==============================================================================
+TREE PATH INDEX - TRA ĐƯỜNG ĐI TRÊN MÊ CUNG HOÀN HẢO (LCA + BINARY LIFTING)
+==============================================================================
+
+Mô tả:
+    Mê cung sinh bởi Backtracking là mê cung "hoàn hảo": đồ thị các ô
+    đường đi là một CÂY (giữa hai ô bất kỳ có đúng một đường đi đơn).
+    Khi đó đường đi ngắn nhất chính là đường đi duy nhất trên cây, và
+    ta không cần chạy BFS mỗi lượt kẻ địch di chuyển.
+
+Tiền xử lý (một lần cho mỗi version của lưới):
+    - DFS lặp từ một ô gốc: parent, depth và thời điểm vào/ra tin/tout
+    - Bảng nhảy nhị phân: up[k][v] = tổ tiên thứ 2^k của v
+    - Nếu gặp cạnh về một ô đã thăm (không phải cha) => đồ thị có chu trình,
+      index không dùng được (build() trả về None)
+
+Truy vấn:
+    - is_ancestor(a, b): tin[a] <= tin[b] và tout[b] <= tout[a] - O(1)
+    - lca(a, b): nhảy nhị phân - O(log V)
+    - distance(a, b) = depth[a] + depth[b] - 2 * depth[lca] - O(log V)
+    - next_step(a, b):
+        + b không nằm trong cây con của a => bước tiếp theo là parent[a]
+        + ngược lại => con của a nằm trên đường đến b, tức tổ tiên của b
+          ở độ sâu depth[a] + 1 - O(log V)
+    - path(a, b): leo từ a và b lên LCA - O(độ dài đường đi)
+
+Độ phức tạp:
+    - Dựng: O(V log V) thời gian, O(V log V) bộ nhớ (array('i') phẳng)
+    - Truy vấn bước đi: O(log V) thay vì O(V) của BFS
+==============================================================================
+"""
+
+from array import array
+from typing import List, Optional, Tuple
+
+from .adjacency import CSRAdjacency
+from .compact_grid import CompactGrid, PATH
+
+
+class TreePathIndex:
+    """
+    Chỉ mục đường đi trên mê cung không có chu trình (rừng các cây).
+
+    Attributes:
+        parent: Node id của ô cha (-1 với gốc và ô tường)
+        depth: Độ sâu của ô trong cây (-1 với ô tường)
+        tin, tout: Thời điểm vào / ra của DFS
+        root: Gốc cây chứa ô (để biết hai ô có liên thông không)
+        up: up[k][v] = tổ tiên thứ 2^k của v (gốc nhảy về chính nó)
+        version: Version lưới lúc dựng
+    """
+
+    def __init__(self, grid: CompactGrid, parent: array, depth: array,
+                 tin: array, tout: array, root: array, max_depth: int):
+        """
+        Lưu kết quả DFS và dựng bảng nhảy nhị phân.
+
+        Nên tạo qua TreePathIndex.build() - hàm đó kiểm tra chu trình.
+        """
+        self.grid = grid
+        self.parent = parent
+        self.depth = depth
+        self.tin = tin
+        self.tout = tout
+        self.root = root
+        self.version = grid.version
+
+        # ===== BẢNG NHẢY NHỊ PHÂN =====
+        # up[0] = cha (gốc và ô tường trỏ về chính nó để phép nhảy luôn hợp lệ)
+        first = array('i', range(grid.size))
+        for node in range(grid.size):
+            if parent[node] >= 0:
+                first[node] = parent[node]
+        self.up = [first]
+        for _ in range(1, max(1, max_depth.bit_length())):
+            prev = self.up[-1]
+            self.up.append(array('i', [prev[prev[node]] for node in range(grid.size)]))
+
+    @classmethod
+    def build(cls, maze, adjacency: CSRAdjacency = None) -> Optional['TreePathIndex']:
+        """
+        Dựng index cho mê cung, hoặc None nếu mê cung có chu trình.
+
+        Args:
+            maze: Maze, CompactGrid hoặc ma trận mê cung
+            adjacency: Danh sách kề CSR của lưới (dựng mới nếu không truyền)
+
+        Returns:
+            TreePathIndex, hoặc None nếu đồ thị ô đường đi không phải rừng
+        """
+        grid = CompactGrid.coerce(maze)
+        if adjacency is None or adjacency.version != grid.version:
+            get_adjacency = getattr(maze, 'get_adjacency', None)
+            adjacency = get_adjacency() if get_adjacency is not None else CSRAdjacency(grid)
+        offsets, neighbors = adjacency.offsets, adjacency.neighbors
+        cells = grid.cells
+        size = grid.size
+
+        parent = array('i', [-1]) * size
+        depth = array('i', [-1]) * size
+        tin = array('i', [0]) * size
+        tout = array('i', [0]) * size
+        root = array('i', [-1]) * size
+        timer = 0
+        max_depth = 0
+
+        # ===== DFS LẶP (không đệ quy - mê cung lớn có cây rất sâu) =====
+        for start in range(size):
+            if cells[start] != PATH or depth[start] >= 0:
+                continue
+            depth[start] = 0
+            root[start] = start
+            tin[start] = timer
+            timer += 1
+            # Mỗi phần tử: (node, vị trí ô kề tiếp theo cần xét trong CSR)
+            stack = [[start, offsets[start]]]
+            while stack:
+                frame = stack[-1]
+                node, i = frame
+                if i == offsets[node + 1]:
+                    tout[node] = timer
+                    timer += 1
+                    stack.pop()
+                    continue
+                frame[1] = i + 1
+                neighbor = neighbors[i]
+                if neighbor == parent[node]:
+                    continue
+                if depth[neighbor] >= 0:
+                    return None  # Cạnh về ô đã thăm => có chu trình
+                parent[neighbor] = node
+                depth[neighbor] = depth[node] + 1
+                root[neighbor] = start
+                if depth[neighbor] > max_depth:
+                    max_depth = depth[neighbor]
+                tin[neighbor] = timer
+                timer += 1
+                stack.append([neighbor, offsets[neighbor]])
+
+        return cls(grid, parent, depth, tin, tout, root, max_depth)
+
+    # ===== TRUY VẤN THEO NODE ID =====
+
+    def is_ancestor(self, a: int, b: int) -> bool:
+        """a là tổ tiên của b (hoặc chính b)?"""
+        return self.tin[a] <= self.tin[b] and self.tout[b] <= self.tout[a]
+
+    def ancestor_at(self, node: int, steps: int) -> int:
+        """Tổ tiên cách node `steps` bước về phía gốc."""
+        k = 0
+        while steps:
+            if steps & 1:
+                node = self.up[k][node]
+            steps >>= 1
+            k += 1
+        return node
+
+    def lca(self, a: int, b: int) -> int:
+        """Tổ tiên chung gần nhất của a và b (cùng cây)."""
+        if self.is_ancestor(a, b):
+            return a
+        if self.is_ancestor(b, a):
+            return b
+        for level in reversed(self.up):
+            candidate = level[a]
+            if not self.is_ancestor(candidate, b):
+                a = candidate
+        return self.up[0][a]
+
+    def _connected(self, a: int, b: int) -> bool:
+        return self.root[a] >= 0 and self.root[a] == self.root[b]
+
+    # ===== TRUY VẤN THEO TỌA ĐỘ =====
+
+    def _nodes(self, a: Tuple[int, int], b: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Node id của hai ô, hoặc None nếu một ô là tường / không liên thông."""
+        grid = self.grid
+        if not (grid.is_open(*a) and grid.is_open(*b)):
+            return None
+        u, v = grid.node_id(*a), grid.node_id(*b)
+        return (u, v) if self._connected(u, v) else None
+
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> Optional[int]:
+        """
+        Số bước đi ngắn nhất giữa hai ô.
+
+        Returns:
+            Số bước, hoặc None nếu không có đường
+        """
+        nodes = self._nodes(a, b)
+        if nodes is None:
+            return None
+        u, v = nodes
+        depth = self.depth
+        return depth[u] + depth[v] - 2 * depth[self.lca(u, v)]
+
+    def next_step(self, a: Tuple[int, int], b: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Ô kế tiếp trên đường đi ngắn nhất từ a đến b.
+
+        Returns:
+            Tọa độ (x, y), hoặc None nếu a == b hay không có đường
+        """
+        nodes = self._nodes(a, b)
+        if nodes is None or nodes[0] == nodes[1]:
+            return None
+        u, v = nodes
+        if self.is_ancestor(u, v):
+            step = self.ancestor_at(v, self.depth[v] - self.depth[u] - 1)
+        else:
+            step = self.parent[u]
+        return self.grid.coords(step)
+
+    def path(self, a: Tuple[int, int], b: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Đường đi (duy nhất) từ a đến b.
+
+        Returns:
+            Danh sách ô (x, y) từ a đến b, [] nếu không có đường
+        """
+        nodes = self._nodes(a, b)
+        if nodes is None:
+            return []
+        u, v = nodes
+        meet = self.lca(u, v)
+        parent = self.parent
+        up_side = [u]
+        while up_side[-1] != meet:
+            up_side.append(parent[up_side[-1]])
+        down_side = []
+        node = v
+        while node != meet:
+            down_side.append(node)
+            node = parent[node]
+        down_side.reverse()
+        coords = self.grid.coords
+        return [coords(node) for node in up_side + down_side]
+
+    def get_next_move(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Cùng giao diện với BFS.get_next_move (dùng cho Enemy.update_ai)."""
+        return self.next_step(start, goal)
+
+    def __repr__(self) -> str:
+        return f'TreePathIndex({len(self.up)} mức nhảy, version={self.version})'
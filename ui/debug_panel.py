@@ -454,7 +454,7 @@ class DebugPanel(tk.Frame):
         Args:
             step: Dict chứa thông tin bước
             step_number: Số thứ tự bước
-            total_steps: Tổng số bước
+            total_steps: Tổng số bước (None khi thuật toán còn đang chạy lười)
         """
         self.clear()
         theme = self.get_theme()
@@ -470,12 +470,13 @@ class DebugPanel(tk.Frame):
         
         tk.Label(progress_header, text=f"Bước {step_number}", bg=theme.get('card_bg', '#1e2848'), 
                 fg=theme.get('accent', '#00ff41'), font=('Arial', 12, 'bold')).pack(side='left')
-        tk.Label(progress_header, text=f" / {total_steps}", bg=theme.get('card_bg', '#1e2848'), 
+        tk.Label(progress_header, text=f" / {total_steps if total_steps else '?'}",
+                bg=theme.get('card_bg', '#1e2848'), 
                 fg=theme.get('text_dim', '#c9ada7'), font=('Arial', 10)).pack(side='left')
         
-        # Percentage
-        percent = int((step_number / total_steps) * 100)
-        tk.Label(progress_header, text=f"{percent}%", bg=theme.get('card_bg', '#1e2848'), 
+        # Percentage (chưa biết tổng số bước thì chỉ báo đang chạy)
+        percent = f"{int((step_number / total_steps) * 100)}%" if total_steps else '⏳ đang chạy'
+        tk.Label(progress_header, text=percent, bg=theme.get('card_bg', '#1e2848'), 
                 fg=theme.get('accent2', '#00d4ff'), font=('Arial', 10, 'bold')).pack(side='right')
         
         # Styled progress bar
@@ -493,7 +494,7 @@ class DebugPanel(tk.Frame):
         bar_bg.pack(fill='both', expand=True, padx=1, pady=1)
         
         # Actual progress
-        progress_width = max(1, int((step_number / total_steps) * 240))
+        progress_width = max(1, int((step_number / total_steps) * 240)) if total_steps else 1
         progress_bar = tk.Frame(bar_bg, bg=theme.get('accent', '#00ff41'), width=progress_width)
         progress_bar.place(x=0, y=0, relheight=1)
         
@@ -509,12 +510,32 @@ class DebugPanel(tk.Frame):
         if 'visited' in step:
             self._add_styled_row(info_content, '✓ Đã thăm:', f"{len(step['visited'])} ô", theme)
         
+        if 'frontier' in step:
+            side = 'Từ Start' if step['frontier'] == 'forward' else 'Từ Exit'
+            self._add_styled_row(info_content, '🔀 Phía:', side, theme)
+        
+        if step.get('best_length') is not None:
+            self._add_styled_row(info_content, '🤝 Điểm gặp tốt nhất:', f"{step['best_length']} ô", theme)
+        
         if 'queue_size' in step:
             self._add_styled_row(info_content, '📦 Queue:', f"{step['queue_size']}", theme)
         
         if 'heap_size' in step:
             self._add_styled_row(info_content, '🗂️ Heap:', f"{step['heap_size']}", theme)
         
+        if 'heap_pushes' in step:
+            self._add_styled_row(info_content, '⬆️ Lần push Heap:', f"{step['heap_pushes']}", theme)
+        
+        if 'open_size' in step:
+            self._add_styled_row(info_content, '🪣 Open list:', f"{step['open_size']}", theme)
+        
+        if 'bucket_f' in step:
+            self._add_styled_row(info_content, '🪣 Bucket f:',
+                                 f"{step['bucket_f']} ({step.get('bucket_size', 0)} ô)", theme)
+        
+        if 'bucket_scans' in step:
+            self._add_styled_row(info_content, '⏭️ Bucket rỗng bỏ qua:', f"{step['bucket_scans']}", theme)
+        
         if 'current_distance' in step:
             self._add_styled_row(info_content, '📏 Distance:', f"{step['current_distance']}", theme)
         
@@ -527,6 +548,35 @@ class DebugPanel(tk.Frame):
         if 'heuristic' in step:
             self._add_styled_row(info_content, '🧭 h(n):', f"{step['heuristic']}", theme)
         
+        if step.get('current_rhs') is not None:
+            self._add_styled_row(info_content, '📐 rhs(n):', f"{step['current_rhs']}", theme)
+        
+        if 'cluster' in step:
+            self._add_styled_row(info_content, '🧩 Cụm:', f"{step['cluster']}", theme)
+        
+        if 'refine_segment' in step:
+            self._add_styled_row(info_content, '🪡 Làm mịn đoạn:', f"{step['refine_segment']}", theme)
+        
+        if 'cells_scanned' in step:
+            self._add_styled_row(info_content, '🔎 Ô đã quét:', f"{step['cells_scanned']}", theme)
+        
+        # IDA* / Fringe Search: lượt hiện tại và ngưỡng f của lượt đó
+        if 'threshold' in step:
+            next_threshold = step.get('next_threshold')
+            self._add_styled_row(info_content, '🔁 Lượt / ngưỡng f:',
+                                 f"{step['iteration']} / {step['threshold']}"
+                                 + (f" (lượt sau ≥ {next_threshold})" if next_threshold is not None else ''),
+                                 theme)
+        
+        if step.get('best_cost') is not None:
+            self._add_styled_row(info_content, '🏁 Đường tốt nhất (nhánh cận):', f"{step['best_cost']}", theme)
+        
+        if 'depth' in step:
+            self._add_styled_row(info_content, '⬇️ Độ sâu DFS:', f"{step['depth']}", theme)
+        
+        if 'fringe_size' in step:
+            self._add_styled_row(info_content, '🧵 Fringe:', f"{step['fringe_size']}", theme)
+        
         # Update scroll region
         self.after(50, self._update_scroll_region)
     
@@ -581,6 +631,45 @@ class DebugPanel(tk.Frame):
         # Update scroll region
         self.after(50, self._update_scroll_region)
     
+    def show_repair_info(self, info: dict):
+        """
+        Hiển thị chi phí sửa đường đi của LPA* sau một lần bật / tắt tường
+        
+        Args:
+            info: Dict gồm cell, wall, repair, nodes_touched, nodes_expanded,
+                  full_expanded (A* tìm lại từ đầu, None khi còn đang chạy nền),
+                  path_length, path_cost, repairs
+        """
+        self.clear()
+        theme = self.get_theme()
+        
+        card, content = self._create_card(self.content_frame, '🧱 Sửa tường (LPA*)',
+                                          theme.get('warning', '#ffb400'))
+        card.pack(fill='x', padx=5, pady=(5, 3))
+        
+        action = 'Đặt tường' if info['wall'] else 'Mở ô'
+        self._add_result_styled_row(content, '📍 Ô vừa sửa', f"{action} {info['cell']}",
+                                    theme, theme.get('accent', '#00ff41'))
+        mode = 'Sửa tăng dần' if info['repair'] else 'Tìm từ đầu'
+        self._add_result_styled_row(content, '🔧 Chế độ', mode, theme, theme.get('info', '#00d4ff'))
+        self._add_result_styled_row(content, '🎯 Ô chạm tới (g / rhs đổi)', f"{info['nodes_touched']}",
+                                    theme, theme.get('warning', '#ffb400'))
+        self._add_result_styled_row(content, '🔄 Ô xử lý lại', f"{info['nodes_expanded']}",
+                                    theme, theme.get('warning', '#ffb400'))
+        full = f"{info['full_expanded']} ô" if info['full_expanded'] is not None else '⏳ đang chạy nền...'
+        self._add_result_styled_row(content, '🐢 A* tìm lại từ đầu', full,
+                                    theme, theme.get('accent3', '#f72585'))
+        if info['full_expanded']:
+            saved = 100 * (1 - info['nodes_expanded'] / info['full_expanded'])
+            self._add_result_styled_row(content, '⚡ Tiết kiệm', f"{saved:.0f}%",
+                                        theme, theme.get('success', '#00ff41'))
+        path_text = f"{info['path_length']} ô (chi phí {info['path_cost']})" if info['path_length'] else 'Không có'
+        self._add_result_styled_row(content, '📏 Đường đi', path_text, theme, theme.get('accent', '#00ff41'))
+        self._add_result_styled_row(content, '🧮 Số lần sửa', f"{info['repairs']}",
+                                    theme, theme.get('info', '#00d4ff'))
+        
+        self.after(50, self._update_scroll_region)
+    
     def _add_result_styled_row(self, parent, label, value, theme, value_color):
         """Thêm dòng kết quả với màu sắc đặc biệt"""
         row = tk.Frame(parent, bg=theme.get('card_bg', '#1e2848'))
@@ -625,10 +714,20 @@ class DebugPanel(tk.Frame):
         algo_colors = {
             'BFS': theme.get('info', '#00d4ff'),
             'Dijkstra': theme.get('warning', '#ffb400'),
-            'A*': theme.get('success', '#00ff41')
+            'A*': theme.get('success', '#00ff41'),
+            'A* (bucket)': theme.get('success', '#00ff41'),
+            'A* (ALT)': theme.get('success', '#00ff41'),
+            'HPA*': theme.get('accent2', '#00d4ff'),
+            'BFS 2 chiều': theme.get('info', '#00d4ff'),
+            'A* 2 chiều': theme.get('success', '#00ff41'),
+            'JPS': theme.get('accent', '#00ff41'),
+            'IDA*': theme.get('accent2', '#00d4ff'),
+            'Fringe Search': theme.get('accent2', '#00d4ff'),
+            'Dijkstra (nút giao)': theme.get('warning', '#ffb400'),
+            'A* (nút giao)': theme.get('success', '#00ff41')
         }
         
-        algo_icons = {'BFS': '🔵', 'Dijkstra': '🟡', 'A*': '🟢'}
+        algo_icons = {'BFS': '🔵', 'Dijkstra': '🟡', 'A*': '🟢', 'A* (bucket)': '🪣', 'A* (ALT)': '📍', 'BFS 2 chiều': '🔷', 'A* 2 chiều': '💚', 'JPS': '🦘', 'HPA*': '🧩', 'IDA*': '🔁', 'Fringe Search': '🧵'}
         
         for algo_name, data in comparison.items():
             accent = algo_colors.get(algo_name, theme.get('accent', '#00ff41'))
@@ -8,13 +8,16 @@ from tkinter import ttk, messagebox, filedialog
 import time
 import json
 import os
+import random
 from datetime import datetime
 from .maze_view import MazeView
 from .debug_panel import DebugPanel
 from .theme_manager import ThemeManager
 from models import Maze, Player, Enemy
 from models.stats_manager import StatsManager
-from algorithms import MazeGenerator, BFS, Dijkstra, AStar
+from algorithms import (MazeGenerator, LPAStar, FlowField, PathCache, StepStream, TaskExecutor,
+                        SolveResult, get_solver, solver_names)
+from algorithms.comparison import DEFAULT_REPEATS, DEFAULT_TIMEOUT, DEFAULT_WARMUP, comparison_names, measure
 
 # Import pygame cho âm thanh
 try:
@@ -25,6 +28,12 @@ except:
     SOUND_AVAILABLE = False
 
 
+# Chi phí bước vào ô theo loại địa hình
+TERRAIN_COSTS = {'Đường': 1, 'Bùn': 3, 'Nước': 5}
+# Tỉ lệ ô đường đi bị phủ địa hình khi rải ngẫu nhiên
+TERRAIN_DENSITY = 0.3
+
+
 class MainWindow:
     def __init__(self, root):
         """
@@ -42,8 +51,14 @@ class MainWindow:
         self.maze = Maze(21, 21)
         self.player = None
         self.enemy = None
+        # Bản đồ khoảng cách BFS gốc tại người chơi (AI trên mê cung có vòng)
+        self.flow_field = None
+        # LPA* giữ cây tìm kiếm start -> exit để sửa đường đi khi click đổi tường
+        self.replanner = None
         self.current_algorithm = None
         self.algorithm_steps = []
+        # Lần tìm đang chạy lười theo animation (khóa cache, tên thuật toán, mê cung, version)
+        self._pending_search = None
         self.current_step = 0
         self.is_playing = False
         self.game_mode = 'manual'  # 'manual' hoặc 'auto'
@@ -55,6 +70,10 @@ class MainWindow:
         
         # Kết quả so sánh
         self.comparison_results = {}
+        # Lần so sánh đang đo trong tiến trình con (kết quả đã về, số còn chờ)
+        self._comparison = None
+        # Cache kết quả tìm đường theo (nội dung mê cung, thuật toán, start, goal)
+        self.path_cache = PathCache()
         
         # New features
         self.theme_manager = ThemeManager()
@@ -70,6 +89,12 @@ class MainWindow:
         
         self.create_ui()
         
+        # Việc nặng (sinh mê cung, đo so sánh, A* đối chứng) chạy nền; kết quả
+        # được nhận trên luồng Tk qua root.after, yêu cầu cũ bị hủy / bỏ
+        self.executor = TaskExecutor()
+        self.executor.attach(self.root)
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+        
         # Auto play nhạc khi khởi động
         self.init_music()
         
@@ -256,6 +281,17 @@ class MainWindow:
                                 command=self.generate_maze)
         btn_generate.pack(fill='x', padx=15, pady=10)
         
+        # Địa hình: rải bùn / nước ngẫu nhiên lên các ô đường đi
+        terrain_frame = tk.Frame(parent, bg='#16213e')
+        terrain_frame.pack(fill='x', padx=15, pady=(0, 5))
+        
+        tk.Button(terrain_frame, text='🌿 Rải địa hình', bg='#0f3460', fg='#ffffff',
+                 font=('Arial', 9, 'bold'), relief='flat', cursor='hand2',
+                 command=self.scatter_terrain).pack(side='left', expand=True, fill='x', padx=(0, 5))
+        tk.Button(terrain_frame, text='🧹 Xóa địa hình', bg='#0f3460', fg='#ffffff',
+                 font=('Arial', 9, 'bold'), relief='flat', cursor='hand2',
+                 command=self.clear_terrain).pack(side='left', expand=True, fill='x')
+        
         # === PHẦN 2: THUẬT TOÁN TÌM ĐƯỜNG ===
         self._create_section(parent, '🧭 Thuật toán tìm đường')
         
@@ -264,14 +300,9 @@ class MainWindow:
         
         self.algo_var = tk.StringVar(value='Dijkstra')
         
-        algorithms = [
-            ('BFS', 'BFS'),
-            ('Dijkstra', 'Dijkstra'),
-            ('A*', 'A*')
-        ]
-        
-        for text, value in algorithms:
-            rb = tk.Radiobutton(algo_frame, text=text, variable=self.algo_var, value=value,
+        # Danh sách lấy từ registry: đăng ký solver mới là tự có nút chọn
+        for name in solver_names(interactive=True):
+            rb = tk.Radiobutton(algo_frame, text=name, variable=self.algo_var, value=name,
                                bg='#16213e', fg='#ffffff', selectcolor='#0f3460',
                                font=('Arial', 10), activebackground='#16213e', 
                                activeforeground='#00ff41', cursor='hand2')
@@ -688,36 +719,69 @@ class MainWindow:
         
         # Update status NGAY LẬP TỨC
         self.status_label.config(text='⏳ Đang tạo...')
-        self.root.update_idletasks()
-        
-        # Generate in background thread - cực nhanh
-        import threading
         
-        def _generate_thread():
+        def _build(token):
+            # Chạy trong luồng worker: chỉ dựng dữ liệu, không chạm widget
             generator = MazeGenerator(width, height)
-            grid, steps = generator.generate()
+            generator.cancel_token = token
+            grid, _ = generator.generate(record_steps=False)
+            maze = Maze(width, height)
+            maze.set_grid(grid)
+            maze.set_start(1, 1)
+            maze.set_exit(width - 2, height - 2)
+            # Dựng sẵn index cây (LCA) ngay trong luồng nền để AI tra bước đi
+            maze.get_tree_index()
+            return maze, generator
+        
+        def _update_ui(result):
+            maze, generator = result
+            self.maze = maze
             
-            def _update_ui():
-                self.maze = Maze(width, height)
-                self.maze.set_grid(grid)
-                self.maze.set_start(1, 1)
-                self.maze.set_exit(width - 2, height - 2)
-                
-                self.maze_view.set_maze(self.maze)
-                self.maze_view._maze_cached = False  # Force redraw
-                self.maze_view.update_display()
-                
-                self.player = None
-                self.enemy = None
-                
-                self.debug_panel.show_algorithm_info(generator.get_complexity_info())
-                self.status_label.config(text=f'✅ {width}x{height}')
+            self.maze_view.set_maze(self.maze)
+            self.maze_view._maze_cached = False  # Force redraw
+            self.maze_view.update_display()
+            
+            self.player = None
+            self.enemy = None
             
-            self.root.after(0, _update_ui)
+            self.debug_panel.show_algorithm_info(generator.get_complexity_info())
+            self.status_label.config(text=f'✅ {width}x{height}')
+        
+        # Bấm tạo lại khi lần trước chưa xong: lần trước bị hủy, kết quả bị bỏ.
+        # Số đo so sánh của mê cung cũ cũng không còn cần nữa
+        self.executor.cancel('compare')
+        self.executor.submit('generate', _build, on_done=_update_ui)
+        
+    def scatter_terrain(self):
+        """Rải ngẫu nhiên bùn / nước lên các ô đường đi (ô đắt hơn khi đi qua)"""
+        if not self.maze:
+            return
         
-        thread = threading.Thread(target=_generate_thread, daemon=True)
-        thread.start()
+        width, height = self.maze.width, self.maze.height
+        for y in range(height):
+            for x in range(width):
+                if self.maze.is_valid_position(x, y) and (x, y) not in (self.maze.start_pos, self.maze.exit_pos):
+                    roll = random.random()
+                    if roll < TERRAIN_DENSITY:
+                        self.maze.set_cost(x, y, TERRAIN_COSTS['Nước'] if roll < TERRAIN_DENSITY / 3
+                                           else TERRAIN_COSTS['Bùn'])
+        
+        self.maze_view.update_display()
+        self.status_label.config(text=f'🌿 Đã rải địa hình: bùn = {TERRAIN_COSTS["Bùn"]}, '
+                                      f'nước = {TERRAIN_COSTS["Nước"]}')
+    
+    def clear_terrain(self):
+        """Đưa mọi ô về chi phí 1 (đường thường)"""
+        if not self.maze:
+            return
         
+        for y in range(self.maze.height):
+            for x in range(self.maze.width):
+                self.maze.set_cost(x, y, TERRAIN_COSTS['Đường'])
+        
+        self.maze_view.update_display()
+        self.status_label.config(text='🧹 Đã xóa địa hình')
+    
     def find_path(self):
         """Tìm đường đi"""
         if not self.maze:
@@ -725,39 +789,59 @@ class MainWindow:
             return
         
         algo_name = self.algo_var.get()
-        self.status_label.config(text=f'Đang chạy {algo_name}...')
-        self.root.update()
-        
-        # Tạo thuật toán
-        start_time = time.time()
-        
-        if algo_name == 'BFS':
-            algo = BFS(self.maze.grid)
-        elif algo_name == 'Dijkstra':
-            algo = Dijkstra(self.maze.grid)
-        else:  # A*
-            algo = AStar(self.maze.grid)
-        
-        # Tìm đường
-        if algo_name == 'BFS':
-            path, steps = algo.find_path(self.maze.start_pos, self.maze.exit_pos)
-            tables = {}
-        else:
-            path, steps, tables = algo.find_path(self.maze.start_pos, self.maze.exit_pos)
-        
-        end_time = time.time()
         
-        # Lưu kết quả
-        self.current_algorithm = algo
-        self.algorithm_steps = steps
+        # Mê cung chưa đổi => lấy lại kết quả (kèm trace) từ cache
+        key = PathCache.make_key(self.maze.fingerprint(), algo_name,
+                                 self.maze.start_pos, self.maze.exit_pos, record_steps=True)
+        self.is_playing = False
         self.current_step = 0
+        entry = self.path_cache.get(key)
+        if entry is not None:
+            self._pending_search = None
+            # Cache chỉ giữ tên: dựng lại solver (nhẹ, index nằm trong Maze)
+            self.current_algorithm = get_solver(entry['algorithm']).create(self.maze)
+            self.algorithm_steps = entry['steps']
+            self._show_search_result(entry, from_cache=True)
+            return
         
+        # Chưa có: tìm LƯỜI - animation chỉ kéo bước kế tiếp khi tới khung hình,
+        # nên bước 1 hiện ngay và tạm dừng animation là dừng luôn việc tìm
+        solver = get_solver(algo_name).create(self.maze)
+        self.current_algorithm = solver
+        self.algorithm_steps = StepStream(solver.iter_steps(self.maze.start_pos, self.maze.exit_pos))
+        self._pending_search = {'key': key, 'algorithm': algo_name, 'maze': self.maze,
+                                'version': self.maze.version}
+        self.status_label.config(text=f'▶ {algo_name}: đang tìm theo từng khung hình...')
+        self.play_animation()
+    
+    def _finish_search(self):
+        """Luồng bước đã chạy hết: lưu kết quả vào cache và hiển thị."""
+        stream = self.algorithm_steps
+        result = SolveResult.from_raw(stream.result, self.current_algorithm.stats)
+        entry = {
+            'path': result.path,
+            'steps': result.steps,
+            'tables': result.tables,
+            'stats': result.stats,
+            # Chỉ thời gian tính thật sự, không tính lúc chờ khung hình
+            'time': stream.elapsed,
+            # Chỉ tên, không giữ instance (nó trỏ tới cả Maze và các index)
+            'algorithm': self._pending_search['algorithm']
+        }
+        self.path_cache.put(self._pending_search['key'], entry)
+        self._pending_search = None
+        self.algorithm_steps = entry['steps']
+        self._show_search_result(entry, from_cache=False)
+    
+    def _show_search_result(self, entry, from_cache):
+        """Hiển thị đường đi, bảng kết quả và dòng trạng thái của một lần tìm."""
+        path, steps = entry['path'], entry['steps']
         if path:
             # Hiển thị kết quả
             result = {
                 'path_length': len(path),
                 'steps': len(steps),
-                'time': end_time - start_time,
+                'time': entry['time'],
                 'visited_count': len(steps[-1].get('visited', set())) if steps else 0
             }
             
@@ -766,7 +850,16 @@ class MainWindow:
             # Hiển thị đường đi
             self.maze_view.update_display(path=path, visited=steps[-1].get('visited', set()) if steps else None)
             
-            self.status_label.config(text=f'✅ Tìm thấy đường đi! Độ dài: {len(path)} ô')
+            cache_note = ' (cache)' if from_cache else ''
+            stats = entry['stats']
+            if 'landmarks' in stats:
+                preprocess = stats['landmark_select_time'] + stats['landmark_build_time']
+                cache_note += f' | {stats["landmarks"]} mốc ALT: {preprocess * 1000:.1f} ms tiền xử lý'
+            if 'clusters' in stats:
+                cache_note += (f' | {stats["clusters"]} cụm, {stats["abstract_nodes"]} nút: '
+                               f'{stats["cluster_build_time"] * 1000:.1f} ms tiền xử lý')
+            self.status_label.config(text=f'✅ Tìm thấy đường đi! Độ dài: {len(path)} ô | '
+                                          f'Chi phí: {self.maze.path_cost(path)}{cache_note}')
         else:
             messagebox.showinfo('Thông báo', 'Không tìm thấy đường đi!')
             self.status_label.config(text='❌ Không tìm thấy đường đi')
@@ -783,24 +876,50 @@ class MainWindow:
         
         self._animate_step()
     
+    def _fetch_step(self, index):
+        """
+        Lấy bước thứ index; với luồng lười thì chỉ tính thêm khi cần.
+        
+        Returns:
+            Bước, hoặc None nếu không còn bước nào
+        """
+        steps = self.algorithm_steps
+        if not isinstance(steps, StepStream):
+            return steps[index] if 0 <= index < len(steps) else None
+        pending = self._pending_search
+        if pending['maze'] is not self.maze or pending['version'] != self.maze.version:
+            # Mê cung đã đổi giữa chừng: phần còn lại của lần tìm không còn đúng
+            self.algorithm_steps = []
+            self._pending_search = None
+            self.status_label.config(text='⚠️ Mê cung đã đổi, hãy tìm đường lại')
+            return None
+        step = steps.fetch(index)
+        if steps.done:
+            self._finish_search()
+        return step
+    
+    def _step_total(self):
+        """Tổng số bước (None khi luồng lười chưa chạy xong)."""
+        steps = self.algorithm_steps
+        return steps.total() if isinstance(steps, StepStream) else len(steps)
+    
     def _animate_step(self):
         """Animate một bước - với smoother transitions"""
-        if not self.is_playing or self.current_step >= len(self.algorithm_steps):
+        step = self._fetch_step(self.current_step) if self.is_playing else None
+        if step is None:
             self.is_playing = False
             self.btn_play.config(state='normal')
             self.btn_pause.config(state='disabled')
             return
         
         # Hiển thị bước hiện tại
-        step = self.algorithm_steps[self.current_step]
-        
         visited = step.get('visited', set())
         current = step.get('current')
         path = step.get('path', [])
         
         # Batched update - giảm số lần redraw
         self.maze_view.update_display(visited=visited, current=current, path=path)
-        self.debug_panel.show_step_info(step, self.current_step + 1, len(self.algorithm_steps))
+        self.debug_panel.show_step_info(step, self.current_step + 1, self._step_total())
         
         self.current_step += 1
         
@@ -842,23 +961,23 @@ class MainWindow:
     
     def next_step(self):
         """Bước tiếp theo"""
-        if not self.algorithm_steps or self.current_step >= len(self.algorithm_steps) - 1:
+        if not self.algorithm_steps or self._fetch_step(self.current_step + 1) is None:
             return
         self.current_step += 1
         self._show_current_step()
     
     def _show_current_step(self):
         """Hiển thị bước hiện tại"""
-        if not self.algorithm_steps:
+        step = self._fetch_step(self.current_step)
+        if step is None:
             return
         
-        step = self.algorithm_steps[self.current_step]
         visited = step.get('visited', set())
         current = step.get('current')
         path = step.get('path', [])
         
         self.maze_view.update_display(visited=visited, current=current, path=path)
-        self.debug_panel.show_step_info(step, self.current_step + 1, len(self.algorithm_steps))
+        self.debug_panel.show_step_info(step, self.current_step + 1, self._step_total())
     
     def start_game(self):
         """Bắt đầu trò chơi"""
@@ -973,6 +1092,10 @@ class MainWindow:
                 path=self.player.path_history
             )
             
+            # Mê cung có vòng: dời gốc flow field theo người chơi (cập nhật tăng dần)
+            if self.maze.get_tree_index() is None:
+                self._get_flow_field().set_target((new_x, new_y))
+            
             # Tăng đếm bước
             self.player_move_count += 1
             
@@ -990,15 +1113,15 @@ class MainWindow:
         if not self.enemy or not self.player:
             return
         
-        # Dùng BFS để tìm đường
-        bfs = BFS(self.maze.grid)
-        next_move = bfs.get_next_move(self.enemy.get_position(), self.player.get_position())
+        # Mê cung không có chu trình: tra bước đi trên index cây (LCA)
+        # Mê cung đã sửa thành có vòng: get_tree_index() = None => đi xuống
+        # dốc trên flow field gốc tại người chơi
+        moved = self.enemy.update_ai(self.player.get_position(), self._get_flow_field(),
+                                     self.maze.get_tree_index())
         
-        if next_move:
-            self.enemy.move(next_move[0], next_move[1])
-            
+        if moved:
             # Kiểm tra bắt được player
-            if next_move == self.player.get_position():
+            if self.enemy.get_position() == self.player.get_position():
                 elapsed_time = self.stop_timer()
                 
                 # Record stats
@@ -1025,6 +1148,12 @@ class MainWindow:
                 enemy_pos=self.enemy.get_position()
             )
     
+    def _get_flow_field(self) -> FlowField:
+        """Flow field của mê cung hiện tại (tạo mới khi đã đổi mê cung)."""
+        if self.flow_field is None or self.flow_field.maze is not self.maze.grid:
+            self.flow_field = FlowField(self.maze)
+        return self.flow_field
+    
     def reset_game(self):
         """Reset trò chơi - với animation reset"""
         self.stop_timer()
@@ -1050,53 +1179,194 @@ class MainWindow:
         self.status_label.config(text='🔄 Đã reset trò chơi')
     
     def compare_algorithms(self):
-        """So sánh các thuật toán"""
+        """So sánh các thuật toán (đo trong tiến trình con, kết quả hiện dần)"""
         if not self.maze:
             messagebox.showwarning('Cảnh báo', 'Vui lòng tạo mê cung trước!')
             return
         
-        self.status_label.config(text='Đang so sánh thuật toán...')
-        self.root.update()
-        
-        results = {}
-        
-        # Test từng thuật toán
-        algorithms = [
-            ('BFS', BFS),
-            ('Dijkstra', Dijkstra),
-            ('A*', AStar)
-        ]
-        
-        for name, AlgoClass in algorithms:
-            algo = AlgoClass(self.maze.grid)
-            
-            start_time = time.time()
-            
-            if name == 'BFS':
-                path, steps = algo.find_path(self.maze.start_pos, self.maze.exit_pos)
-            else:
-                path, steps, _ = algo.find_path(self.maze.start_pos, self.maze.exit_pos)
-            
-            end_time = time.time()
-            
-            if path:
-                results[name] = {
-                    'Độ dài đường': len(path),
-                    'Số bước duyệt': len(steps),
-                    'Thời gian (ms)': f'{(end_time - start_time) * 1000:.2f}',
-                    'Ô đã thăm': len(steps[-1].get('visited', set())) if steps else 0
-                }
+        start, goal = self.maze.start_pos, self.maze.exit_pos
+        fingerprint = self.maze.fingerprint()
+        state = self._comparison = {'results': {}, 'pending': 0}
+        # Bấm so sánh lại khi lần trước chưa xong: các số đo cũ bị bỏ
+        replace = True
+        for name in comparison_names():
+            # Mê cung chưa đổi => dùng lại kết quả và số đo lần trước
+            key = PathCache.make_key(fingerprint, name, start, goal, record_steps=False)
+            entry = self.path_cache.get(key)
+            if entry is not None and 'timing' in entry:
+                row = self._comparison_row(entry)
+                if row:
+                    state['results'][name] = row
+                continue
+            # Chế độ nhanh, có khởi động và lặp N lần: đo đúng thuật toán
+            self.executor.submit('compare', measure, name, self.maze.grid, start, goal,
+                                 DEFAULT_WARMUP, DEFAULT_REPEATS, DEFAULT_TIMEOUT,
+                                 process=True, replace=replace,
+                                 on_done=lambda entry, key=key: self._on_comparison_result(key, entry),
+                                 on_error=lambda error, key=key: self._on_comparison_result(key, None, error))
+            replace = False
+            state['pending'] += 1
+        
+        self.debug_panel.show_comparison(state['results'])
+        if not state['pending']:
+            self._finish_comparison(state['results'])
+            return
+        self.status_label.config(text=f'⏳ Đang so sánh {state["pending"]} thuật toán '
+                                      f'({DEFAULT_WARMUP} lần khởi động + {DEFAULT_REPEATS} lần đo)...')
+    
+    def _on_comparison_result(self, key, entry, error=None):
+        """Một thuật toán đã đo xong (gọi trên luồng Tk): cập nhật bảng ngay."""
+        state = self._comparison
+        name = key[1]
+        if error is not None:
+            state['results'][name] = {'Lỗi': str(error)}
+        else:
+            # Quá giờ phụ thuộc tải máy lúc đo: không cache
+            if not entry.get('timed_out'):
+                self.path_cache.put(key, entry)
+            row = self._comparison_row(entry)
+            if row:
+                state['results'][name] = row
+        state['pending'] -= 1
+        
+        # Giữ đúng thứ tự danh sách thuật toán dù kết quả về lộn xộn
+        ordered = {name: state['results'][name] for name in comparison_names() if name in state['results']}
+        state['results'] = ordered
+        self.debug_panel.show_comparison(ordered)
+        if state['pending']:
+            self.status_label.config(text=f'⏳ Còn {state["pending"]} thuật toán đang đo...')
+        else:
+            self._finish_comparison(ordered)
+    
+    def _finish_comparison(self, results):
+        """Cập nhật dòng trạng thái khi mọi thuật toán đã có kết quả."""
+        cache = self.path_cache.stats
+        self.status_label.config(text=f'✅ Hoàn thành so sánh {len(results)} thuật toán | '
+                                      f'Cache: {cache["hits"]} hit, {cache["misses"]} miss, '
+                                      f'{cache["evictions"]} bỏ')
+    
+    def _comparison_row(self, entry):
+        """
+        Dòng hiển thị của một thuật toán trong bảng so sánh.
         
-        # Hiển thị bảng so sánh
-        self.debug_panel.show_comparison(results)
-        self.status_label.config(text='✅ Hoàn thành so sánh thuật toán')
+        Returns:
+            Dict nhãn -> giá trị, hoặc None nếu không tìm được đường đi
+        """
+        if entry.get('timed_out'):
+            return {'Quá giờ': f'> {entry["timeout"]:g} s mỗi lần chạy, đã dừng đo'}
+        path, stats, timing = entry['path'], entry['stats'], entry['timing']
+        if not path:
+            return None
+        row = {
+            'Độ dài đường': len(path),
+            # Có địa hình: BFS / JPS / 2 chiều tối ưu số bước, Dijkstra / A* tối ưu chi phí,
+            # HPA* chỉ gần tối ưu
+            'Chi phí đường': (f'{self.maze.path_cost(path)}'
+                              + ('' if get_solver(entry['name']).capabilities.optimal else ' (gần tối ưu)')),
+            'Số bước duyệt': stats['nodes_expanded'],
+            # Trung vị của N lần đo, kèm p95 và độ lệch chuẩn
+            'Thời gian (ms)': f'{timing["median_ms"]:.2f}',
+            'p95 / σ (ms)': f'{timing["p95_ms"]:.2f} / {timing["stdev_ms"]:.2f} ({timing["runs"]} lần)',
+            'Bộ nhớ đỉnh (KB)': f'{entry["peak_bytes"] / 1024:.1f}',
+            'Ô đã thăm': stats['visited_count']
+        }
+        # JPS: số điểm nhảy ít nhưng mỗi lần nhảy quét nhiều ô
+        if 'cells_scanned' in stats:
+            row['Ô đã quét'] = stats['cells_scanned']
+        if 'heap_pushes' in stats:
+            row['Lần push Heap'] = stats['heap_pushes']
+        if 'bucket_pushes' in stats:
+            row['Lần push Bucket'] = stats['bucket_pushes']
+        if 'clusters' in stats:
+            row['Tiền xử lý cụm (ms)'] = (f'{stats["cluster_build_time"] * 1000:.1f} '
+                                          f'({stats["clusters"]} cụm, {stats["abstract_nodes"]} nút)')
+        if 'landmarks' in stats:
+            # Chi phí chọn mốc + dựng bảng, chia đều cho các truy vấn đã chạy
+            preprocess = stats['landmark_select_time'] + stats['landmark_build_time']
+            row['Tiền xử lý mốc (ms)'] = (f'{preprocess * 1000:.1f} / '
+                                          f'{stats["landmark_queries"]} truy vấn')
+        return row
         
     def on_maze_click(self, event):
-        """Xử lý click vào mê cung"""
+        """Click vào mê cung: bật / tắt tường tại ô, đường đi được LPA* sửa tăng dần"""
         cell = self.maze_view.get_cell_from_click(event)
-        if cell and self.player:
-            # Có thể thêm tính năng click để di chuyển
-            pass
+        if not cell or not self.maze:
+            return
+        x, y = cell
+        # Không sửa viền ngoài, start / exit và ô đang có người chơi / kẻ địch
+        if x in (0, self.maze.width - 1) or y in (0, self.maze.height - 1):
+            return
+        occupied = {self.maze.start_pos, self.maze.exit_pos}
+        if self.player:
+            occupied.add(self.player.get_position())
+        if self.enemy:
+            occupied.add(self.enemy.get_position())
+        if cell in occupied:
+            return
+        
+        self.maze.set_cell(x, y, 0 if self.maze.is_wall(x, y) else 1)
+        path = self._replan_after_edit(cell)
+        self.maze_view.update_display(
+            player_pos=self.player.get_position() if self.player else None,
+            enemy_pos=self.enemy.get_position() if self.enemy else None,
+            path=path
+        )
+    
+    def _replan_after_edit(self, cell):
+        """
+        Sửa đường đi start -> exit sau khi ô `cell` đổi, hiển thị chi phí sửa.
+        
+        Lần đầu (hoặc mê cung / start / exit đã đổi) LPA* tìm từ đầu; các
+        lần sau chỉ xử lý phần cây tìm kiếm bị ảnh hưởng. A* chạy lại từ
+        đầu để so sánh số node.
+        """
+        start, goal = self.maze.start_pos, self.maze.exit_pos
+        planner = self.replanner
+        if (planner is None or planner.maze is not self.maze.grid
+                or planner.start != self.maze.grid.node_id(*start)
+                or planner.goal != self.maze.grid.node_id(*goal)):
+            planner = self.replanner = LPAStar(self.maze)
+            path = planner.find_path(start, goal, record_steps=False)[0]
+        else:
+            path = planner.update_cells([cell])
+        
+        stats = planner.stats
+        info = {
+            'cell': cell,
+            'wall': self.maze.is_wall(*cell),
+            'repair': stats.get('repair', False),
+            'nodes_touched': stats['nodes_touched'],
+            'nodes_expanded': stats['nodes_expanded'],
+            'full_expanded': None,
+            'path_length': len(path),
+            'path_cost': stats['path_cost'],
+            'repairs': stats['repairs']
+        }
+        self.debug_panel.show_repair_info(info)
+        action = 'Đặt tường' if self.maze.is_wall(*cell) else 'Mở ô'
+        if not path:
+            self.status_label.config(text=f'🧱 {action} {cell} | ❌ Không còn đường từ start đến exit')
+            return path
+        self.status_label.config(text=f'🧱 {action} {cell} | LPA* chạm {stats["nodes_touched"]} ô')
+        
+        def _full_search(token, grid):
+            # A* từ đầu trên BẢN SAO lưới: click tiếp theo không làm hỏng lần đo
+            return get_solver('A*').solve(grid, start, goal, token=token).stats['nodes_expanded']
+        
+        def _show_full(expanded):
+            info['full_expanded'] = expanded
+            self.debug_panel.show_repair_info(info)
+            self.status_label.config(text=f'🧱 {action} {cell} | LPA* chạm {stats["nodes_touched"]} ô, '
+                                          f'A* từ đầu mở rộng {expanded} ô')
+        
+        # Click nhanh liên tiếp: lần chạy A* cũ bị hủy, chỉ lần mới nhất được hiện
+        self.executor.submit('replan', _full_search, self.maze.grid.copy(), on_done=_show_full)
+        return path
+    
+    def on_close(self):
+        """Đóng cửa sổ: hủy các việc nền rồi thoát"""
+        self.executor.shutdown()
+        self.root.destroy()
     
     # ========== NEW FEATURES ==========
     
@@ -1431,7 +1701,10 @@ class MainWindow:
             try:
                 game_state = {
                     'maze_size': (self.maze.width, self.maze.height),
-                    'maze_grid': self.maze.grid,
+                    'maze_grid': self.maze.grid.to_list(),
+                    # Địa hình (chi phí từng ô), None nếu mọi ô chi phí 1
+                    'maze_costs': [[self.maze.get_cost(x, y) for x in range(self.maze.width)]
+                                   for y in range(self.maze.height)] if self.maze.grid.weighted else None,
                     'player_pos': self.player.position,
                     'enemy_pos': self.enemy.position if self.enemy else None,
                     'difficulty': self.difficulty_var.get(),
@@ -1467,6 +1740,9 @@ class MainWindow:
                 width, height = game_state['maze_size']
                 self.maze = Maze(width, height)
                 self.maze.set_grid(game_state['maze_grid'])
+                for y, row in enumerate(game_state.get('maze_costs') or []):
+                    for x, cost in enumerate(row):
+                        self.maze.set_cost(x, y, cost)
                 
                 # Restore player
                 px, py = game_state['player_pos']
@@ -55,7 +55,9 @@ class MazeView(tk.Canvas):
             'solution': '#7b2cbf',
             'visited': '#c9ada7',
             'current': '#f72585',
-            'grid': '#1a1a2e'
+            'grid': '#1a1a2e',
+            'mud': '#6b4f2a',
+            'water': '#1f6f8b'
         }
         
     def set_maze(self, maze):
@@ -78,7 +80,8 @@ class MazeView(tk.Canvas):
         if not self.maze:
             return
         
-        maze_id = id(self.maze.grid)
+        # Dấu vân tay nội dung + version: đổi cả khi sửa ô trên cùng một lưới
+        maze_id = (self.maze.fingerprint(), self.maze.start_pos, self.maze.exit_pos)
         
         # Chỉ vẽ lại nếu maze thay đổi
         if self._maze_cached and self._last_maze_id == maze_id:
@@ -92,12 +95,16 @@ class MazeView(tk.Canvas):
         # Tạo lookup table cho colors - giảm function calls
         wall_color = self.colors['wall']
         path_color = self.colors['path']
+        # Địa hình: chi phí >= 5 tô màu nước, 2..4 tô màu bùn
+        mud_color = self.colors.get('mud', '#6b4f2a')
+        water_color = self.colors.get('water', '#1f6f8b')
         
         # Batch create với optimized loop
         cell_size = self.cell_size
         height = self.maze.height
         width = self.maze.width
         grid = self.maze.grid
+        costs = grid.costs
         
         # Vẽ tất cả walls trước (gộp lại thành ít operations hơn)
         for y in range(height):
@@ -109,7 +116,12 @@ class MazeView(tk.Canvas):
                 x1 = x * cell_size
                 x2 = x1 + cell_size
                 
-                color = wall_color if row[x] == 1 else path_color
+                if row[x] == 1:
+                    color = wall_color
+                elif costs is not None and costs[grid.node_id(x, y)] > 1:
+                    color = water_color if costs[grid.node_id(x, y)] >= 5 else mud_color
+                else:
+                    color = path_color
                 self.create_rectangle(x1, y1, x2, y2, fill=color, outline='', width=0, tags='maze')
         
         # Vẽ điểm bắt đầu và kết thúc